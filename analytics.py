@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""답안 이벤트 기록과 집계 (고정 폭 바이너리 로그 + NumPy 벡터 집계)
+
+이벤트 하나는 31바이트 고정 폭 레코드로 data/events.bin에 추가만 됩니다.
+읽을 때는 np.fromfile 한 번으로 구조화 배열을 만들고 필드(열) 단위로 집계하므로
+수십만 건에서도 대시보드가 바로 갱신됩니다.
+"""
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from quiz_engine import choice_mask
+
+DEFAULT_EVENTS_PATH = "data/events.bin"
+
+EVENT_DTYPE = np.dtype([
+    ("ts", "<f8"),          # 답을 확인/제출한 시각 (epoch 초)
+    ("user", "<u4"),        # 사용자(세션) id 해시
+    ("bank", "<u4"),        # 문제 은행 id 해시
+    ("question", "<u4"),    # 문제 id (숫자가 아니면 해시)
+    ("chosen", "u1"),       # 선택한 답 비트마스크 (A=1, B=2, C=4, D=8, E=16, 미응답=0)
+    ("correct", "u1"),      # 정답 여부
+    ("latency_ms", "<u4"),  # 문제를 보고 답할 때까지 걸린 시간
+    ("mode", "u1"),         # 0: 연습, 1: 시험
+    ("exam", "<u4"),        # 시험 회차 id (연습은 0)
+])
+
+MODE_PRACTICE = 0
+MODE_EXAM = 1
+
+# AIF-C01 출제 영역 기준 주제 (앞에서부터 처음 일치하는 주제 사용)
+TOPIC_RULES = [
+    ("책임 있는 AI", r"responsib|bias|fairness|explainab|transparen|toxic|hallucinat|guardrail|human review|clarify"),
+    ("보안·규정 준수·거버넌스", r"secur|\biam\b|encrypt|complian|governance|privacy|audit|cloudtrail|macie|\bpii\b|vpc|kms|access"),
+    ("파운데이션 모델 활용", r"\brag\b|retrieval|prompt|embedding|vector|fine-tun|knowledge base|agent|temperature|token|context"),
+    ("생성형 AI 기초", r"generative|\bllm\b|foundation model|bedrock|transformer|diffusion|chatbot|\bgpt\b|large language"),
+    ("AI·ML 기초", r"sagemaker|train|inference|regression|classification|cluster|label|feature|overfit|supervised|model"),
+]
+OTHER_TOPIC = "기타"
+TOPICS = [name for name, _ in TOPIC_RULES] + [OTHER_TOPIC]
+_TOPIC_PATTERNS = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in TOPIC_RULES]
+
+_write_lock = threading.Lock()
+
+
+def key_hash(value):
+    """문자열 id를 32비트 정수로 변환"""
+    return zlib.crc32(str(value).encode("utf-8"))
+
+
+def question_key(question_id):
+    """문제 id를 이벤트 로그의 정수 키로 변환 (숫자 id는 그대로)"""
+    text = str(question_id)
+    return int(text) if text.isdigit() and int(text) < 1 << 32 else key_hash(text)
+
+
+def make_event(user, bank, question_id, selected, correct, latency, mode=MODE_PRACTICE, exam=0, ts=None):
+    """이벤트 레코드 튜플 생성 (latency: 초)"""
+    return (
+        time.time() if ts is None else ts,
+        key_hash(user),
+        key_hash(bank),
+        question_key(question_id),
+        choice_mask(selected),
+        1 if correct else 0,
+        max(0, min(int(latency * 1000), 0xFFFFFFFF)),
+        mode,
+        exam,
+    )
+
+
+def record_events(events, path=DEFAULT_EVENTS_PATH):
+    """이벤트 레코드들을 로그 끝에 추가 (한 번의 write로 기록)"""
+    if not events:
+        return
+    data = np.array(events, dtype=EVENT_DTYPE).tobytes()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _write_lock:
+        with open(path, "ab") as f:
+            f.write(data)
+
+
+def load_events(path=DEFAULT_EVENTS_PATH):
+    """이벤트 로그 전체를 구조화 배열로 로드 (기록 중 잘린 마지막 레코드는 무시)"""
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return np.empty(0, dtype=EVENT_DTYPE)
+    return np.fromfile(path, dtype=EVENT_DTYPE, count=size // EVENT_DTYPE.itemsize)
+
+
+def filter_events(events, user=None, bank=None, mode=None, since=None):
+    """조건에 맞는 이벤트만 선택 (user/bank는 원래 문자열 id)"""
+    mask = np.ones(len(events), dtype=bool)
+    if user is not None:
+        mask &= events["user"] == key_hash(user)
+    if bank is not None:
+        mask &= events["bank"] == key_hash(bank)
+    if mode is not None:
+        mask &= events["mode"] == mode
+    if since is not None:
+        mask &= events["ts"] >= since
+    return events[mask]
+
+
+def topic_of(q):
+    """문제 본문 키워드로 주제 분류"""
+    text = q.get("question_en", "")
+    for name, pattern in _TOPIC_PATTERNS:
+        if pattern.search(text):
+            return name
+    return OTHER_TOPIC
+
+
+def topic_lookup(questions):
+    """(정렬된 문제 키 배열, 같은 순서의 주제 번호 배열)"""
+    keys = np.array([question_key(q["id"]) for q in questions], dtype=np.uint32)
+    topics = np.array([TOPICS.index(topic_of(q)) for q in questions], dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    return keys[order], topics[order]
+
+
+def _topics_for(events, lookup):
+    keys, topics = lookup
+    other = TOPICS.index(OTHER_TOPIC)
+    question = events["question"]
+    if len(keys) == 0:
+        return np.full(len(events), other, dtype=np.int64)
+    if keys[-1] < 1 << 20:
+        # 문제 id가 작은 정수이면 id를 바로 인덱스로 쓰는 조회 배열 사용
+        table = np.full(int(keys[-1]) + 2, other, dtype=np.int64)
+        table[keys] = topics
+        return table[np.minimum(question, len(table) - 1)]
+    pos = np.clip(np.searchsorted(keys, question), 0, len(keys) - 1)
+    return np.where(keys[pos] == question, topics[pos], other)
+
+
+def topic_accuracy(events, lookup):
+    """주제별 {"topic", "attempts", "accuracy"} 목록 (시도가 있는 주제만)"""
+    topic_idx = _topics_for(events, lookup)
+    attempts = np.bincount(topic_idx, minlength=len(TOPICS))
+    correct = np.bincount(topic_idx, weights=events["correct"], minlength=len(TOPICS))
+    return [
+        {"topic": TOPICS[i], "attempts": int(attempts[i]), "accuracy": float(correct[i] / attempts[i])}
+        for i in range(len(TOPICS)) if attempts[i] > 0
+    ]
+
+
+def question_stats(events):
+    """(문제 키, 시도 수, 정답 수, 평균 응답 시간 ms) 배열"""
+    keys, inverse = np.unique(events["question"], return_inverse=True)
+    attempts = np.bincount(inverse, minlength=len(keys))
+    correct = np.bincount(inverse, weights=events["correct"], minlength=len(keys))
+    latency = np.bincount(inverse, weights=events["latency_ms"], minlength=len(keys))
+    return keys, attempts, correct, latency / np.maximum(attempts, 1)
+
+
+def weakest_questions(events, min_attempts=2, limit=10):
+    """정답률이 낮은 문제 {"question", "attempts", "accuracy", "latency_ms"} 목록"""
+    keys, attempts, correct, latency = question_stats(events)
+    eligible = np.flatnonzero(attempts >= min_attempts)
+    if len(eligible) == 0:
+        return []
+    accuracy = correct[eligible] / attempts[eligible]
+    # 정답률 오름차순, 같으면 시도 수가 많은 문제 우선
+    order = np.lexsort((-attempts[eligible], accuracy))[:limit]
+    return [
+        {"question": int(keys[eligible[i]]), "attempts": int(attempts[eligible[i]]),
+         "accuracy": float(accuracy[i]), "latency_ms": float(latency[eligible[i]])}
+        for i in order
+    ]
+
+
+def exam_scores(events):
+    """시험 회차별 {"ts", "score", "questions"} 목록 (시작 시각 순)"""
+    exams = events[(events["mode"] == MODE_EXAM) & (events["exam"] != 0)]
+    if len(exams) == 0:
+        return []
+    # 회차 id로 정렬한 뒤 구간별 합계/최솟값 계산
+    order = np.argsort(exams["exam"], kind="stable")
+    exam_ids = exams["exam"][order]
+    starts = np.flatnonzero(np.concatenate(([True], exam_ids[1:] != exam_ids[:-1])))
+    totals = np.diff(np.append(starts, len(exam_ids)))
+    correct = np.add.reduceat(exams["correct"][order].astype(np.int64), starts)
+    started = np.minimum.reduceat(exams["ts"][order], starts)
+    return [{"ts": float(started[i]), "score": float(correct[i] / totals[i] * 100), "questions": int(totals[i])}
+            for i in np.argsort(started)]
+
+
+def daily_accuracy(events, tz_offset=0):
+    """일별 {"day"(epoch 일), "attempts", "accuracy"} 목록"""
+    if len(events) == 0:
+        return []
+    days = ((events["ts"] + tz_offset) // 86400).astype(np.int64)
+    first = days.min()
+    attempts = np.bincount(days - first)
+    correct = np.bincount(days - first, weights=events["correct"])
+    return [{"day": int(first + i), "attempts": int(attempts[i]), "accuracy": float(correct[i] / attempts[i])}
+            for i in np.flatnonzero(attempts)]
+
+
+if __name__ == "__main__":
+    from snapshot import load_bank
+
+    events = load_events()
+    print(f"이벤트 {len(events)}건 ({os.path.getsize(DEFAULT_EVENTS_PATH) if len(events) else 0:,}바이트)")
+    lookup = topic_lookup(load_bank()["questions"])
+    for row in topic_accuracy(events, lookup):
+        print(f"  {row['topic']}: {row['accuracy'] * 100:.1f}% ({row['attempts']}회)")
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""문제 은행 JSON API 서버 (표준 라이브러리 http.server, 여러 워커 프로세스 지원)
+
+Streamlit 앱 밖의 클라이언트(모바일 앱, LMS 연동 등)가 같은 문제 은행과 채점 로직을 쓰도록 합니다.
+서버는 요청 사이에 세션을 두지 않습니다. 문제 은행은 게시된 버전(bank_registry)에서,
+학습 기록은 공유 답안 로그(data/events.bin)에서 읽으므로 워커 프로세스를 여러 개 띄우거나
+로드 밸런서 뒤에 여러 서버를 두어도 같은 결과를 돌려줍니다.
+
+    python api_server.py --port 8600 --workers 4
+
+    GET  /api/banks                                      문제 은행 목록과 현재 버전
+    GET  /api/banks/<bank>/questions/<id>                문제 (ETag로 재검증, Cache-Control: no-cache)
+    GET  /api/banks/<bank>/versions/<version>/questions/<id>
+                                                         버전 고정 문제 (내용이 바뀌지 않으므로 immutable)
+    POST /api/banks/<bank>/exams       {"size": 65}      시험 문제 생성 (버전 고정 URL 목록)
+    POST /api/banks/<bank>/grade       {"question_id", "selected", "user", "latency"}
+                                                         채점 + 답안 기록
+    POST /api/banks/<bank>/exams/grade {"exam_id", "answers": {id: 답}, "user"}
+                                                         시험 채점 + 답안 기록
+    GET  /api/banks/<bank>/progress?user=<user>          학습 기록 요약 (주제별 정답률, 시험 점수, 약한 문제)
+    GET  /images/<해시>_<너비>.<webp|png>               HOTSPOT 이미지 변형 (파일명이 내용 해시이므로 immutable)
+
+문제 본문에는 정답을 넣지 않고 채점 응답에서만 돌려줍니다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import secrets
+import signal
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from bank_registry import default_registry
+from image_variants import STATIC_DIR
+from quiz_engine import (EXAM_SIZE, choice_mask, grade_answer, is_multiple_question, present_question,
+                         sample_exam_indexes, score_exam, selected_from_mask)
+from snapshot import load_release
+
+DEFAULT_PORT = 8600
+MAX_BODY = 1 << 20
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+PINNED_RELEASES = 2
+_VERSION = re.compile(r"\d{8}T\d{6}-[0-9a-f]{12}")
+IMAGE_TYPES = {"webp": "image/webp", "png": "image/png"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class QuestionPayloads:
+    """(은행, 버전, 위치)별 문제 JSON 바이트와 ETag (프로세스마다 처음 요청할 때 만들고 재사용)"""
+
+    def __init__(self, max_items=4096):
+        self.max_items = max_items
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, bank_id, bank, position):
+        key = (bank_id, bank["version"], position)
+        with self._lock:
+            item = self._items.get(key)
+        if item is not None:
+            return item
+        body = json.dumps(question_payload(bank_id, bank, position), ensure_ascii=False).encode("utf-8")
+        item = (body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+        with self._lock:
+            if len(self._items) >= self.max_items:
+                self._items.clear()
+            self._items[key] = item
+        return item
+
+
+def question_payload(bank_id, bank, position):
+    """문제 JSON (영어/한글 본문과 선택지, 정답 제외)"""
+    q = bank["questions"][position]
+    en_body, en_choices, is_multiple = present_question(q, "English", bank["choice_table"])
+    ko_body, ko_choices, _ = present_question(q, "한글", bank["choice_table"])
+    related = bank.get("related")
+    return {
+        "id": q["id"],
+        "bank": bank_id,
+        "version": bank["version"],
+        "is_multiple": is_multiple,
+        "en": {"body": en_body, "choices": en_choices},
+        "ko": {"body": ko_body, "choices": ko_choices},
+        "image": q.get("image"),
+        "related": [bank["questions"][p]["id"] for p, _ in related.related(position)] if related else [],
+    }
+
+
+_question_payloads = QuestionPayloads()
+_positions = OrderedDict()  # (은행, 버전) -> {문제 id: 위치}
+_positions_lock = threading.Lock()
+
+
+def _get_bank(bank_id, version=None):
+    registry = default_registry()
+    if bank_id not in registry.configs:
+        raise ApiError(404, f"등록되지 않은 문제 은행: {bank_id}")
+    bank = registry.get(bank_id)
+    if version is None or bank["version"] == version:
+        return bank
+    bank = registry.retired(bank_id, version) or _pinned_release(registry.configs[bank_id], version)
+    if bank is None:
+        raise ApiError(410, f"더 이상 제공하지 않는 버전: {version}")
+    return bank
+
+
+_pinned = OrderedDict()  # (releases 디렉터리, 버전) -> bank, 최근 PINNED_RELEASES개
+_pinned_lock = threading.Lock()
+
+
+def _pinned_release(config, version):
+    """현재/직전이 아닌 버전 (이 워커가 로드한 적 없는 버전 고정 URL, 정리된 버전이면 None)"""
+    if not _VERSION.fullmatch(version):
+        return None
+    key = (config["releases"], version)
+    with _pinned_lock:
+        if key in _pinned:
+            _pinned.move_to_end(key)
+            return _pinned[key]
+    try:
+        bank = load_release(config["releases"], version)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    with _pinned_lock:
+        _pinned[key] = bank
+        while len(_pinned) > PINNED_RELEASES:
+            _pinned.popitem(last=False)
+    return bank
+
+
+def _position(bank_id, bank, question_id):
+    key = (bank_id, bank["version"])
+    with _positions_lock:
+        positions = _positions.get(key)
+    if positions is None:
+        positions = {q["id"]: i for i, q in enumerate(bank["questions"])}
+        with _positions_lock:
+            _positions[key] = positions
+            while len(_positions) > 2 + PINNED_RELEASES:
+                _positions.popitem(last=False)
+    if question_id not in positions:
+        raise ApiError(404, f"없는 문제: {question_id}")
+    return positions[question_id]
+
+
+def _question_url(bank_id, version, question_id):
+    """문제 URL (게시되지 않은 은행은 버전이 없으므로 ETag 재검증 URL)"""
+    if version is None:
+        return f"/api/banks/{bank_id}/questions/{question_id}"
+    return f"/api/banks/{bank_id}/versions/{version}/questions/{question_id}"
+
+
+def _record(events):
+    """답안 기록 (NumPy가 없거나 쓰기에 실패해도 채점 응답은 돌려줌)"""
+    try:
+        from analytics import record_events
+        record_events(events)
+    except (ImportError, OSError) as e:
+        print(f"⚠️ 답안 기록 실패: {e}", file=sys.stderr)
+
+
+def _answer_event(bank_id, user, q, selected, correct, latency, exam=0):
+    from analytics import MODE_EXAM, MODE_PRACTICE, make_event
+    return make_event(user, bank_id, q["id"], selected, correct, latency, MODE_EXAM if exam else MODE_PRACTICE, exam)
+
+
+def _selected(q, value):
+    """요청의 답 ("A", "A,C", ["A", "C"]) → grade_answer 형식 (앱과 같이 선택 마스크를 거쳐 정규화)"""
+    if value is None:
+        value = []
+    elif isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ApiError(400, "selected는 \"A\" 또는 [\"A\", \"C\"] 형식이어야 합니다")
+    return selected_from_mask(choice_mask([v.strip().upper() for v in value]), is_multiple_question(q))
+
+
+def _number(body, key, kind=float):
+    try:
+        return kind(body.get(key) or 0)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{key}는 숫자여야 합니다") from None
+
+
+# 요청 처리 함수: (handler, match, query, body) → (상태, JSON 또는 (바이트, ETag, Cache-Control[, Content-Type]))
+def list_banks(handler, match, query, body):
+    registry = default_registry()
+    banks = []
+    for bank_id in registry.bank_ids():
+        bank = registry.get(bank_id)
+        banks.append({"id": bank_id, "title": registry.title(bank_id), "version": bank["version"],
+                      "questions": len(bank["questions"])})
+    return 200, {"banks": banks}
+
+
+def get_question(handler, match, query, body):
+    bank_id = match["bank"]
+    version = match.groupdict().get("version")
+    bank = _get_bank(bank_id, version)
+    position = _position(bank_id, bank, match["id"])
+    payload, etag = _question_payloads.get(bank_id, bank, position)
+    # 버전이 URL에 있으면 내용이 바뀌지 않음, 없으면 새 버전이 게시될 수 있으므로 매번 ETag로 재검증
+    return 200, (payload, etag, IMMUTABLE if version is not None else REVALIDATE)
+
+
+def create_exam(handler, match, query, body):
+    bank_id = match["bank"]
+    bank = _get_bank(bank_id)
+    size = body.get("size", EXAM_SIZE)
+    # JSON true/false는 파이썬에서 int의 하위 클래스이므로 따로 거부
+    if isinstance(size, bool) or not isinstance(size, int) or not 1 <= size <= len(bank["questions"]):
+        raise ApiError(400, f"size는 1~{len(bank['questions'])} 사이의 정수여야 합니다")
+    positions = sample_exam_indexes(bank["questions"], size)
+    ids = [bank["questions"][p]["id"] for p in positions]
+    return 201, {
+        "exam_id": secrets.randbits(31) + 1,
+        "bank": bank_id,
+        "version": bank["version"],
+        "questions": ids,
+        "urls": [_question_url(bank_id, bank["version"], question_id) for question_id in ids],
+    }
+
+
+def grade_question(handler, match, query, body):
+    bank_id = match["bank"]
+    bank = _get_bank(bank_id, body.get("version"))
+    q = bank["questions"][_position(bank_id, bank, str(body.get("question_id", "")))]
+    selected = _selected(q, body.get("selected"))
+    correct = grade_answer(q, selected)
+    if body.get("user"):
+        _record([_answer_event(bank_id, body["user"], q, selected, correct, _number(body, "latency"))])
+    return 200, {"question_id": q["id"], "correct": correct, "answer": q.get("answer", "")}
+
+
+def grade_exam(handler, match, query, body):
+    bank_id = match["bank"]
+    bank = _get_bank(bank_id, body.get("version"))
+    answers = body.get("answers")
+    if not isinstance(answers, dict) or not answers:
+        raise ApiError(400, "answers는 {문제 id: 답} 형식이어야 합니다")
+    question_ids = list(answers)
+    exam_questions = [bank["questions"][_position(bank_id, bank, str(i))] for i in question_ids]
+    selected = {str(idx): _selected(q, answers[i]) for idx, (i, q) in enumerate(zip(question_ids, exam_questions))}
+    result = score_exam(exam_questions, selected)
+    exam_id = _number(body, "exam_id", int)
+    if body.get("user"):
+        wrong = set(result["wrong_indexes"])
+        _record([_answer_event(bank_id, body["user"], q, selected[str(idx)], idx not in wrong, 0, exam=exam_id)
+                 for idx, q in enumerate(exam_questions)])
+    return 200, {
+        "exam_id": exam_id,
+        "correct_count": result["correct_count"],
+        "total_count": result["total_count"],
+        "score_percent": result["score_percent"],
+        "passing_score": result["passing_score"],
+        "passed": result["passed"],
+        "wrong": [{"question_id": exam_questions[idx]["id"], "answer": exam_questions[idx].get("answer", "")}
+                  for idx in result["wrong_indexes"]],
+    }
+
+
+_events_cache = {}
+
+
+def _load_events_cached():
+    """답안 로그 (파일 크기/수정 시각이 바뀔 때만 다시 읽음)"""
+    from analytics import DEFAULT_EVENTS_PATH, load_events
+    try:
+        stat = os.stat(DEFAULT_EVENTS_PATH)
+    except FileNotFoundError:
+        return load_events()
+    key = (stat.st_size, stat.st_mtime_ns)
+    if _events_cache.get("key") != key:
+        _events_cache.update(key=key, events=load_events())
+    return _events_cache["events"]
+
+
+def get_progress(handler, match, query, body):
+    from analytics import exam_scores, filter_events, topic_accuracy, topic_lookup, weakest_questions
+    bank_id = match["bank"]
+    bank = _get_bank(bank_id)
+    user = query.get("user")
+    if not user:
+        raise ApiError(400, "user 쿼리 매개변수가 필요합니다")
+    events = filter_events(_load_events_cached(), user=user, bank=bank_id)
+    correct = int(events["correct"].sum()) if len(events) else 0
+    return 200, {
+        "user": user,
+        "bank": bank_id,
+        "attempts": len(events),
+        "accuracy": correct / len(events) if len(events) else None,
+        "topics": topic_accuracy(events, topic_lookup(bank["questions"])) if len(events) else [],
+        "exams": exam_scores(events),
+        "weakest": weakest_questions(events, min_attempts=1, limit=10),
+    }
+
+
+def get_image(handler, match, query, body):
+    """이미지 변형 파일 (파일명의 내용 해시가 바뀌지 않는 한 내용도 같으므로 1년간 캐시)"""
+    path = os.path.join(STATIC_DIR, match["name"])
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise ApiError(404, "없는 이미지") from None
+    return 200, (data, f'"{match["name"]}"', IMMUTABLE, IMAGE_TYPES[match["ext"]])
+
+
+ROUTES = [
+    ("GET", re.compile(r"/api/banks"), list_banks),
+    ("GET", re.compile(r"/api/banks/(?P<bank>[^/]+)/questions/(?P<id>[^/]+)"), get_question),
+    ("GET", re.compile(r"/api/banks/(?P<bank>[^/]+)/versions/(?P<version>[^/]+)/questions/(?P<id>[^/]+)"), get_question),
+    ("POST", re.compile(r"/api/banks/(?P<bank>[^/]+)/exams"), create_exam),
+    ("POST", re.compile(r"/api/banks/(?P<bank>[^/]+)/grade"), grade_question),
+    ("POST", re.compile(r"/api/banks/(?P<bank>[^/]+)/exams/grade"), grade_exam),
+    ("GET", re.compile(r"/api/banks/(?P<bank>[^/]+)/progress"), get_progress),
+    ("GET", re.compile(r"/images/(?P<name>[0-9a-f]{16}_\d+\.(?P<ext>webp|png))"), get_image),
+]
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # 헤더와 본문을 따로 쓰므로 keep-alive에서 지연 ACK 대기(40ms)를 막음
+    server_version = "QuizAPI/1.0"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        self._body_read = False
+        try:
+            for route_method, pattern, handler in ROUTES:
+                match = pattern.fullmatch(url.path.rstrip("/"))
+                if match is None:
+                    continue
+                if route_method != method:
+                    continue
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                status, result = handler(self, match, query, self._read_json() if method == "POST" else {})
+                if isinstance(result, tuple):
+                    self._send_cached(*result)
+                else:
+                    self._send_json(status, result)
+                return
+            allowed = any(p.fullmatch(url.path.rstrip("/")) for _, p, _ in ROUTES)
+            raise ApiError(405 if allowed else 404, "허용되지 않는 메서드" if allowed else "없는 경로")
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:  # 요청 하나의 오류로 워커가 멈추지 않도록
+            print(f"❌ {method} {self.path}: {e!r}", file=sys.stderr)
+            self._send_json(500, {"error": "서버 오류"})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(400, "Content-Length가 올바르지 않습니다") from None
+        if length > MAX_BODY:
+            raise ApiError(413, "요청 본문이 너무 큽니다")
+        raw = self.rfile.read(length) if length > 0 else b"{}"
+        self._body_read = True
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            raise ApiError(400, "JSON 본문이 아닙니다") from None
+        if not isinstance(body, dict):
+            raise ApiError(400, "JSON 객체가 필요합니다")
+        return body
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        # 읽지 않은 본문(413, 404 등)이 keep-alive 연결에 남아 다음 요청으로 해석되지 않도록 연결을 닫음
+        if not self._body_read and self.headers.get("Content-Length", "0").strip() not in ("", "0"):
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cached(self, body, etag, cache_control, content_type="application/json; charset=utf-8"):
+        """캐시 가능한 응답 (If-None-Match가 같으면 본문 없이 304)"""
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=1, verbose=False):
+    """서버 실행 (workers > 1이면 소켓을 연 뒤 fork해서 같은 포트를 여러 프로세스가 처리)"""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    print(f"▶️ API 서버: http://{host}:{server.server_address[1]}/api/banks (워커 {workers}개)")
+
+    children = []
+    if workers > 1 and hasattr(os, "fork"):
+        for _ in range(workers - 1):
+            pid = os.fork()
+            if pid == 0:
+                children = None
+                break
+            children.append(pid)
+    elif workers > 1:
+        print("⚠️ 이 플랫폼은 fork를 지원하지 않아 워커 1개로 실행합니다.")
+
+    if children:
+        def stop(signum, frame):
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pid in children or []:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 조회, 시험 생성, 채점, 학습 기록 JSON API 서버를 실행합니다.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=1, help="워커 프로세스 수 (같은 포트를 함께 처리)")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
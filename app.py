@@ -1,276 +1,224 @@
 import streamlit as st
-import json
-import re
-import random
 import os
+import secrets
+import time
+import uuid
 from datetime import datetime
+from importlib.util import find_spec
+from image_variants import image_html, image_prefetch_html
+from bank_registry import default_registry
+from prefetch import Prefetcher
+from quiz_engine import (build_render_model, choice_mask, get_choices_for_language, grade_answer, mask_choices,
+                         parse_choices, sample_exam_indexes, EXAM_SIZE, LANG_MODES)
+from quiz_state import add_wrong, dispatch, exam_selection, rebase, reset, session_footprint
 
 # 1. 데이터 로드
-@st.cache_data
-def load_data():
-    with open("data/questions.json", "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def parse_choices(question_text):
-    """질문 텍스트에서 선택지(A, B, C, D, E)를 파싱하여 분리"""
-    if not question_text:
-        return question_text, {}
-    
-    text = question_text.replace('\u0000', '').strip()
-    
-    if text.upper().startswith('HOTSPOT'):
-        return text, {}
-    
-    pattern = r'[•·]\s*([A-E])\.\s+'
-    matches = list(re.finditer(pattern, text))
-    
-    if len(matches) < 2:
-        return text, {}
-    
-    choices = {}
-    question_end_pos = matches[0].start() if matches else len(text)
-    
-    for i, match in enumerate(matches):
-        letter = match.group(1)
-        start_pos = match.end()
-        
-        if i + 1 < len(matches):
-            end_pos = matches[i + 1].start()
-        else:
-            end_pos = len(text)
-        
-        choice_text = text[start_pos:end_pos].strip()
-        choice_text = re.sub(r'[•·\s]+$', '', choice_text)
-        
-        if choice_text:
-            choices[letter] = choice_text
-    
-    question_body = text[:question_end_pos].strip()
-    question_body = re.sub(r'\s+', ' ', question_body)
-    
-    return question_body, choices
+# 모든 세션과 페이지가 같은 문제 은행 객체를 공유 (cache_data처럼 매 실행마다 복사하지 않음)
+def get_bank_registry():
+    """문제 은행 목록 (각 은행은 처음 선택될 때 로드, 오래 쓰지 않으면 메모리에서 해제)"""
+    return default_registry()
+
+def load_question_bank():
+    """현재 세션에서 선택한 문제 은행 (최신 스냅샷이 있으면 한 번의 읽기로 로드, 새 버전이 게시되면 교체된 은행)"""
+    return get_bank_registry().get(st.session_state.bank_id)
+
+def record_answer_events(events):
+    """답안 이벤트를 분석 로그에 기록 (NumPy는 기록할 때만 불러옴)"""
+    from analytics import record_events
+    try:
+        record_events(events)
+    except OSError as e:
+        print(f"답안 이벤트 기록 실패: {e}")
+
+def answer_event(q, selected, correct, latency, mode=0, exam=0):
+    from analytics import make_event
+    return make_event(st.session_state.user_id, st.session_state.bank_id, q['id'], selected, correct, latency, mode, exam)
+
+def reset_progress():
+    """문제 은행을 바꾸면 진행 상태와 오답 노트 초기화 (세션에는 은행 내 위치만 저장하므로 은행마다 다름)"""
+    reset(st.session_state)
 
 def translate_choice_to_korean(choice_en, question_context=""):
-    """영어 선택지를 한글로 번역 (간단한 규칙 기반, AWS 제품명은 영문 유지)"""
-    # AWS 제품명 리스트 (영문 유지)
-    aws_products = [
-        'Amazon', 'SageMaker', 'Bedrock', 'Rekognition', 'Comprehend', 'Polly', 'Lex',
-        'QuickSight', 'Ground Truth', 'Kendra', 'Textract', 'Transcribe', 'Translate',
-        'Forecast', 'Personalize', 'Fraud Detector', 'CodeGuru', 'DevOps Guru',
-        'Lookout', 'Monitron', 'Panorama', 'DeepLens', 'DeepRacer', 'DeepComposer',
-        'S3', 'EC2', 'Lambda', 'CloudFormation', 'CloudWatch', 'IAM', 'VPC'
-    ]
-    
-    # 간단한 번역 규칙 (실제로는 더 복잡한 번역이 필요하지만 기본 구조 제공)
-    # 실제 구현 시 Google Translate API나 다른 번역 서비스 사용 권장
-    choice_lower = choice_en.lower()
-    
-    # AWS 제품명은 영문으로 유지하면서 번역
-    translated = choice_en
-    
-    # 간단한 키워드 번역 예시 (실제로는 완전한 번역 필요)
-    # 여기서는 기본 구조만 제공하고, 실제로는 번역 API 사용 또는 사전 기반 번역 필요
-    
-    return translated  # 일단 원문 반환 (추후 번역 로직 추가 필요)
+    """영어 선택지를 한글로 번역 (번역 사전 → 번역 메모리 → 규칙 기반 순, AWS 제품명은 영문 유지)
 
-def get_choices_for_language(question_en, question_ko, lang_mode, use_random_mix=False, q_data=None):
-    """언어 모드에 따라 질문 본문과 선택지를 반환"""
-    # 영어 질문에서 선택지 파싱
-    en_body, en_choices = parse_choices(question_en)
-    
-    # 한글 질문에서 선택지 파싱 (대부분 한글 질문에는 선택지가 없음)
-    ko_body, ko_choices = parse_choices(question_ko)
-    
-    # choices_ko 필드에서 한글 선택지 가져오기
-    ko_choices_from_data = q_data.get('choices_ko', {}) if q_data else {}
-    
-    if lang_mode == "한글":
-        # 한글 질문 본문 사용
-        body = ko_body if ko_body else en_body
-        # 한글 선택지 우선 사용 (choices_ko 필드 또는 파싱된 한글 선택지)
-        # ko_choices_from_data가 비어있지 않은 경우에만 사용
-        if ko_choices_from_data and len(ko_choices_from_data) > 0:
-            choices = ko_choices_from_data
-        elif ko_choices and len(ko_choices) > 0:
-            choices = ko_choices
-        else:
-            # 한글 선택지가 없으면 영어 선택지를 사용 (임시)
-            choices = en_choices
-        return body, choices
-    elif lang_mode == "영어":
-        # 영어로만 표시
-        return en_body, en_choices
-    else:  # "섞기"
-        # 랜덤으로 언어 선택
-        use_korean = random.choice([True, False]) if use_random_mix else False
-        if use_korean and ko_body:
-            body = ko_body
-            choices = ko_choices_from_data if ko_choices_from_data else (ko_choices if ko_choices else en_choices)
-        else:
-            body = en_body
-            choices = en_choices
-        return body, choices
+    번역 사전의 빈 항목은 batch_translator.py로 미리 채워 둡니다.
+    """
+    from enhance_questions import translate_choice_simple
+    return translate_choice_simple(choice_en)
 
-def is_multiple_choice(question_text):
-    """질문이 복수 선택인지 확인"""
-    return bool(re.search(r'\(Choose\s+two\)|\(2개\s*선택\)|\(Choose\s+three\)|\(3개\s*선택\)', question_text, re.IGNORECASE))
+# 화면 이동/시험 상태 전이는 on_click 콜백으로 처리 (콜백 후 스크립트가 한 번만 실행됨)
+def nav(event, *args):
+    """프래그먼트 밖 버튼의 상태 전이 (콜백 다음 전체 실행 한 번)"""
+    dispatch(st.session_state, event, *args)
 
-def extract_correct_answers(answer_text):
-    """정답 텍스트에서 정답 문자들 추출 (복수 선택 지원)"""
-    if not answer_text:
-        return None
-    matches = re.findall(r'\b([A-E])\b', answer_text)
-    return matches if matches else None
+def request_full_rerun():
+    """프래그먼트 안 콜백이 다른 영역까지 바꾼 경우: 프래그먼트 실행 대신 전체를 한 번만 다시 실행
 
-# PDF 생성 함수 (위로 이동)
-def generate_pdf(wrong_questions):
-    """오답 노트를 PDF로 생성 (문제, 답, 해설 포함)"""
-    try:
-        from fpdf import FPDF
-        from fpdf.enums import XPos, YPos
-    except ImportError:
-        return None
-    
+    콜백 안의 st.rerun()은 이번 상호작용의 기본 실행(프래그먼트)을 전체 실행으로 바꾸므로
+    프래그먼트 실행 뒤 전체 실행이 한 번 더 일어나지 않습니다. 콜백을 바로 멈추므로 콜백의 마지막에 호출합니다.
+    """
+    st.rerun()
+
+def fragment_nav(event, *args):
+    """프래그먼트 안 버튼의 상태 전이 (문제가 바뀌므로 전체 다시 실행)"""
+    if dispatch(st.session_state, event, *args):
+        request_full_rerun()
+
+def start_exam(questions):
+    # 랜덤으로 65문제 선택 (실제 시험 형식)
+    dispatch(st.session_state, "start_exam", sample_exam_indexes(questions, EXAM_SIZE), secrets.randbits(31) + 1)
+
+@st.cache_resource(max_entries=2)
+def get_item_parameters(bank_id, version, irt_path, mtime):
+    """적응형 시험용 문항 모수 배열 (보정 파일이나 은행 버전이 바뀔 때만 다시 만듦)"""
+    from irt import item_parameters, load_calibration
+    return item_parameters(get_bank_registry().get(bank_id)["questions"], load_calibration(irt_path))
+
+def load_item_parameters():
+    """현재 은행의 보정 결과 (python irt.py로 보정한 적이 없으면 None, 이때는 NumPy를 불러오지 않음)"""
+    irt_path = bank["config"]["irt"]
     try:
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-        
-        # 페이지 너비 (기본값: 210mm에서 마진 제외)
-        page_width = pdf.w - 2 * pdf.l_margin
-        
-        # 기본 폰트 사용 (Helvetica - fpdf2의 기본 폰트)
-        pdf.set_font("helvetica", size=12)
-        
-        # 제목
-        pdf.set_font("helvetica", 'B', 16)
-        pdf.cell(page_width, 10, text="AWS AIF-C01 Wrong Answer Notes", align='C')
-        pdf.ln(5)
-        
-        # 날짜
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        pdf.set_font("helvetica", size=10)
-        pdf.cell(page_width, 8, text=f"Date: {date_str}", align='R')
-        pdf.ln(10)
-
-        # 텍스트를 ASCII로 변환하는 헬퍼 함수
-        def to_ascii_safe(text, max_len=500):
-            """텍스트를 ASCII로 변환 (유니코드 문자는 ?로 대체)"""
-            if not text:
-                return ""
-            # 특수 문자 제거 및 ASCII 변환
-            safe = ''.join(c if ord(c) < 128 and c.isprintable() else '?' for c in str(text)[:max_len])
-            # 불필요한 특수 문자 제거
-            safe = safe.replace('•', '-').replace('·', '-').replace('…', '...')
-            return safe
-        
-        # 각 문제 작성
-        for i, q in enumerate(wrong_questions):
-            # 문제 번호
-            pdf.set_font("helvetica", 'B', 14)
-            pdf.cell(page_width, 10, text=f"Question {i+1} (Original ID: {q['id']})", ln=True)
-            pdf.ln(5)
-            
-            # 문제 본문
-            question_ko = q.get('question_ko', '').replace('\u0000', '').strip()
-            question_en = q.get('question_en', '').replace('\u0000', '').strip()
-            is_hotspot = 'HOTSPOT' in question_en.upper() or 'HOTSPOT' in question_ko.upper()
-            
-            pdf.set_font("helvetica", 'B', 11)
-            pdf.cell(page_width, 8, text="[Question - Korean]", ln=True)
-            pdf.set_font("helvetica", size=10)
-            safe_text = to_ascii_safe(question_ko, 500)
-            if safe_text:
-                pdf.multi_cell(page_width, 6, text=safe_text)
-            
-            pdf.ln(3)
-            pdf.set_font("helvetica", 'B', 11)
-            pdf.cell(page_width, 8, text="[Question - English]", ln=True)
-            pdf.set_font("helvetica", size=10)
-            safe_en = to_ascii_safe(question_en, 500)
-            if safe_en:
-                pdf.multi_cell(page_width, 6, text=safe_en)
-            
-            # HOTSPOT 문제의 이미지 처리
-            if is_hotspot:
-                pdf.ln(3)
-                pdf.set_font("helvetica", 'I', 10)
-                pdf.cell(page_width, 8, text="[Note: This is a HOTSPOT question. Original PDF contains an image/diagram that should be referenced.]", ln=True)
-                pdf.set_font("helvetica", size=10)
-            
-            pdf.ln(5)
-            
-            # 선택지
-            choices_ko = q.get('choices_ko', {})
-            en_body, en_choices = parse_choices(question_en)
-            
-            if choices_ko or en_choices:
-                pdf.set_font("helvetica", 'B', 11)
-                pdf.cell(page_width, 8, text="[Choices]", ln=True)
-                pdf.set_font("helvetica", size=10)
-                
-                choices_to_show = choices_ko if choices_ko else en_choices
-                for letter in sorted(choices_to_show.keys()):
-                    choice_text = str(choices_to_show[letter])
-                    safe_choice = to_ascii_safe(choice_text, 100)
-                    if safe_choice:
-                        pdf.multi_cell(page_width, 5, text=f"{letter}. {safe_choice}")
-                pdf.ln(5)
-            
-            # 정답 및 해설
-            answer = q.get('answer', '')
-            pdf.set_font("helvetica", 'B', 11)
-            pdf.cell(page_width, 8, text="[Answer and Explanation]", ln=True)
-            pdf.set_font("helvetica", size=10)
-            safe_answer = to_ascii_safe(answer, 500)
-            if safe_answer:
-                pdf.multi_cell(page_width, 6, text=safe_answer)
-            pdf.ln(10)
-            
-            # 구분선 (페이지 너비 기준)
-            line_start_x = pdf.l_margin
-            line_end_x = pdf.w - pdf.r_margin
-            pdf.line(line_start_x, pdf.get_y(), line_end_x, pdf.get_y())
-            pdf.ln(10)
-        
-        # pdf.output(dest='S')는 이미 bytearray를 반환하므로 encode() 불필요
-        pdf_bytes = pdf.output(dest='S')
-        # bytearray를 bytes로 변환 (Streamlit download_button이 bytes를 기대)
-        return bytes(pdf_bytes)
-    except Exception as e:
-        # 에러 발생 시 None 반환 (디버깅용: 에러 메시지 출력 가능)
-        import sys
-        print(f"PDF 생성 오류: {type(e).__name__}: {e}", file=sys.stderr)
+        mtime = os.stat(irt_path).st_mtime_ns
+    except FileNotFoundError:
         return None
-
-data = load_data()
+    return get_item_parameters(st.session_state.bank_id, bank["version"], irt_path, mtime)
+
+def exam_estimate(questions, params, answered_only=False):
+    """시험 답안으로 추정한 (능력, 표준오차, 합격 가능성) - answered_only가 아니면 미응답은 오답"""
+    from irt import estimate_ability
+    positions, correct = [], []
+    for idx, position in enumerate(st.session_state.exam_indexes):
+        if answered_only and not st.session_state.exam_answers[idx]:
+            continue
+        positions.append(position)
+        correct.append(grade_answer(questions[position], exam_selection(st.session_state, questions, idx)))
+    return estimate_ability(params, positions, correct)
+
+def start_adaptive_exam(questions, params):
+    """적응형 시험: 첫 문제만 정하고 이후 문제는 답할 때마다 고름"""
+    from irt import next_item
+    first = next_item(params, 0.0, [])
+    if first is not None:
+        dispatch(st.session_state, "start_exam", [first], secrets.randbits(31) + 1, True)
+
+def adaptive_next(questions, params):
+    """적응형 시험 다음 문제: 지금까지의 답으로 능력을 추정해 종료하거나 정보량이 가장 큰 문제 추가"""
+    from irt import next_item, should_stop
+    if params is None:
+        finish_exam(questions)
+        return
+    exam_index = st.session_state.exam_current_index
+    if not st.session_state.exam_answers[exam_index]:
+        st.session_state.exam_nav_warning = True
+        return
+    theta, se, readiness = exam_estimate(questions, params, answered_only=True)
+    position = None
+    if not should_stop(len(st.session_state.exam_indexes), se, readiness):
+        position = next_item(params, theta, st.session_state.exam_indexes)
+    if position is None:
+        finish_exam(questions, params)
+    else:
+        fragment_nav("exam_extend", position)
+
+def check_answer(q, position, is_multiple):
+    """정답 확인: 채점, 답안 기록, 오답이면 오답 노트에 추가 (position: 은행 내 위치)"""
+    st.session_state.show_answer = True
+    checked = st.session_state.selected_answers if is_multiple else st.session_state.selected_answer
+    is_correct = grade_answer(q, checked)
+    latency = time.time() - st.session_state.question_shown_at
+    record_answer_events([answer_event(q, checked, is_correct, latency)])
+    if not is_correct and add_wrong(st.session_state, position):
+        # 사이드바의 오답 개수와 PDF가 바뀌므로 전체 다시 실행
+        st.session_state.wrong_added_notice = True
+        request_full_rerun()
+
+def exam_next():
+    # 답변을 선택해야만 다음 문제로 넘어갈 수 있음
+    exam_index = st.session_state.exam_current_index
+    if st.session_state.exam_answers[exam_index]:
+        fragment_nav("exam_goto", exam_index + 1)
+    else:
+        st.session_state.exam_nav_warning = True
+
+def finish_exam(questions, params=None):
+    """시험 채점 결과를 저장하고 문제별 답안을 분석 로그에 기록 (미응답은 오답, 보정 결과가 있으면 합격 가능성도 추정)"""
+    if not dispatch(st.session_state, "finish_exam", questions):
+        return
+    if params is not None:
+        theta, se, readiness = exam_estimate(questions, params)
+        st.session_state.exam_result.update(theta=theta, se=se, readiness=readiness)
+        if st.session_state.exam_adaptive:
+            # 적응형 시험은 실력에 맞춘 문제라 정답률이 낮게 나오므로 합격 가능성으로 판정
+            st.session_state.exam_result["passed"] = readiness >= 0.5
+    events = []
+    for idx, position in enumerate(st.session_state.exam_indexes):
+        exam_q = questions[position]
+        selected = exam_selection(st.session_state, questions, idx)
+        events.append(answer_event(exam_q, selected, grade_answer(exam_q, selected),
+                                   st.session_state.exam_latency[idx] / 1000, mode=1, exam=st.session_state.exam_id))
+    record_answer_events(events)
+    request_full_rerun()
+
+def save_exam_answer(exam_index, mask):
+    """시험 답 저장 (답이 바뀔 때만 응답 시간 갱신)"""
+    if st.session_state.exam_answers[exam_index] != mask:
+        st.session_state.exam_answers[exam_index] = mask
+        latency_ms = int((time.time() - st.session_state.question_shown_at) * 1000)
+        st.session_state.exam_latency[exam_index] = min(latency_ms, 0xFFFFFFFF)
+
+def clear_wrong_answers():
+    del st.session_state.wrong_indexes[:]
+
+@st.cache_resource
+def get_prefetcher():
+    """세션 간에 공유하는 다음 문제 미리 불러오기 스레드"""
+    return Prefetcher(max_items=64)
+
+def build_wrong_answer_pdf(wrong_questions, choice_table=None):
+    """오답 노트 PDF 생성 (다운로드 버튼을 누를 때만 fpdf를 불러와 생성)"""
+    from pdf_export import generate_pdf
+    return generate_pdf(wrong_questions, choice_table=choice_table) or b""
+
+# 문제 은행 선택 (은행이 여러 개일 때만 표시)
+registry = get_bank_registry()
+bank_ids = registry.bank_ids()
+if st.session_state.get("bank_id") not in bank_ids:
+    st.session_state.bank_id = bank_ids[0]
+if len(bank_ids) > 1:
+    st.sidebar.selectbox("📚 문제 은행", options=bank_ids, format_func=registry.title, key="bank_id", on_change=reset_progress)
+
+bank = load_question_bank()
+data = bank["questions"]
+choice_table = bank["choice_table"]
+related_graph = bank.get("related")
 
 # 세션 상태 초기화
 if "current_index" not in st.session_state:
-    st.session_state.current_index = 0
-    st.session_state.wrong_answers = []
-    st.session_state.show_answer = False
-    st.session_state.selected_answer = None
-    st.session_state.selected_answers = []
-    st.session_state.last_index = -1
-    st.session_state.exam_mode = False
-    st.session_state.exam_questions = []
-    st.session_state.exam_answers = {}
-    st.session_state.exam_current_index = 0
-    st.session_state.exam_finished = False
+    reset_progress()
+    st.session_state.user_id = uuid.uuid4().hex
+    st.session_state.question_shown_at = time.time()
     st.session_state.lang_mode = "한글"  # "한글", "영어", "섞기"
 
-# 시험 모드 확인
-if st.session_state.exam_mode and st.session_state.exam_questions:
-    exam_data = st.session_state.exam_questions
+# 새 버전이 게시되어 은행이 교체되었으면 이전 버전 기준 위치를 새 버전으로 옮김
+# (프래그먼트 실행과 콜백은 직전 전체 실행의 은행을 쓰므로 교체는 전체 실행 사이에만 일어남)
+bank_version = (st.session_state.bank_id, bank["version"])
+previous_version = st.session_state.get("bank_version")
+if previous_version and previous_version != bank_version and previous_version[0] == bank_version[0]:
+    previous_bank = registry.retired(*previous_version)
+    if previous_bank is not None:
+        rebase(st.session_state, previous_bank["questions"], data)
+    else:
+        reset_progress()
+    st.toast("🔄 문제 은행이 새 버전으로 업데이트되었습니다.")
+st.session_state.bank_version = bank_version
+
+# 시험 모드 확인 (세션에는 문제 은행 내 위치만 저장)
+if st.session_state.exam_mode and st.session_state.exam_indexes:
     exam_idx = st.session_state.exam_current_index
-    q = exam_data[exam_idx] if exam_idx < len(exam_data) else data[0]
-    total_exam = len(exam_data)
+    position = st.session_state.exam_indexes[exam_idx] if exam_idx < len(st.session_state.exam_indexes) else 0
 else:
-    exam_data = None
-    exam_idx = None
-    q = data[st.session_state.current_index]
-    total_exam = None
+    position = st.session_state.current_index
+q = data[position]
 
 # 문제 인덱스가 변경되면 선택한 답 초기화
 current_idx = st.session_state.exam_current_index if st.session_state.exam_mode else st.session_state.current_index
@@ -279,6 +227,7 @@ if current_idx != st.session_state.last_index:
     st.session_state.selected_answers = []
     st.session_state.show_answer = False
     st.session_state.last_index = current_idx
+    st.session_state.question_shown_at = time.time()
 
 # CSS 스타일링
 st.markdown("""
@@ -331,7 +280,7 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-st.title("🛡️ AWS AI Practitioner (AIF-C01) 연습장")
+st.title(f"🛡️ {registry.title(st.session_state.bank_id)} 연습장")
 
 # 사이드바: 시험 모드 설정
 st.sidebar.title("⚙️ 설정")
@@ -339,41 +288,29 @@ st.sidebar.title("⚙️ 설정")
 # 언어 모드 선택
 lang_mode = st.sidebar.radio(
     "🌐 언어 모드",
-    options=["한글", "English", "섞기"],
-    index=["한글", "English", "섞기"].index(st.session_state.lang_mode) if st.session_state.lang_mode in ["한글", "English", "섞기"] else 0,
+    options=LANG_MODES,
+    index=LANG_MODES.index(st.session_state.lang_mode) if st.session_state.lang_mode in LANG_MODES else 0,
     help="한글: 모든 문제를 한글로 표시\n영어: 모든 문제를 영어로 표시\n섞기: 한글과 영어를 랜덤으로 섞어 표시"
 )
 st.session_state.lang_mode = lang_mode
 
-# 시험 모드 시작 버튼
+# 시험 모드 시작 버튼 (적응형 시험은 문항 보정 결과가 있을 때만)
+item_params = load_item_parameters()
 if not st.session_state.exam_mode:
-    if st.sidebar.button("📝 시험 모드 시작 (65문제)", use_container_width=True, type="primary"):
-        # 랜덤으로 65문제 선택 (실제 시험 형식)
-        num_questions = min(65, len(data))
-        st.session_state.exam_questions = random.sample(data, num_questions)
-        st.session_state.exam_current_index = 0
-        st.session_state.exam_answers = {}
-        st.session_state.exam_finished = False
-        st.session_state.exam_mode = True
-        st.session_state.show_answer = False
-        st.session_state.selected_answer = None
-        st.session_state.selected_answers = []
-        st.rerun()
+    st.sidebar.button("📝 시험 모드 시작 (65문제)", use_container_width=True, type="primary", on_click=start_exam, args=(data,))
+    if item_params is not None:
+        st.sidebar.button("🎯 적응형 시험 시작", use_container_width=True, on_click=start_adaptive_exam, args=(data, item_params),
+                          help="답에 따라 실력을 가장 잘 가르는 문제를 골라 출제하고, 합격 가능성이 분명해지면 일찍 끝납니다.")
 
 # 시험 모드일 때
 if st.session_state.exam_mode:
     st.sidebar.markdown("---")
-    st.sidebar.warning(f"**시험 모드 진행 중**\n\n문제: {st.session_state.exam_current_index + 1} / {len(st.session_state.exam_questions)}")
-    
-    if st.sidebar.button("⏹️ 시험 모드 종료", use_container_width=True):
-        st.session_state.exam_mode = False
-        st.session_state.exam_finished = True
-        st.rerun()
+    if st.session_state.exam_adaptive:
+        st.sidebar.warning(f"**적응형 시험 진행 중**\n\n문제: {st.session_state.exam_current_index + 1} (최대 {EXAM_SIZE})")
+    else:
+        st.sidebar.warning(f"**시험 모드 진행 중**\n\n문제: {st.session_state.exam_current_index + 1} / {len(st.session_state.exam_indexes)}")
     
-    q = st.session_state.exam_questions[st.session_state.exam_current_index]
-    total_exam = len(st.session_state.exam_questions)
-else:
-    total_exam = None
+    st.sidebar.button("⏹️ 시험 모드 종료", use_container_width=True, on_click=nav, args=("stop_exam",))
 
 st.markdown(f"### Question {q['id']}")
 
@@ -382,187 +319,189 @@ question_en = q.get('question_en', '')
 question_ko = q.get('question_ko', '')
 
 # 언어 모드에 따라 질문 본문과 선택지 가져오기
-# 섞기 모드에서는 문제 ID 기반으로 고정 (같은 문제는 항상 같은 언어)
-question_body, choices = get_choices_for_language(question_en, question_ko, lang_mode, (lang_mode == "섞기"), q)
+# 본문/선택지는 전체 실행에서 한 번만 정하고 프래그먼트에 넘기므로 답을 고르는 동안 섞기 언어가 바뀌지 않음
+prefetcher = get_prefetcher()
+render_model = prefetcher.get((*bank_version, q['id']), build_render_model, q)
+question_body, choices = get_choices_for_language(question_en, question_ko, lang_mode, (lang_mode == "섞기"), q, choice_table, render_model)
 
 # 선택지가 없으면 영어에서 다시 파싱 시도
 if not choices:
     _, choices = parse_choices(question_en)
 
-is_multiple = is_multiple_choice(question_en) or is_multiple_choice(question_ko)
+is_multiple = render_model["is_multiple"]
 
 # 질문 본문 표시
 st.markdown(f'<div class="question-text">{question_body}</div>', unsafe_allow_html=True)
 
-# 선택지 표시
-if choices and len(choices) > 0:
-    st.markdown("---")
-    st.markdown("### 📋 답변 선택")
-    
-    sorted_keys = sorted(choices.keys())
-    
-    if is_multiple:
-        selected_list = st.multiselect(
-            "답변을 선택하세요 (여러 개 선택 가능):",
-            options=sorted_keys,
-            default=st.session_state.selected_answers if st.session_state.selected_answers else [],
-            format_func=lambda x: f"**{x}.** {choices[x]}",
-            key=f"multiselect_{current_idx}_{st.session_state.exam_mode}"
-        )
-        st.session_state.selected_answers = selected_list
-        st.session_state.selected_answer = None
-    else:
-        # 시험 모드에서는 정답을 보여주지 않음
-        default_idx = None
-        if st.session_state.exam_mode and str(current_idx) in st.session_state.exam_answers:
-            saved_answer = st.session_state.exam_answers[str(current_idx)]
-            if saved_answer in sorted_keys:
-                default_idx = sorted_keys.index(saved_answer)
-        
-        selected = st.radio(
-            "답변을 선택하세요:",
-            options=sorted_keys,
-            format_func=lambda x: f"**{x}.** {choices[x]}",
-            index=default_idx,
-            key=f"radio_{current_idx}_{st.session_state.exam_mode}"
-        )
-        st.session_state.selected_answer = selected
-        st.session_state.selected_answers = []
-        
-        # 시험 모드에서는 선택한 답 저장
-        if st.session_state.exam_mode and selected:
-            st.session_state.exam_answers[str(current_idx)] = selected
-else:
+if not choices:
     st.info("⚠️ 이 문제는 선택지가 없거나 특수 형식입니다 (예: HOTSPOT 문제)")
     st.markdown(f'<div class="question-text">{question_body}</div>', unsafe_allow_html=True)
     
     # HOTSPOT 문제의 이미지 표시
+    image_info = q.get('image')
     image_path = q.get('image_path')
-    if image_path and os.path.exists(image_path):
+    if image_info and image_info.get('variants'):
+        # 전처리된 변형 이미지는 정적 파일 서빙으로 제공 (브라우저가 캐시)
         st.markdown("---")
         st.markdown("### 🖼️ 문제 이미지")
-        st.image(image_path, use_container_width=True, caption=f"Question {q['id']} Image")
+        st.markdown(image_html(image_info, alt=f"Question {q['id']} Image"), unsafe_allow_html=True)
+        st.caption(f"Question {q['id']} Image")
+    elif image_path and os.path.exists(image_path):
+        st.markdown("---")
+        st.markdown("### 🖼️ 문제 이미지")
+        st.image(render_model["image_bytes"] or image_path, use_container_width=True, caption=f"Question {q['id']} Image")
     
     st.session_state.selected_answer = None
     st.session_state.selected_answers = []
 
-# 시험 모드가 아닐 때만 정답 확인 버튼 표시
-if not st.session_state.exam_mode:
+def related_questions_panel(position, expanded):
+    """관련 문제 목록 (문제 은행과 함께 미리 계산한 그래프에서 조회, 누르면 그 문제로 이동)"""
+    related = related_graph.related(position) if related_graph is not None else []
+    if not related:
+        return
+    with st.expander("🔗 관련 문제", expanded=expanded):
+        for related_position, score in related:
+            related_q = data[related_position]
+            text = related_q.get('question_ko') if st.session_state.lang_mode == "한글" else None
+            text = (text or related_q.get('question_en', ''))[:80]
+            st.button(f"Q{related_q['id']} · {text}", key=f"related_{position}_{related_position}",
+                      use_container_width=True, help=f"유사도 {score:.2f}",
+                      on_click=fragment_nav, args=("goto", related_position, len(data)))
+
+# 답변 영역: 선택지 선택, 정답 확인, 다시 풀기는 이 프래그먼트만 다시 실행
+# (문제 이동이나 오답 노트 변경처럼 다른 영역이 바뀌는 경우에만 전체 다시 실행)
+@st.fragment
+def answer_pane(q, position, choices, is_multiple, current_idx):
+    if choices:
+        st.markdown("---")
+        st.markdown("### 📋 답변 선택")
+        
+        sorted_keys = sorted(choices.keys())
+        
+        if is_multiple:
+            # 시험 모드에서는 이전에 선택한 답 복원
+            default_list = st.session_state.selected_answers
+            if not default_list and st.session_state.exam_mode:
+                default_list = [a for a in mask_choices(st.session_state.exam_answers[current_idx]) if a in choices]
+            selected_list = st.multiselect(
+                "답변을 선택하세요 (여러 개 선택 가능):",
+                options=sorted_keys,
+                default=default_list,
+                format_func=lambda x: f"**{x}.** {choices[x]}",
+                key=f"multiselect_{current_idx}_{st.session_state.exam_mode}"
+            )
+            st.session_state.selected_answers = selected_list
+            st.session_state.selected_answer = None
+            
+            # 시험 모드에서는 선택한 답 저장 (비트마스크)
+            if st.session_state.exam_mode and selected_list:
+                save_exam_answer(current_idx, choice_mask(selected_list))
+        else:
+            # 시험 모드에서는 정답을 보여주지 않음
+            default_idx = None
+            if st.session_state.exam_mode:
+                saved_answer = mask_choices(st.session_state.exam_answers[current_idx])
+                if saved_answer and saved_answer[0] in sorted_keys:
+                    default_idx = sorted_keys.index(saved_answer[0])
+            
+            selected = st.radio(
+                "답변을 선택하세요:",
+                options=sorted_keys,
+                format_func=lambda x: f"**{x}.** {choices[x]}",
+                index=default_idx,
+                key=f"radio_{current_idx}_{st.session_state.exam_mode}"
+            )
+            st.session_state.selected_answer = selected
+            st.session_state.selected_answers = []
+            
+            # 시험 모드에서는 선택한 답 저장 (비트마스크)
+            if st.session_state.exam_mode and selected:
+                save_exam_answer(current_idx, choice_mask(selected))
+    
+    # 시험 모드에서는 정답 확인 버튼과 정답을 보여주지 않음
+    if st.session_state.exam_mode:
+        return
+    
     st.markdown("---")
     check_disabled = (len(st.session_state.selected_answers) == 0 if is_multiple else st.session_state.selected_answer is None)
     
-    if st.button("✅ 정답 확인", disabled=check_disabled, type="primary", use_container_width=True):
-        st.session_state.show_answer = True
-
-# 정답 표시 (시험 모드가 아닐 때만)
-if not st.session_state.exam_mode and st.session_state.show_answer:
-    st.markdown("---")
-    answer_text = q.get('answer', '')
-    correct_answers = extract_correct_answers(answer_text)
+    st.button("✅ 정답 확인", disabled=check_disabled, type="primary", use_container_width=True,
+              on_click=check_answer, args=(q, position, is_multiple))
     
-    if is_multiple:
-        user_selected = sorted(st.session_state.selected_answers)
-        correct_sorted = sorted(correct_answers) if correct_answers else []
-        is_correct = user_selected == correct_sorted
-    else:
-        correct_letter = correct_answers[0] if correct_answers else None
-        is_correct = st.session_state.selected_answer == correct_letter
+    if not st.session_state.show_answer:
+        return
     
-    if is_correct:
+    st.markdown("---")
+    checked = st.session_state.selected_answers if is_multiple else st.session_state.selected_answer
+    if grade_answer(q, checked):
         st.success(f"✅ **정답입니다!**\n\n{q['answer']}")
     else:
         st.error(f"❌ **틀렸습니다.**\n\n**정답:** {q['answer']}")
-        if is_multiple:
-            if st.session_state.selected_answers:
-                st.warning(f"**선택하신 답:** {', '.join(st.session_state.selected_answers)}")
-        else:
-            if st.session_state.selected_answer:
-                st.warning(f"**선택하신 답:** {st.session_state.selected_answer}")
-        
-        if q not in st.session_state.wrong_answers:
-            st.session_state.wrong_answers.append(q)
+        if checked:
+            st.warning(f"**선택하신 답:** {', '.join(checked) if is_multiple else checked}")
+        if st.session_state.pop("wrong_added_notice", False):
             st.info("💡 오답 노트에 자동으로 추가되었습니다.")
+    related_questions_panel(position, expanded=not grade_answer(q, checked))
     
     st.markdown("---")
     
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("⭕ 다음 문제", use_container_width=True, type="primary"):
-            if st.session_state.exam_mode:
-                st.session_state.exam_current_index = (st.session_state.exam_current_index + 1) % len(st.session_state.exam_questions)
-            else:
-                st.session_state.current_index = (st.session_state.current_index + 1) % len(data)
-            st.session_state.show_answer = False
-            st.session_state.selected_answer = None
-            st.session_state.selected_answers = []
-            st.rerun()
+        st.button("⭕ 다음 문제", use_container_width=True, type="primary", on_click=fragment_nav, args=("next", len(data)))
     with col2:
-        if st.button("🔄 다시 풀기", use_container_width=True):
-            st.session_state.show_answer = False
-            st.session_state.selected_answer = None
-            st.session_state.selected_answers = []
-            st.rerun()
+        # 다른 영역은 바뀌지 않으므로 이 프래그먼트만 다시 실행됨
+        st.button("🔄 다시 풀기", use_container_width=True, on_click=nav, args=("retry",))
 
-# 시험 모드 네비게이션
-if st.session_state.exam_mode and not st.session_state.exam_finished:
+answer_pane(q, position, choices, is_multiple, current_idx)
+
+# 다음 문제 미리 불러오기 (현재 문제와 정답을 보는 동안 백그라운드에서 준비)
+if st.session_state.exam_mode:
+    next_exam_idx = st.session_state.exam_current_index + 1
+    next_q = data[st.session_state.exam_indexes[next_exam_idx]] if next_exam_idx < len(st.session_state.exam_indexes) else None
+else:
+    next_q = data[(st.session_state.current_index + 1) % len(data)]
+if next_q is not None:
+    prefetcher.prefetch((*bank_version, next_q['id']), build_render_model, next_q)
+    if next_q.get('image'):
+        # 브라우저가 다음 문제 이미지를 미리 받아 캐시하도록 숨김 이미지로 요청
+        st.markdown(image_prefetch_html(next_q['image']), unsafe_allow_html=True)
+
+# 시험 모드 네비게이션 (버튼 상태 계산은 이 프래그먼트 안에서만, 문제가 바뀌면 전체 다시 실행)
+@st.fragment
+def exam_navigator():
     st.markdown("---")
+    exam_index = st.session_state.exam_current_index
+    adaptive = st.session_state.exam_adaptive
+    is_last = exam_index >= len(st.session_state.exam_indexes) - 1
     col1, col2, col3 = st.columns([1, 1, 1])
     with col1:
-        if st.button("◀ 이전 문제", use_container_width=True, disabled=(st.session_state.exam_current_index == 0)):
-            if st.session_state.exam_current_index > 0:
-                st.session_state.exam_current_index -= 1
-                st.session_state.show_answer = False
-                saved_answer = st.session_state.exam_answers.get(str(st.session_state.exam_current_index))
-                st.session_state.selected_answer = saved_answer
-                st.session_state.selected_answers = []
-                st.rerun()
+        # 적응형 시험은 이미 낸 답으로 다음 문제를 골랐으므로 이전 문제로 돌아가지 않음
+        st.button("◀ 이전 문제", use_container_width=True, disabled=(exam_index == 0 or adaptive),
+                  on_click=fragment_nav, args=("exam_goto", exam_index - 1))
     with col2:
-        # 답변을 선택해야만 다음 문제로 넘어갈 수 있음
-        has_answer = st.session_state.selected_answer is not None or len(st.session_state.selected_answers) > 0
-        is_last = st.session_state.exam_current_index >= len(st.session_state.exam_questions) - 1
-        if st.button("다음 문제 ▶", use_container_width=True, disabled=(is_last or not has_answer)):
-            if st.session_state.exam_current_index < len(st.session_state.exam_questions) - 1:
-                st.session_state.exam_current_index += 1
-                st.session_state.show_answer = False
-                saved_answer = st.session_state.exam_answers.get(str(st.session_state.exam_current_index))
-                st.session_state.selected_answer = saved_answer
-                st.session_state.selected_answers = []
-                st.rerun()
+        if adaptive:
+            st.button("다음 문제 ▶", use_container_width=True, on_click=adaptive_next, args=(data, item_params))
+        else:
+            st.button("다음 문제 ▶", use_container_width=True, disabled=is_last, on_click=exam_next)
+        if st.session_state.pop("exam_nav_warning", False):
+            st.warning("답변을 선택한 뒤 다음 문제로 넘어갈 수 있습니다.")
     with col3:
-        if st.button("✅ 시험 완료", use_container_width=True, type="primary"):
-            st.session_state.exam_finished = True
-            st.rerun()
+        st.button("✅ 시험 완료", use_container_width=True, type="primary", on_click=finish_exam, args=(data, item_params))
 
-# 시험 결과 표시
+if st.session_state.exam_mode and not st.session_state.exam_finished:
+    exam_navigator()
+
+# 시험 결과 표시 (채점은 시험 완료 시 한 번만)
 if st.session_state.exam_finished and st.session_state.exam_mode:
     st.markdown("---")
     st.markdown("## 🎯 시험 결과")
     
-    # 정답 채점 및 오답 노트에 추가
-    correct_count = 0
-    total_count = len(st.session_state.exam_questions)
-    wrong_questions = []
-    
-    for idx, exam_q in enumerate(st.session_state.exam_questions):
-        user_answer = st.session_state.exam_answers.get(str(idx))
-        if user_answer:
-            correct_answers = extract_correct_answers(exam_q.get('answer', ''))
-            if correct_answers and user_answer == correct_answers[0]:
-                correct_count += 1
-            else:
-                # 오답인 경우 오답 노트에 추가
-                if exam_q not in st.session_state.wrong_answers:
-                    st.session_state.wrong_answers.append(exam_q)
-                    wrong_questions.append(exam_q)
-        else:
-            # 답을 선택하지 않은 문제도 오답으로 처리
-            if exam_q not in st.session_state.wrong_answers:
-                st.session_state.wrong_answers.append(exam_q)
-                wrong_questions.append(exam_q)
-    
-    score_percent = (correct_count / total_count * 100) if total_count > 0 else 0
-    passing_score = 70.0
-    passed = score_percent >= passing_score
+    result = st.session_state.exam_result
+    correct_count = result["correct_count"]
+    total_count = result["total_count"]
+    score_percent = result["score_percent"]
+    passing_score = result["passing_score"]
+    passed = result["passed"]
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -572,50 +511,79 @@ if st.session_state.exam_finished and st.session_state.exam_mode:
     with col3:
         st.metric("합격 기준", f"{passing_score}%")
     
-    if passed:
+    if st.session_state.exam_adaptive and "readiness" in result:
+        if passed:
+            st.success(f"🎉 **합격 예상입니다!** (합격 가능성 {result['readiness'] * 100:.0f}%, {total_count}문제)")
+        else:
+            st.error(f"❌ **아직 불합격 예상입니다.** (합격 가능성 {result['readiness'] * 100:.0f}%, {total_count}문제)")
+    elif passed:
         st.success(f"🎉 **합격입니다!** ({score_percent:.1f}%)")
     else:
         st.error(f"❌ **불합격입니다.** ({score_percent:.1f}% / 합격 기준: {passing_score}%)")
     
+    # 문항 난이도/변별도를 반영한 합격 가능성 (적응형 시험은 점수보다 이 값이 기준)
+    if "readiness" in result:
+        st.metric("예상 합격 가능성", f"{result['readiness'] * 100:.0f}%",
+                  help=f"문제 난이도를 반영한 실력 추정 {result['theta']:+.2f} (±{result['se']:.2f})")
+    
     # 오답 노트에 추가된 문제 수 표시
-    if wrong_questions:
-        st.info(f"💡 {len(wrong_questions)}개 오답이 오답 노트에 자동으로 추가되었습니다.")
+    if result["added_wrong"]:
+        st.info(f"💡 {result['added_wrong']}개 오답이 오답 노트에 자동으로 추가되었습니다.")
     
-    if st.button("🔁 새 시험 시작", use_container_width=True, type="primary"):
-        st.session_state.exam_mode = False
-        st.session_state.exam_finished = False
-        st.session_state.exam_questions = []
-        st.session_state.exam_answers = {}
-        st.session_state.exam_current_index = 0
-        st.rerun()
-
-# 오답 노트 관리
-st.sidebar.markdown("---")
-st.sidebar.title("📝 오답 노트")
-st.sidebar.metric("현재 오답 개수", f"{len(st.session_state.wrong_answers)}개")
-
-# PDF 다운로드 버튼
-if len(st.session_state.wrong_answers) > 0:
-    try:
-        pdf_data = generate_pdf(st.session_state.wrong_answers)
-        if pdf_data:
+    st.button("🔁 새 시험 시작", use_container_width=True, type="primary", on_click=nav, args=("new_exam",))
+
+# 오답 노트와 내보내기: 초기화나 내보내기 설정을 바꿔도 사이드바의 이 영역만 다시 실행
+@st.fragment
+def wrong_notes_panel():
+    st.markdown("---")
+    st.title("📝 오답 노트")
+    st.metric("현재 오답 개수", f"{len(st.session_state.wrong_indexes)}개")
+    
+    # PDF 다운로드 버튼 (PDF는 버튼을 누를 때 생성, fpdf 설치 여부는 모듈을 불러오지 않고 확인)
+    if len(st.session_state.wrong_indexes) > 0:
+        if find_spec("fpdf") is not None:
             date_str = datetime.now().strftime("%Y-%m-%d")
             filename = f"{date_str}_오답.pdf"
-            st.sidebar.download_button(
+            wrong_snapshot = st.session_state.wrong_indexes.tolist()
+            st.download_button(
                 label="📥 PDF 다운로드",
-                data=pdf_data,
+                data=lambda: build_wrong_answer_pdf([data[i] for i in wrong_snapshot], choice_table),
                 file_name=filename,
                 mime="application/pdf",
                 use_container_width=True
             )
         else:
-            st.sidebar.info("💡 PDF 생성 라이브러리(fpdf2)가 필요합니다.\n`pip install fpdf2` 실행해주세요.")
-    except Exception as e:
-        st.sidebar.error(f"PDF 생성 오류: {str(e)}")
+            st.info("💡 PDF 생성 라이브러리(fpdf2)가 필요합니다.\n`pip install fpdf2` 실행해주세요.")
+    
+    st.button("🗑️ 오답 노트 초기화", use_container_width=True, on_click=clear_wrong_answers)
+    
+    # 문제 은행 내보내기 (버튼을 누를 때 임시 파일로 스트리밍해 만든 뒤 지움, 세션 상태에는 저장하지 않음)
+    with st.expander("📤 문제 내보내기"):
+        from export_bank import download_name, export_bytes
+        export_labels = {"pdf": "PDF", "csv": "CSV", "anki-tsv": "Anki 가져오기용 TSV (zip)"}
+        export_mimes = {"pdf": "application/pdf", "csv": "text/csv", "anki-tsv": "application/zip"}
+        if find_spec("fpdf") is None:
+            del export_labels["pdf"]
+        export_format = st.selectbox("형식", options=list(export_labels), format_func=export_labels.get)
+        export_scope = st.radio("범위", options=["전체 문제", "오답 노트"], horizontal=True)
+        export_wrong = st.session_state.wrong_indexes.tolist() if export_scope == "오답 노트" else None
+        questions_path = bank["config"]["questions"]
+
+        def build_export(fmt=export_format, wrong=export_wrong):
+            from question_store import iter_questions
+            source = (data[i] for i in wrong) if wrong is not None else iter_questions(questions_path)
+            return export_bytes(source, fmt, choice_table)[0]
+
+        st.download_button(
+            label=f"📥 {export_labels[export_format]} 내보내기",
+            data=build_export,
+            file_name=download_name(export_format, archive=True),
+            mime=export_mimes[export_format],
+            use_container_width=True
+        )
 
-if st.sidebar.button("🗑️ 오답 노트 초기화", use_container_width=True):
-    st.session_state.wrong_answers = []
-    st.rerun()
+with st.sidebar:
+    wrong_notes_panel()
 
 # 일반 모드 네비게이션
 if not st.session_state.exam_mode:
@@ -623,19 +591,13 @@ if not st.session_state.exam_mode:
     st.sidebar.markdown("### 📖 문제 이동")
     prev_col, next_col = st.sidebar.columns(2)
     with prev_col:
-        if st.sidebar.button("◀ 이전", use_container_width=True):
-            st.session_state.current_index = (st.session_state.current_index - 1) % len(data)
-            st.session_state.show_answer = False
-            st.session_state.selected_answer = None
-            st.session_state.selected_answers = []
-            st.rerun()
+        st.sidebar.button("◀ 이전", use_container_width=True, on_click=nav, args=("prev", len(data)))
     with next_col:
-        if st.sidebar.button("다음 ▶", use_container_width=True):
-            st.session_state.current_index = (st.session_state.current_index + 1) % len(data)
-            st.session_state.show_answer = False
-            st.session_state.selected_answer = None
-            st.session_state.selected_answers = []
-            st.rerun()
+        st.sidebar.button("다음 ▶", use_container_width=True, on_click=nav, args=("next", len(data)))
     
     st.sidebar.markdown("---")
     st.sidebar.info(f"**현재 문제:** {st.session_state.current_index + 1} / {len(data)}")
+
+# 세션 상태 크기 (문제 객체 대신 은행 내 위치와 답 비트마스크만 저장)
+session_bytes = session_footprint(st.session_state)
+st.sidebar.caption(f"세션 상태 {sum(session_bytes.values()):,} 바이트")
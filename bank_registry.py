@@ -0,0 +1,189 @@
+"""여러 자격증 문제 은행 관리 (처음 사용할 때 로드, 메모리 한도를 넘거나 오래 쓰지 않으면 해제)
+
+문제 은행 목록은 data/banks.json에 정의합니다. 파일이 없으면 기존 AIF-C01 경로 하나만 사용합니다.
+releases 디렉터리에 게시된 버전(snapshot.publish_release)이 있으면 그 버전을, 없으면 questions.json을 로드합니다.
+
+    [
+        {"id": "aif-c01", "title": "AWS AI Practitioner (AIF-C01)",
+         "questions": "data/questions.json", "choices": "data/choices.json",
+         "snapshot": "data/questions.snapshot.pkl", "releases": "data/releases", "irt": "data/irt.npz",
+         "sources": ["data/ai_dump_1_120.pdf", "data/ai_dump_121_240.pdf", "data/ai_dump_241_329.pdf"]}
+    ]
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from snapshot import load_bank, load_release, pointer_signature
+
+DEFAULT_REGISTRY_PATH = "data/banks.json"
+DEFAULT_BANK = {
+    "id": "aif-c01",
+    "title": "AWS AI Practitioner (AIF-C01)",
+    "questions": "data/questions.json",
+    "choices": "data/choices.json",
+    "snapshot": "data/questions.snapshot.pkl",
+    "releases": "data/releases",
+    "irt": "data/irt.npz",
+    "sources": ["data/ai_dump_1_120.pdf", "data/ai_dump_121_240.pdf", "data/ai_dump_241_329.pdf"],
+}
+
+
+def _with_defaults(config):
+    """빠진 경로는 data/<id>/ 아래 기본 파일명으로 채움"""
+    bank_id = config["id"]
+    base = os.path.join("data", bank_id)
+    return {
+        "title": bank_id,
+        "questions": os.path.join(base, "questions.json"),
+        "choices": os.path.join(base, "choices.json"),
+        "snapshot": os.path.join(base, "questions.snapshot.pkl"),
+        "releases": os.path.join(base, "releases"),
+        "irt": os.path.join(base, "irt.npz"),
+        "sources": [],
+        **config,
+    }
+
+
+def load_bank_configs(path=DEFAULT_REGISTRY_PATH):
+    """문제 은행 설정 목록 (id 순서는 파일 순서)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            configs = json.load(f)
+    except FileNotFoundError:
+        return [dict(DEFAULT_BANK)]
+    return [_with_defaults(c) for c in configs]
+
+
+def get_bank_config(bank_id=None, path=DEFAULT_REGISTRY_PATH):
+    """id로 설정 조회 (id를 생략하면 첫 번째 은행)"""
+    configs = load_bank_configs(path)
+    if bank_id is None:
+        return configs[0]
+    for config in configs:
+        if config["id"] == bank_id:
+            return config
+    raise KeyError(f"등록되지 않은 문제 은행: {bank_id}")
+
+
+class BankRegistry:
+    """문제 은행을 처음 요청할 때 로드하고 최근 사용 순서(LRU)로 보관
+
+    max_banks: 동시에 메모리에 둘 은행 수
+    max_bytes: 로드된 은행의 추정 크기 합계 한도 (questions.json 파일 크기 기준, None이면 제한 없음)
+    idle_seconds: 이 시간 동안 요청이 없던 은행은 다음 요청 때 해제
+
+    요청할 때마다 releases/CURRENT를 stat해서 새 버전이 게시되었으면 새 버전을 로드해 교체합니다.
+    다른 세션이 새 버전을 로드하는 동안에는 기다리지 않고 이전 버전을 반환하며,
+    교체된 직전 버전은 세션의 문제 위치를 옮길 수 있도록 retired()로 한 번 더 보관합니다.
+    """
+
+    def __init__(self, configs=None, max_banks=2, max_bytes=None, idle_seconds=30 * 60):
+        configs = configs if configs is not None else load_bank_configs()
+        self.configs = OrderedDict((c["id"], c) for c in configs)
+        self.max_banks = max_banks
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._banks = OrderedDict()  # id -> (bank, 추정 크기, 마지막 사용 시각, CURRENT 시그니처)
+        self._retired = {}  # id -> 직전 버전 bank
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def bank_ids(self):
+        return list(self.configs)
+
+    def title(self, bank_id):
+        return self.configs[bank_id]["title"]
+
+    def loaded_ids(self):
+        with self._lock:
+            return list(self._banks)
+
+    def get(self, bank_id):
+        """문제 은행 반환 ({"questions", "choice_table", "config", "version"}), 없거나 새 버전이 게시되었으면 로드"""
+        config = self.configs[bank_id]
+        signature = pointer_signature(config["releases"])
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now, keep=bank_id)
+            entry = self._banks.get(bank_id)
+            if entry is not None:
+                self._banks[bank_id] = (entry[0], entry[1], now, entry[3])
+                self._banks.move_to_end(bank_id)
+                if entry[3] == signature:
+                    return entry[0]
+            # 같은 은행을 여러 세션이 동시에 요청해도 한 번만 로드
+            load_lock = self._loading.setdefault(bank_id, threading.Lock())
+
+        if entry is not None and not load_lock.acquire(blocking=False):
+            return entry[0]  # 다른 세션이 새 버전을 로드하는 중
+        if entry is None:
+            load_lock.acquire()
+        try:
+            with self._lock:
+                current = self._banks.get(bank_id)
+                if current is not None and current[3] == signature:
+                    return current[0]
+            bank, size = self._load(config)
+            with self._lock:
+                previous = self._banks.get(bank_id)
+                if previous is not None and previous[0]["version"] != bank["version"]:
+                    self._retired[bank_id] = previous[0]
+                elif previous is not None:
+                    bank = previous[0]  # CURRENT만 다시 쓰고 버전은 같음
+                self._banks[bank_id] = (bank, size, time.monotonic(), signature)
+                self._banks.move_to_end(bank_id)
+                self._evict_over_limit(keep=bank_id)
+                self._loading.pop(bank_id, None)
+            return bank
+        finally:
+            load_lock.release()
+
+    def retired(self, bank_id, version):
+        """교체되기 직전 버전 (version이 다르거나 이미 해제되었으면 None)"""
+        with self._lock:
+            bank = self._retired.get(bank_id)
+        return bank if bank is not None and bank["version"] == version else None
+
+    @staticmethod
+    def _load(config):
+        """(bank, 추정 크기) - 게시된 버전이 있으면 그 버전의 파일을 config 경로로 사용"""
+        bank = load_release(config["releases"])
+        if bank is None:
+            bank = {**load_bank(config["questions"], config["choices"], config["snapshot"]), "version": None}
+        else:
+            config = {**config, **bank.pop("paths")}
+        try:
+            size = os.path.getsize(config["questions"])
+        except OSError:
+            size = 0
+        return {**bank, "config": config}, size
+
+    def evict(self, bank_id):
+        with self._lock:
+            self._banks.pop(bank_id, None)
+            self._retired.pop(bank_id, None)
+
+    def _evict_idle(self, now, keep):
+        for bank_id, (_, _, last_used, _) in list(self._banks.items()):
+            if bank_id != keep and now - last_used > self.idle_seconds:
+                del self._banks[bank_id]
+                self._retired.pop(bank_id, None)
+
+    def _evict_over_limit(self, keep):
+        while len(self._banks) > 1:
+            total = sum(entry[1] for entry in self._banks.values())
+            if len(self._banks) <= self.max_banks and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            oldest = next(b for b in self._banks if b != keep)
+            del self._banks[oldest]
+            self._retired.pop(oldest, None)
+
+
+@lru_cache(maxsize=1)
+def default_registry():
+    """프로세스 전체에서 공유하는 문제 은행 목록 (앱의 모든 페이지와 세션이 같은 캐시 사용)"""
+    return BankRegistry()
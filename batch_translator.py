@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""비동기 배치 번역 파이프라인
+
+번역 사전(data/choices_translations.json)과 선택지 테이블(data/choices.json)의 빈 항목, 그리고
+선택지 테이블을 쓰지 않는 문제의 누락된 choices_ko를 번역 백엔드로 채웁니다. 결과는 백엔드별 영구 캐시에 저장되므로 중단 후 다시 실행하면 이어서 진행합니다.
+한글 번역으로 인정되지 않는 결과(원문 그대로, 영어가 섞인 번역 등)는 캐시하거나 채우지 않습니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from choice_table import DEFAULT_TABLE_PATH, ChoiceTable, is_valid_translation
+from io_utils import atomic_write_json
+from question_model import save_questions
+
+DEFAULT_CACHE_PATH = 'data/translation_cache.json'
+
+
+class TranslationError(Exception):
+    """재시도 후에도 번역에 실패한 경우"""
+
+
+class RetryableTranslationError(TranslationError):
+    """재시도하면 성공할 수 있는 일시적 오류 (타임아웃, 429, 5xx 등)"""
+
+
+class TranslationBackend:
+    """번역 백엔드 인터페이스
+
+    translate_batch()는 입력과 같은 순서·길이의 번역 리스트를 반환해야 합니다.
+    name은 번역 캐시를 백엔드별로 나누는 키입니다.
+    """
+    name = 'default'
+    max_batch_size = 32
+
+    async def translate_batch(self, texts):
+        raise NotImplementedError
+
+
+class HttpBackend(TranslationBackend):
+    """JSON HTTP 번역 서비스 백엔드
+
+    요청: POST {"source": "en", "target": "ko", "texts": [...]}
+    응답: {"translations": [...]}
+    """
+
+    def __init__(self, url, timeout=30, max_batch_size=32, name=None):
+        self.url = url
+        self.name = name or url
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+
+    def _post(self, texts):
+        body = json.dumps({"source": "en", "target": "ko", "texts": texts}, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            if e.code == 429 or e.code >= 500:
+                raise RetryableTranslationError(f"HTTP {e.code}") from e
+            raise TranslationError(f"HTTP {e.code}") from e
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise RetryableTranslationError(str(e)) from e
+
+        translations = payload.get("translations")
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise TranslationError("번역 응답 형식 오류")
+        return translations
+
+    async def translate_batch(self, texts):
+        return await asyncio.to_thread(self._post, texts)
+
+
+class _LocalTranslationHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        translations = [self.server.translate(text) for text in payload.get("texts", [])]
+        body = json.dumps({"translations": translations}, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalTranslationServer:
+    """테스트용 로컬 HTTP 번역 서버 (규칙 기반 번역기로 응답)
+
+    with LocalTranslationServer() as server:
+        backend = HttpBackend(server.url)
+    """
+
+    def __init__(self, translate=None, host='127.0.0.1', port=0):
+        if translate is None:
+            from enhance_questions import translate_choice_simple
+            translate = translate_choice_simple
+        self._httpd = ThreadingHTTPServer((host, port), _LocalTranslationHandler)
+        self._httpd.translate = translate
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/translate"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class TranslationCache:
+    """번역 결과 영구 캐시 (백엔드 이름 → {원문 → 번역}, JSON 파일)
+
+    같은 원문이라도 백엔드마다 번역이 다르므로 backend 이름별로 따로 저장합니다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, backend='default'):
+        self.path = path
+        self.backend = backend
+        self._file = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._file = json.load(f)
+            # 백엔드 구분이 없던 이전 형식의 캐시는 어느 백엔드의 결과인지 알 수 없으므로 사용하지 않음
+            self._file = {name: entries for name, entries in self._file.items() if isinstance(entries, dict)}
+        self._data = self._file.setdefault(backend, {})
+
+    def __contains__(self, text):
+        return text in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, text, default=None):
+        return self._data.get(text, default)
+
+    def update(self, pairs):
+        self._data.update(pairs)
+        self._dirty = True
+
+    def save(self):
+        """변경 사항이 있을 때만 캐시 파일 저장 (체크포인트)"""
+        if self.path and self._dirty:
+            atomic_write_json(self.path, self._file, indent=None)
+            self._dirty = False
+
+
+class BatchTranslator:
+    """동시 실행 수 제한, 배치, 재시도, 체크포인트를 지원하는 비동기 번역기"""
+
+    def __init__(self, backend, cache=None, concurrency=4, batch_size=None,
+                 max_retries=5, backoff=0.5, checkpoint_every=10):
+        self.backend = backend
+        self.cache = cache if cache is not None else TranslationCache(None, backend.name)
+        self.concurrency = concurrency
+        self.batch_size = min(batch_size or backend.max_batch_size, backend.max_batch_size)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.checkpoint_every = checkpoint_every
+
+    async def _translate_with_retry(self, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.backend.translate_batch(batch)
+            except RetryableTranslationError:
+                if attempt == self.max_retries:
+                    raise
+                # 지수 백오프 + 지터
+                delay = self.backoff * (2 ** attempt)
+                await asyncio.sleep(delay * (0.5 + random.random() / 2))
+
+    async def translate_all(self, texts, progress=None):
+        """texts 전체를 번역하여 {원문: 번역} 반환 (캐시에 있는 항목은 요청하지 않음)
+
+        올바른 한글 번역이 아닌 결과는 캐시하지 않고 None으로 반환합니다.
+        """
+        unique = list(dict.fromkeys(t for t in texts if t))
+        pending = [t for t in unique if t not in self.cache]
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch):
+            async with semaphore:
+                return batch, await self._translate_with_retry(batch)
+
+        done = 0
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            for finished, future in enumerate(asyncio.as_completed(tasks), 1):
+                batch, translations = await future
+                self.cache.update((text, ko) for text, ko in zip(batch, translations)
+                                  if ko != text and is_valid_translation(ko))
+                done += len(batch)
+                if progress:
+                    progress(done, len(pending))
+                if finished % self.checkpoint_every == 0:
+                    self.cache.save()
+        finally:
+            for task in tasks:
+                task.cancel()
+            # 중단되더라도 완료된 배치는 저장하여 다음 실행에서 이어서 진행
+            self.cache.save()
+
+        return {t: self.cache.get(t) for t in unique}
+
+
+def fill_missing_translations(translator, translations_path='data/choices_translations.json',
+                              questions_path='data/questions.json', table_path=DEFAULT_TABLE_PATH):
+    """번역 사전과 선택지 테이블의 빈 항목, choice_ids가 없는 문제의 누락된 choices_ko 채우기
+
+    choice_ids가 있는 문제는 테이블 항목이 채워져 있으면 번역된 것으로 보며, 새 번역은 문제가 아닌
+    테이블의 해당 id 위치에 씁니다.
+    """
+    from enhance_questions import parse_choices
+
+    with open(translations_path, 'r', encoding='utf-8') as f:
+        translations_dict = json.load(f)
+
+    data = []
+    if os.path.exists(questions_path):
+        with open(questions_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    table = ChoiceTable.load(table_path)
+
+    todo = [choice for choice, ko in translations_dict.items() if not ko]
+    for q in data:
+        choice_ids = q.get('choice_ids')
+        if q.get('choices_ko'):
+            continue
+        if table is not None and choice_ids:
+            todo.extend(table.texts[i] for i in choice_ids.values() if not table.translations[i])
+        else:
+            todo.extend(parse_choices(q.get('question_en', '')).values())
+
+    def report(done, total):
+        print(f"\r번역 진행: {done}/{total}", end='', flush=True)
+
+    start = time.perf_counter()
+    results = asyncio.run(translator.translate_all(todo, progress=report))
+    translated = sum(1 for ko in results.values() if ko)
+    print(f"\n✅ {len(results)}개 선택지 중 {translated}개 번역 완료 ({time.perf_counter() - start:.1f}초)")
+    if translated < len(results):
+        print(f"⚠️ {len(results) - translated}개는 올바른 한글 번역을 받지 못해 빈 값으로 둡니다.")
+
+    filled = 0
+    for choice, ko in translations_dict.items():
+        if not ko and results.get(choice):
+            translations_dict[choice] = results[choice]
+            filled += 1
+    atomic_write_json(translations_path, translations_dict, indent=2)
+
+    table_filled = 0
+    if table is not None:
+        for choice_id, text in enumerate(table.texts):
+            if not table.translations[choice_id] and results.get(text):
+                table.translations[choice_id] = results[text]
+                table_filled += 1
+        if table_filled:
+            table.save(table_path)
+
+    updated = 0
+    for q in data:
+        if table is not None and q.get('choice_ids'):
+            continue
+        if not q.get('choices_ko'):
+            en_choices = parse_choices(q.get('question_en', ''))
+            # 선택지 하나라도 번역이 없으면 영어가 섞이지 않도록 choices_ko를 채우지 않음
+            if en_choices and all(results.get(text) for text in en_choices.values()):
+                q['choices_ko'] = {letter: results[text] for letter, text in en_choices.items()}
+                updated += 1
+    if updated:
+        save_questions(questions_path, data)
+
+    print(f"✅ 번역 사전 {filled}개 항목, 선택지 테이블 {table_filled}개 항목, 문제 {updated}개의 choices_ko를 채웠습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비어 있는 선택지 번역을 배치로 채웁니다.")
+    parser.add_argument('--backend', choices=['http', 'local'], default='http',
+                        help="http: --url의 번역 서비스 사용, local: 로컬 규칙 기반 번역 서버 사용 (테스트용)")
+    parser.add_argument('--url', help="HTTP 번역 서비스 주소")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-retries', type=int, default=5)
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    parser.add_argument('--questions', default='data/questions.json', help="문제 파일 경로")
+    parser.add_argument('--choices', default=DEFAULT_TABLE_PATH, help="선택지 테이블 경로")
+    args = parser.parse_args()
+
+    if args.backend == 'http' and not args.url:
+        parser.error("--backend http 사용 시 --url이 필요합니다 (로컬 테스트는 --backend local).")
+    cache = TranslationCache(args.cache, backend=args.url if args.backend == 'http' else 'local')
+    print(f"캐시된 번역: {len(cache)}개")
+
+    if args.backend == 'http':
+        backend = HttpBackend(args.url, max_batch_size=args.batch_size)
+        translator = BatchTranslator(backend, cache, args.concurrency, args.batch_size, args.max_retries)
+        fill_missing_translations(translator, questions_path=args.questions, table_path=args.choices)
+    else:
+        with LocalTranslationServer() as server:
+            backend = HttpBackend(server.url, max_batch_size=args.batch_size, name='local')
+            translator = BatchTranslator(backend, cache, args.concurrency, args.batch_size, args.max_retries)
+            fill_missing_translations(translator, questions_path=args.questions, table_path=args.choices)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""2PL 보정과 적응형 시험 시뮬레이션 (가상 학습자 응답으로 모수 복원, 고정 65문제 시험과 합격 판정 정확도 비교)
+
+    python benchmarks/adaptive_exam.py --items 400 --users 2000 --learners 300
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import EVENT_DTYPE  # noqa: E402
+from irt import (GRID, _sigmoid, calibrate, estimate_ability, item_parameters, next_item,  # noqa: E402
+                 should_stop)
+from quiz_engine import EXAM_SIZE, PASSING_SCORE  # noqa: E402
+
+
+def simulate_events(a, b, users, answers_per_user, rng):
+    """학습자마다 무작위 문제 answers_per_user개에 응답한 이벤트 로그"""
+    theta = rng.normal(size=users)
+    per_user = min(answers_per_user, len(a))
+    items = np.concatenate([rng.choice(len(a), per_user, replace=False) for _ in range(users)])
+    user = np.repeat(np.arange(users), per_user)
+    events = np.zeros(len(items), dtype=EVENT_DTYPE)
+    events["ts"] = np.arange(len(items), dtype=np.float64)
+    events["user"] = user
+    events["question"] = items + 1
+    events["correct"] = rng.random(len(items)) < _sigmoid(a[items] * (theta[user] - b[items]))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="2PL 보정 정확도와 적응형/고정 시험의 합격 판정 정확도를 비교합니다.")
+    parser.add_argument("--items", type=int, default=400)
+    parser.add_argument("--users", type=int, default=2000, help="보정용 응답을 남긴 학습자 수")
+    parser.add_argument("--answers", type=int, default=60, help="학습자당 응답 수")
+    parser.add_argument("--learners", type=int, default=300, help="시험 시뮬레이션 학습자 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.RandomState(args.seed)
+
+    true_a = np.exp(rng.normal(0, 0.3, args.items))
+    true_b = rng.normal(-0.5, 1.0, args.items)
+    events = simulate_events(true_a, true_b, args.users, args.answers, rng)
+    start = time.perf_counter()
+    calibration = calibrate(events)
+    elapsed = time.perf_counter() - start
+    order = calibration["keys"].astype(np.int64) - 1
+    print(f"보정: 응답 {len(events):,}건, {calibration['iterations']}회 반복, {elapsed:.2f}초")
+    print(f"  상관계수 a {np.corrcoef(true_a[order], calibration['a'])[0, 1]:.3f}, "
+          f"b {np.corrcoef(true_b[order], calibration['b'])[0, 1]:.3f}")
+
+    questions = [{"id": str(i + 1)} for i in range(args.items)]
+    params = item_parameters(questions, calibration)
+    # 실제 합격 여부: 참 모수에서 은행 전체 기대 정답률이 합격 기준 이상
+    learners = rng.normal(size=args.learners)
+    truly_ready = np.array([_sigmoid(true_a * (t - true_b)).mean() * 100 >= PASSING_SCORE for t in learners])
+
+    def answer(theta, position):
+        return rng.random() < _sigmoid(true_a[position] * (theta - true_b[position]))
+
+    results = {}
+    picks = []
+    for name in ("고정 65문제", "적응형"):
+        used, agree, errors = [], [], []
+        for theta, ready in zip(learners, truly_ready):
+            if name == "적응형":
+                positions, correct = [], []
+                estimate = (0.0, 1.0, 0.5)
+                while not should_stop(len(positions), estimate[1], estimate[2]):
+                    t0 = time.perf_counter()
+                    position = next_item(params, estimate[0], positions, rng)
+                    if position is None:
+                        break
+                    positions.append(position)
+                    correct.append(answer(theta, position))
+                    estimate = estimate_ability(params, positions, correct)
+                    picks.append(time.perf_counter() - t0)
+                passed = estimate[2] >= 0.5
+            else:
+                positions = rng.choice(args.items, min(EXAM_SIZE, args.items), replace=False)
+                correct = [answer(theta, p) for p in positions]
+                passed = np.mean(correct) * 100 >= PASSING_SCORE
+                estimate = estimate_ability(params, positions, correct)
+            used.append(len(positions))
+            agree.append(passed == ready)
+            errors.append(estimate[0] - theta)
+        results[name] = (np.mean(used), np.mean(agree), np.sqrt(np.mean(np.square(errors))))
+
+    print(f"시험 시뮬레이션: 학습자 {args.learners}명 (격자 {len(GRID)}점)")
+    for name, (used, agree, rmse) in results.items():
+        print(f"  {name:8s} 평균 {used:5.1f}문제, 합격 판정 일치 {agree * 100:5.1f}%, 능력 RMSE {rmse:.3f}")
+    print(f"  문제 선택+능력 추정 {np.mean(picks) * 1e3:.2f} ms/문제 (p99 {np.percentile(picks, 99) * 1e3:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
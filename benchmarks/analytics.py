@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""답안 분석 집계 벤치마크 (가상 이벤트 로그를 만들어 로드/집계 시간 측정)
+
+    python benchmarks/analytics.py --events 500000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import (EVENT_DTYPE, daily_accuracy, exam_scores, filter_events, key_hash, load_events,  # noqa: E402
+                       topic_accuracy, topic_lookup, weakest_questions)
+
+
+def synthetic_events(n, questions=329, users=200, seed=0):
+    rng = np.random.default_rng(seed)
+    events = np.zeros(n, dtype=EVENT_DTYPE)
+    events["ts"] = time.time() - rng.uniform(0, 90 * 86400, n)
+    events["user"] = np.array([key_hash(f"user{i}") for i in range(users)], dtype=np.uint32)[rng.integers(0, users, n)]
+    events["bank"] = key_hash("aif-c01")
+    events["question"] = rng.integers(1, questions + 1, n)
+    events["chosen"] = 1 << rng.integers(0, 4, n)
+    events["correct"] = rng.random(n) < 0.7
+    events["latency_ms"] = rng.gamma(2.0, 15000, n)
+    events["mode"] = rng.random(n) < 0.5
+    events["exam"] = np.where(events["mode"] == 1, rng.integers(1, n // 65 + 2, n), 0)
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="답안 분석 집계 시간을 측정합니다.")
+    parser.add_argument("--events", type=int, default=500_000)
+    args = parser.parse_args()
+
+    questions = [{"id": str(i), "question_en": ["Amazon Bedrock prompt", "bias fairness", "IAM encrypt", "SageMaker training"][i % 4]}
+                 for i in range(1, 330)]
+    lookup = topic_lookup(questions)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.bin")
+        synthetic_events(args.events).tofile(path)
+        timings = {}
+
+        start = time.perf_counter()
+        events = load_events(path)
+        timings["load"] = time.perf_counter() - start
+
+        for name, fn in [
+            ("filter(user)", lambda: filter_events(events, user="user7", bank="aif-c01")),
+            ("topic_accuracy", lambda: topic_accuracy(events, lookup)),
+            ("weakest_questions", lambda: weakest_questions(events)),
+            ("exam_scores", lambda: exam_scores(events)),
+            ("daily_accuracy", lambda: daily_accuracy(events)),
+        ]:
+            start = time.perf_counter()
+            fn()
+            timings[name] = time.perf_counter() - start
+
+        print(f"이벤트 {len(events):,}건 ({os.path.getsize(path) / 1e6:.1f} MB, 레코드 {EVENT_DTYPE.itemsize}바이트)")
+        for name, sec in timings.items():
+            print(f"{name:18s} {sec * 1000:8.1f} ms")
+        print(f"{'합계':18s} {sum(timings.values()) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""API 서버 처리량 (문제 조회 200 / ETag 재검증 304 / 채점, 워커 수별 비교)
+
+api_server.py를 별도 프로세스로 띄우고 keep-alive 연결 여러 개로 요청을 보냅니다.
+data/가 있는 디렉터리에서 실행합니다 (채점 요청은 user를 넣지 않아 답안 로그에 기록하지 않음):
+    python benchmarks/api_server.py --workers 1 4 --clients 8 --seconds 3
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/api/banks")
+            banks = json.loads(conn.getresponse().read())["banks"]
+            conn.close()
+            return banks
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("API 서버가 시작되지 않았습니다")
+
+
+def _run_clients(port, make_request, clients, seconds):
+    """clients개 스레드가 seconds초 동안 요청을 반복한 총 요청 수"""
+    counts = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def client(i):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        n = 0
+        while time.monotonic() < stop:
+            method, path, body, headers = make_request(n)
+            conn.request(method, path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status not in (200, 304):
+                raise RuntimeError(f"{method} {path}: {response.status}")
+            n += 1
+        counts[i] = n
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 서버의 문제 조회/재검증/채점 처리량을 측정합니다.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--port", type=int, default=8690)
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, "api_server.py"), "--port", str(args.port),
+                                   "--workers", str(workers)], stdout=subprocess.DEVNULL)
+        try:
+            bank = _wait_ready(args.port)[0]
+            conn = http.client.HTTPConnection("127.0.0.1", args.port)
+            conn.request("POST", f"/api/banks/{bank['id']}/exams", json.dumps({"size": min(65, bank["questions"])}))
+            exam = json.loads(conn.getresponse().read())
+            paths = [f"/api/banks/{bank['id']}/questions/{i}" for i in exam["questions"]]
+            etags = {}
+            for path in paths:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                etags[path] = response.getheader("ETag")
+            conn.close()
+
+            scenarios = {
+                "문제 조회 (200)": lambda n: ("GET", paths[n % len(paths)], None, {}),
+                "ETag 재검증 (304)": lambda n: ("GET", paths[n % len(paths)], None,
+                                                {"If-None-Match": etags[paths[n % len(paths)]]}),
+                "채점": lambda n: ("POST", f"/api/banks/{bank['id']}/grade",
+                                  json.dumps({"question_id": exam["questions"][n % len(paths)], "selected": "A"}),
+                                  {"Content-Type": "application/json"}),
+            }
+            print(f"워커 {workers}개, 클라이언트 {args.clients}개 (문제 은행 {bank['id']}, 문제 {len(paths)}개)")
+            for name, make_request in scenarios.items():
+                total = _run_clients(args.port, make_request, args.clients, args.seconds)
+                print(f"  {name:16s} {total / args.seconds:8,.0f} 요청/초")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""이전/현재 구현 출력 비교 (핫 함수를 git 리비전의 코드와 같은 입력으로 실행해 하나라도 다르면 실패)
+
+hot_functions.py와 같은 입력 목록을 실제 문제 은행(data/questions.json, 있으면)과 가상 문제 은행으로 만들고,
+--rev 리비전의 파일을 임시 디렉터리에 꺼내 별도 프로세스에서 실행한 출력과 현재 코드의 출력을 비교합니다.
+함수를 더 빠른 구현으로 바꾼 뒤 출력이 그대로인지 확인할 때 씁니다. data/가 있는 디렉터리에서 실행합니다:
+
+    python benchmarks/differential.py --rev HEAD~1
+    python benchmarks/differential.py --rev HEAD~5 --only parse_choices
+
+PDF는 압축된 스트림을 풀고 생성 시각(/CreationDate), 파일 ID, 길이를 지운 바이트를 비교합니다.
+"""
+import argparse
+import os
+import pickle
+import re
+import subprocess
+import sys
+import tarfile
+import tempfile
+import zlib
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+MAX_REPORTED = 5  # 함수마다 출력할 차이 수
+# 모듈로 분리되기 전 리비전에서 함수를 찾을 위치 (Streamlit 스크립트는 bare 모드로 import됨)
+MOVED_FROM = {"quiz_engine": "app", "pdf_export": "app"}
+
+_PDF_VOLATILE = re.compile(rb"/CreationDate \(D:[^)]*\)|/ID \[<[0-9A-Fa-f]+><[0-9A-Fa-f]+>\]|/Length \d+")
+_PDF_STREAM = re.compile(rb"stream\n(.*?)\nendstream", re.DOTALL)
+
+
+def _inflate(match):
+    try:
+        return b"stream\n" + zlib.decompress(match.group(1)) + b"\nendstream"
+    except zlib.error:
+        return match.group(0)
+
+
+def normalize(value):
+    """비교용 출력 (PDF는 압축을 푼 스트림으로 바꾸고 실행 시각에 따라 바뀌는 부분 제거)"""
+    if isinstance(value, (bytes, bytearray)) and value.startswith(b"%PDF"):
+        return _PDF_VOLATILE.sub(b"", _PDF_STREAM.sub(_inflate, bytes(value)))
+    return value
+
+
+def run_cases(root, cases, choices_path):
+    """root의 모듈로 cases를 실행한 {이름: [출력 또는 ("error", 예외 이름, 메시지), ...]}"""
+    sys.path.insert(0, root)
+    sys.path.insert(1, BENCHMARKS)
+    import importlib
+    from hot_functions import bind_call, load_choice_table
+
+    choice_table = load_choice_table(choices_path)
+    outputs = {}
+    for name, (module, function, inputs) in cases.items():
+        fn = None
+        for candidate in (module, MOVED_FROM.get(module)):
+            try:
+                fn = getattr(importlib.import_module(candidate), function)
+                break
+            except (ImportError, AttributeError, TypeError) as e:
+                error = f"{type(e).__name__}: {e}"
+        if fn is None:
+            outputs[name] = ("missing", error)
+            continue
+        results = []
+        for kwargs in inputs:
+            try:
+                results.append(normalize(bind_call(fn, kwargs, choice_table)()))
+            except Exception as e:  # 예외도 출력의 일부로 비교
+                results.append(("error", type(e).__name__, str(e)))
+        outputs[name] = results
+    return outputs
+
+
+def verify_revision(rev):
+    """git 리비전이 커밋을 가리키는지 확인 (없으면 메시지와 함께 종료)"""
+    result = subprocess.run(["git", "-C", ROOT, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"❌ git 리비전을 찾을 수 없습니다: {rev}")
+
+
+def export_revision(rev, directory):
+    """git 리비전의 추적 파일을 directory에 꺼냄"""
+    archive = subprocess.run(["git", "-C", ROOT, "archive", "--format=tar", rev], check=True,
+                             capture_output=True).stdout
+    path = os.path.join(directory, "rev.tar")
+    with open(path, "wb") as f:
+        f.write(archive)
+    with tarfile.open(path) as tar:
+        tar.extractall(directory, filter="data")
+    os.remove(path)
+
+
+def run_revision(rev, cases, choices_path):
+    """이전 리비전의 출력 (현재 디렉터리를 그대로 쓰도록 같은 cwd의 별도 프로세스에서 실행)"""
+    with tempfile.TemporaryDirectory(prefix="differential_") as tmp:
+        tree = os.path.join(tmp, "tree")
+        os.mkdir(tree)
+        export_revision(rev, tree)
+        cases_path, outputs_path = os.path.join(tmp, "cases.pkl"), os.path.join(tmp, "outputs.pkl")
+        with open(cases_path, "wb") as f:
+            pickle.dump(cases, f)
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--emit", tree, cases_path, outputs_path,
+                        "--choices", choices_path], check=True,
+                       env={**os.environ, "STREAMLIT_LOGGER_LEVEL": "error"})
+        with open(outputs_path, "rb") as f:
+            return pickle.load(f)
+
+
+def compare(cases, old, new):
+    """함수별 차이 목록 {이름: [(입력, 이전 출력, 현재 출력), ...]} (이전 리비전에 없는 함수는 건너뜀)"""
+    differences = {}
+    for name, (_, _, inputs) in cases.items():
+        if isinstance(old[name], tuple) and old[name][0] == "missing":
+            print(f"⏭️ {name}: 이전 리비전에 없음 ({old[name][1]})")
+            continue
+        diffs = [(kwargs, a, b) for kwargs, a, b in zip(inputs, old[name], new[name]) if a != b]
+        status = "✅" if not diffs else "❌"
+        print(f"{status} {name}: 입력 {len(inputs):,}개, 다른 출력 {len(diffs):,}개")
+        if diffs:
+            differences[name] = diffs
+    return differences
+
+
+def _short(value, limit=160):
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--emit":
+        # 자식 프로세스: 이전 리비전 트리의 모듈로 실행
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--emit", nargs=3, metavar=("TREE", "CASES", "OUTPUTS"))
+        parser.add_argument("--choices")
+        args = parser.parse_args()
+        tree, cases_path, outputs_path = args.emit
+        with open(cases_path, "rb") as f:
+            cases = pickle.load(f)
+        outputs = run_cases(tree, cases, args.choices)
+        with open(outputs_path, "wb") as f:
+            pickle.dump(outputs, f)
+        return
+
+    parser = argparse.ArgumentParser(description="핫 함수 출력을 git 리비전의 구현과 비교합니다 (다르면 종료 코드 1).")
+    parser.add_argument("--rev", default="HEAD", help="비교할 git 리비전 (작업 트리의 변경을 확인하려면 HEAD)")
+    parser.add_argument("--questions", default=os.path.join("data", "questions.json"), help="실제 문제 은행")
+    parser.add_argument("--choices", default=os.path.join("data", "choices.json"))
+    parser.add_argument("--generated", type=int, default=600, help="가상 문제 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 함수만 비교")
+    args = parser.parse_args()
+
+    verify_revision(args.rev)
+    sys.path.insert(0, BENCHMARKS)
+    sys.path.insert(1, ROOT)
+    from hot_functions import case_inputs, generate_questions, load_real_questions
+
+    real = load_real_questions(args.questions)
+    if not real:
+        print(f"⚠️ {args.questions}가 없어 가상 문제로만 비교합니다.")
+    cases = case_inputs(real + generate_questions(args.generated, args.seed))
+    if args.only:
+        cases = {name: case for name, case in cases.items() if args.only in name}
+    print(f"▶️ {args.rev} 구현 실행 (실제 문제 {len(real):,}개 + 가상 문제 {args.generated:,}개)")
+    old = run_revision(args.rev, cases, os.path.abspath(args.choices))
+    print("▶️ 현재 구현 실행")
+    new = run_cases(ROOT, cases, os.path.abspath(args.choices))
+
+    differences = compare(cases, old, new)
+    for name, diffs in differences.items():
+        print(f"\n[{name}]")
+        for kwargs, a, b in diffs[:MAX_REPORTED]:
+            print(f"  입력 {_short({k: v for k, v in kwargs.items() if k != 'q_data'})}")
+            if isinstance(a, bytes) and isinstance(b, bytes):
+                offset = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+                print(f"    바이트 {len(a):,} → {len(b):,}, 첫 차이 위치 {offset:,}: "
+                      f"{_short(a[offset:offset + 60])} → {_short(b[offset:offset + 60])}")
+                continue
+            if isinstance(a, dict) and isinstance(b, dict):
+                # 다른 키만 출력
+                keys = [k for k in {**a, **b} if a.get(k) != b.get(k)]
+                a, b = {k: a.get(k) for k in keys}, {k: b.get(k) for k in keys}
+            print(f"    이전 {_short(a)}")
+            print(f"    현재 {_short(b)}")
+    if differences:
+        print(f"\n❌ 출력이 달라진 함수: {', '.join(differences)}")
+        sys.exit(1)
+    print("\n✅ 모든 출력이 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""퀴즈 엔진 처리량 벤치마크 (UI 없이 문제 표시/채점/시험 채점 속도 측정)
+
+data/가 있는 디렉터리에서 실행합니다:
+    python benchmarks/engine.py --seconds 1
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import build_render_model, extract_correct_answers, grade_answer, present_question, sample_exam, score_exam  # noqa: E402
+from snapshot import load_bank  # noqa: E402
+
+
+def measure(fn, seconds):
+    """seconds 동안 fn을 반복 실행하여 초당 실행 횟수 반환"""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn()
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="퀴즈 엔진 처리량을 측정합니다.")
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bank = load_bank()
+    data, choice_table = bank["questions"], bank["choice_table"]
+    rng = random.Random(args.seed)
+    models = {q['id']: build_render_model(q) for q in data}
+    answers = [(q, (extract_correct_answers(q.get('answer', '')) or ["A"])[0]) for q in data]
+    it = {"i": 0}
+
+    def next_item(items):
+        it["i"] = (it["i"] + 1) % len(items)
+        return items[it["i"]]
+
+    def present_cold():
+        present_question(next_item(data), "한글", choice_table, rng=rng)
+
+    def present_warm():
+        q = next_item(data)
+        present_question(q, "한글", choice_table, models[q['id']], rng)
+
+    def grade():
+        q, answer = next_item(answers)
+        grade_answer(q, answer)
+
+    exam = sample_exam(data, rng=rng)
+    exam_answers = {str(i): (extract_correct_answers(q.get('answer', '')) or ["A"])[0] for i, q in enumerate(exam)}
+
+    def exam_score():
+        score_exam(exam, exam_answers)
+
+    for name, fn in [("present (parse)", present_cold), ("present (model)", present_warm),
+                     ("grade_answer", grade), ("score_exam (65)", exam_score)]:
+        print(f"{name:18s} {measure(fn, args.seconds):12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""앱/파이프라인 핫 함수 마이크로 벤치마크 (저장된 기준값과 비교해 느려지면 실패)
+
+고정 시드로 만든 가상 문제 은행(선택지 개수/기호, 복수 선택, HOTSPOT, 한글 본문, 해설 키워드를 섞음)에서
+함수마다 입력 목록을 만들고, 목록 전체 실행을 여러 번 반복한 최솟값으로 호출당 시간을 잽니다.
+같은 입력 목록은 benchmarks/differential.py가 이전 리비전과 출력을 비교할 때도 사용합니다.
+generate_pdf는 찾은 한글 폰트(AIF_PDF_FONT로 지정 가능)를, generate_pdf.ascii는 폰트 없이 ASCII로 만들며
+바이트를 반환하는 함수는 평균 출력 크기도 출력하므로 폰트 임베딩의 시간/크기 비용을 비교할 수 있습니다.
+
+    python benchmarks/hot_functions.py                 # 측정 후 기준값과 비교 (느려지면 종료 코드 1)
+    python benchmarks/hot_functions.py --update        # 현재 측정값을 기준값으로 저장
+    python benchmarks/hot_functions.py --only parse    # 이름에 parse가 들어간 함수만
+
+CPU 클럭이나 다른 프로세스 부하로 전체 속도가 달라지는 것을 상쇄하도록 고정된 기준 작업 시간도 함께 재고,
+기준 작업 대비 상대 시간으로 비교합니다. 그래도 기준값은 측정한 컴퓨터에 따라 다르므로
+다른 환경에서 비교하면 경고를 출력합니다.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "hot_functions.json")
+DEFAULT_THRESHOLD = 0.25  # 기준값보다 25% 넘게 느려지면 실패
+# 측정 편차가 큰 함수 (호출 1us 미만이라 호출 오버헤드 비중이 큼, 폰트 서브셋/압축)
+THRESHOLDS = {"is_multiple_choice": 0.5, "generate_pdf": 0.5, "generate_pdf.ascii": 0.5}
+CHOICE_TABLE = "<choice_table>"  # 호출할 때 실제 선택지 테이블로 바꾸는 자리 표시
+
+_WORDS = ("model data training inference endpoint dataset accuracy latency prompt token customer "
+          "application pipeline feature bias fairness cost storage real-time batch agent").split()
+_KO_WORDS = "모델 데이터 학습 추론 엔드포인트 정확도 지연 시간 프롬프트 고객 애플리케이션 비용 편향".split()
+_PRODUCTS = ["Amazon SageMaker", "Amazon Bedrock", "Amazon Comprehend", "Amazon Rekognition", "Amazon Polly",
+             "Amazon Kendra", "AWS Lambda", "Amazon S3", "SageMaker Clarify", "SageMaker Model Monitor"]
+_ANSWER_KEYWORDS = ["partial dependence plots", "decision tree", "summarization chatbot", "prompt engineering",
+                    "increase the temperature", "decrease the temperature", "asynchronous inference",
+                    "real-time inference", "serverless inference", "batch transform", "re-train the model",
+                    "transfer learning", "fine-tune the model", "increase the number of epochs",
+                    "unsupervised learning", "Amazon Bedrock Guardrails", "RAG with a knowledge base"]
+
+
+def _sentence(rng, words, n):
+    return " ".join(rng.choice(words) for _ in range(n))
+
+
+def generate_questions(n=600, seed=0):
+    """가상 문제 dict 목록 (questions.json과 같은 필드)"""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(n):
+        kind = rng.random()
+        multiple = rng.random() < 0.15
+        count = rng.choice([0, 1, 4, 4, 4, 5]) if kind > 0.05 else 0
+        bullet = rng.choice(["•", "·", "• ", "·  "])
+        stem = _sentence(rng, _WORDS, rng.randint(8, 40)).capitalize() + "?"
+        if multiple:
+            stem += rng.choice([" (Choose two.)", " (Choose two)", " (Choose three.)"])
+        choices = {letter: rng.choice([rng.choice(_PRODUCTS), _sentence(rng, _WORDS, rng.randint(2, 12)).capitalize()])
+                   for letter in "ABCDE"[:count]}
+        body = stem + "".join(f" {bullet}{letter}. {text}" for letter, text in choices.items())
+        if kind < 0.05:
+            body = "HOTSPOT - " + body
+        if rng.random() < 0.05:
+            body += rng.choice([" \u0000", " • ", " ·", "  "])
+        ko_body = _sentence(rng, _KO_WORDS, rng.randint(5, 20)) + "?" if rng.random() < 0.8 else ""
+        if ko_body and multiple:
+            ko_body += rng.choice([" (2개 선택)", " (3개 선택)"])
+        letters = sorted(rng.sample(list(choices) or ["A", "B"], min(2 if multiple else 1, max(len(choices), 1))))
+        answer = ", ".join(letters) + ". " + rng.choice(_ANSWER_KEYWORDS + list(choices.values()) + [""])
+        if rng.random() < 0.2:
+            answer += " (" + _sentence(rng, _KO_WORDS, rng.randint(10, 30)) + ": " + _sentence(rng, _WORDS, 10) + ")"
+        q = {"id": str(i + 1), "question_en": body, "question_ko": ko_body, "answer": answer if rng.random() > 0.02 else ""}
+        if choices and rng.random() < 0.5:
+            q["choices_ko"] = {letter: _sentence(rng, _KO_WORDS, 3) for letter in choices}
+        questions.append(q)
+    return questions
+
+
+def load_real_questions(path):
+    """실제 문제 은행 (questions.json 원본 dict, 없으면 빈 목록)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def case_inputs(questions):
+    """{이름: (모듈, 함수, [호출 인자 dict, ...])} - 실행과 출력 비교에 쓰는 입력 목록"""
+    texts = [q.get("question_en", "") for q in questions] + [q.get("question_ko", "") for q in questions] + ["", None]
+    choice_texts = []
+    for q in questions:
+        choice_texts.extend(_choices_of(q.get("question_en", "")))
+    modes = ("한글", "English", "섞기")
+    return {
+        "quiz_engine.parse_choices": ("quiz_engine", "parse_choices", [{"question_text": t} for t in texts]),
+        "enhance_questions.parse_choices": ("enhance_questions", "parse_choices",
+                                            [{"question_text": t} for t in texts]),
+        "is_multiple_choice": ("quiz_engine", "is_multiple_choice", [{"question_text": t} for t in texts]),
+        "extract_correct_answers": ("quiz_engine", "extract_correct_answers",
+                                    [{"answer_text": q.get("answer", "")} for q in questions]),
+        "get_choices_for_language": ("quiz_engine", "get_choices_for_language", [
+            {"question_en": q.get("question_en", ""), "question_ko": q.get("question_ko", ""), "lang_mode": mode,
+             "use_random_mix": mode == "섞기", "q_data": q, "choice_table": CHOICE_TABLE, "seed": i}
+            for i, (q, mode) in enumerate((q, mode) for q in questions for mode in modes)
+        ]),
+        "translate_choice_simple": ("enhance_questions", "translate_choice_simple",
+                                    [{"choice_en": c} for c in choice_texts[:2000]]),
+        "enhance_answer_explanation": ("enhance_questions", "enhance_answer_explanation",
+                                       [{"answer_text": q.get("answer", ""), "question_text": q.get("question_en", "")}
+                                        for q in questions]),
+        "generate_pdf": ("pdf_export", "generate_pdf", [
+            {"wrong_questions": questions[i:i + 20], "choice_table": CHOICE_TABLE} for i in range(0, min(len(questions), 60), 20)
+        ]),
+        # 한글 폰트 임베딩 비용 비교용 (폰트 없이 ASCII로만 출력)
+        "generate_pdf.ascii": ("pdf_export", "generate_pdf", [
+            {"wrong_questions": questions[i:i + 20], "choice_table": CHOICE_TABLE, "use_font": False}
+            for i in range(0, min(len(questions), 60), 20)
+        ]),
+    }
+
+
+def _choices_of(text):
+    from quiz_engine import parse_choices
+    return list(parse_choices(text)[1].values())
+
+
+def bind_call(fn, kwargs, choice_table):
+    """입력 dict → fn 호출 (fn이 받지 않는 인자는 버림, seed는 전역 random과 rng 인자에 같이 적용)
+
+    이전 리비전의 함수는 인자가 더 적을 수 있으므로 시그니처에 있는 인자만 넘깁니다.
+    """
+    params = inspect.signature(fn).parameters
+    call = {k: (choice_table if v == CHOICE_TABLE else v) for k, v in kwargs.items() if k in params}
+    seed = kwargs.get("seed")
+    if seed is None:
+        return lambda: fn(**call)
+
+    def seeded():
+        random.seed(seed)
+        if "rng" in params:
+            call["rng"] = random.Random(seed)
+        return fn(**call)
+    return seeded
+
+
+def load_choice_table(path):
+    """선택지 테이블 (파일이나 choice_table 모듈이 없으면 None)"""
+    try:
+        from choice_table import ChoiceTable
+    except ImportError:
+        return None
+    return ChoiceTable.load(path) if os.path.exists(path) else None
+
+
+def measure(calls, seconds, min_repeat=3):
+    """입력 목록 전체를 seconds 동안(최소 min_repeat번) 반복 실행한 호출당 시간의 최솟값 (ns)
+
+    다른 프로세스의 간섭은 실행 시간을 늘리기만 하므로 timeit처럼 최솟값을 씁니다.
+    """
+    timings = []
+    deadline = time.perf_counter() + seconds
+    while len(timings) < min_repeat or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        for call in calls:
+            call()
+        timings.append((time.perf_counter_ns() - start) / len(calls))
+    return min(timings)
+
+
+def _reference_workload():
+    """머신 속도 보정용 고정 작업 (문자열 처리/정규식/dict 위주로 측정 대상과 비슷한 구성)"""
+    text = " ".join(_WORDS) * 4
+    counts = {}
+    for word in _REFERENCE_PATTERN.findall(text):
+        counts[word.upper()] = counts.get(word.upper(), 0) + 1
+    return sorted(counts.items())
+
+
+_REFERENCE_PATTERN = re.compile(r"[a-z]+")
+
+
+def environment():
+    return {"machine": platform.machine(), "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(), "cpus": os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핫 함수 호출당 시간을 재고 저장된 기준값과 비교합니다.")
+    parser.add_argument("--questions", type=int, default=600, help="가상 문제 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=1.0, help="함수마다 반복 측정할 시간")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="허용 감속 비율 (0.25 = 25%%)")
+    parser.add_argument("--update", action="store_true", help="측정값을 기준값으로 저장")
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 함수만 측정")
+    parser.add_argument("--choices", default=os.path.join(ROOT, "data", "choices.json"))
+    args = parser.parse_args()
+
+    import importlib
+    questions = generate_questions(args.questions, args.seed)
+    choice_table = load_choice_table(args.choices)
+    results = {}
+    sizes = {}  # 바이트를 반환하는 함수의 평균 출력 크기
+    reference = float("inf")
+    for name, (module, function, inputs) in case_inputs(questions).items():
+        if args.only and args.only not in name:
+            continue
+        fn = getattr(importlib.import_module(module), function)
+        calls = [bind_call(fn, kwargs, choice_table) for kwargs in inputs]
+        outputs = [call() for call in calls[:50]]  # 캐시(번역 사전, 폰트) 채우기
+        if outputs and all(isinstance(out, (bytes, bytearray)) for out in outputs):
+            sizes[name] = sum(len(out) for out in outputs) / len(outputs)
+        # 측정 직전의 기준 작업 시간도 재서 CPU 클럭/다른 프로세스 부하 변화를 상쇄
+        reference = min(reference, measure([_reference_workload] * 20, 0.2))
+        results[name] = measure(calls, args.seconds)
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = None
+
+    failed = []
+    print(f"{'함수':32s} {'현재':>12s} {'기준값':>12s}  변화")
+    for name, ns in results.items():
+        base = baseline["results"].get(name) if baseline else None
+        if base is None:
+            print(f"{name:32s} {_format_ns(ns):>12s} {'-':>12s}")
+            continue
+        # 기준 작업 대비 상대 시간으로 비교
+        change = (ns / reference) / (base / baseline["reference"]) - 1
+        limit = THRESHOLDS.get(name, args.threshold)
+        mark = "❌" if change > limit else "✅"
+        print(f"{name:32s} {_format_ns(ns):>12s} {_format_ns(base):>12s}  {change * 100:+6.1f}% {mark}")
+        if change > limit:
+            failed.append(name)
+    for name, size in sizes.items():
+        print(f"  {name} 평균 출력 크기: {size / 1024:.1f} KB")
+
+    if args.update:
+        merged = dict(baseline["results"]) if baseline and args.only else {}
+        if baseline and args.only:
+            # 일부만 다시 잰 경우 기존 기준 작업 시간에 맞춰 환산
+            results = {k: v * baseline["reference"] / reference for k, v in results.items()}
+            reference = baseline["reference"]
+        merged.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "questions": args.questions, "seed": args.seed,
+                       "reference": round(reference, 1), "results": {k: round(v, 1) for k, v in merged.items()}},
+                      f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"✅ 기준값 저장: {os.path.relpath(args.baseline, ROOT)}")
+        return
+    if baseline is None:
+        print("⚠️ 기준값이 없습니다. --update로 저장하세요.")
+        return
+    if baseline.get("environment") != environment() or baseline.get("questions") != args.questions:
+        print(f"⚠️ 기준값과 측정 환경이 다릅니다 ({baseline.get('environment')}). 결과는 참고용입니다.")
+    if failed:
+        print(f"❌ 기준값보다 느려진 함수: {', '.join(failed)}")
+        sys.exit(1)
+
+
+def _format_ns(ns):
+    return f"{ns / 1e3:.2f} us" if ns < 1e6 else f"{ns / 1e6:.2f} ms"
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""앱 클릭 부하 테스트 (세션 여러 개로 같은 클릭 시나리오를 실행하고 클릭당 스크립트 실행 횟수/시간 측정)
+
+Streamlit AppTest로 app.py를 실행하며, 스크립트 실행 횟수는 전체 실행마다 한 번 호출되는
+get_choices_for_language 호출 수로 셉니다. AppTest는 프래그먼트 단독 실행을 하지 않고 모든 클릭을
+전체 실행으로 처리하므로, 실제 서버의 실행은 클릭한 위젯이 속한 프래그먼트와 st.rerun() 호출 위치로
+따로 셉니다: 프래그먼트 안 위젯은 콜백이 st.rerun()을 호출하면 전체 실행 1회, 아니면 프래그먼트 실행
+1회이며, 스크립트 본문의 st.rerun()은 전체 실행을 한 번 더 일으킵니다. --baseline-rev를 주면 해당 git 리비전의 app.py도
+같은 시나리오로 실행해 전후를 비교합니다. data/가 있는 디렉터리에서 실행합니다:
+    python benchmarks/load_test.py --sessions 10 --baseline-rev HEAD~1
+
+--baseline-rev는 실행 횟수를 quiz_engine.get_choices_for_language로 세므로 quiz_engine.py가 있는
+리비전(퀴즈 엔진을 app.py에서 분리한 user-036 이후)만 비교할 수 있으며, 그 이전 리비전은 거부합니다.
+선택지가 없는 HOTSPOT 문제처럼 버튼이 없거나 비활성화된 단계는 클릭하지 않고 건너뜁니다.
+프래그먼트 실행 안에서만 호출되는 st.rerun()은 AppTest에서 실행되지 않으므로 세지 못합니다.
+답안 이벤트는 분석 로그에 기록하지 않습니다.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analytics  # noqa: E402
+import quiz_engine  # noqa: E402
+import streamlit  # noqa: E402
+from streamlit.runtime.scriptrunner_utils.script_run_context import RunLocation, ThreadState  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+script_runs = {"count": 0}
+# st.rerun() 호출 위치별 횟수 (콜백 안 / 스크립트 본문)
+rerun_calls = {"callback": 0, "script": 0}
+
+
+def _count_runs(fn):
+    def wrapper(*args, **kwargs):
+        script_runs["count"] += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _count_reruns(fn):
+    def wrapper(*args, **kwargs):
+        in_callback = ThreadState.get().run_location is RunLocation.CALLBACK
+        rerun_calls["callback" if in_callback else "script"] += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _fragment_id(at, element):
+    """위젯이 속한 프래그먼트 ID (프래그먼트 밖이면 None)"""
+    metadata = at.session_state._state._state._new_widget_state.widget_metadata.get(element.id)
+    return metadata.fragment_id if metadata else None
+
+
+def _button(at, label, sidebar=False):
+    """라벨로 시작하는 활성 버튼 (없거나 비활성화되어 있으면 None)"""
+    buttons = at.sidebar.button if sidebar else at.button
+    button = next((b for b in buttons if b.label.startswith(label)), None)
+    if button is None or button.disabled:
+        return None
+    return button
+
+
+def _choose_answer(at):
+    """현재 문제의 첫 번째 선택지 선택 (단일/복수 정답 모두)"""
+    for radio in at.radio:
+        if radio.label.startswith("답변을 선택"):
+            return radio.set_value(radio.options[0])
+    for multiselect in at.multiselect:
+        if multiselect.label.startswith("답변을 선택"):
+            return multiselect.select(multiselect.options[0])
+    return None
+
+
+def _click(label, sidebar=False):
+    def action(at):
+        button = _button(at, label, sidebar)
+        return button.click() if button is not None else None
+    return action
+
+
+# (이름, 동작) - 동작이 None을 반환하면 (버튼이 없거나 비활성화) 해당 클릭은 건너뜀
+SCENARIO = [
+    ("답 선택", _choose_answer),
+    ("정답 확인", _click("✅ 정답 확인")),
+    ("다음 문제 (답변 영역)", _click("⭕ 다음 문제")),
+    ("다음 ▶", _click("다음 ▶", sidebar=True)),
+    ("◀ 이전", _click("◀ 이전", sidebar=True)),
+    ("시험 시작", _click("📝 시험 모드 시작", sidebar=True)),
+    ("시험 답 선택", _choose_answer),
+    ("시험 다음 문제", _click("다음 문제 ▶")),
+    ("시험 답 선택", _choose_answer),
+    ("시험 다음 문제", _click("다음 문제 ▶")),
+    ("시험 이전 문제", _click("◀ 이전 문제")),
+    ("시험 완료", _click("✅ 시험 완료")),
+    ("새 시험 시작", _click("🔁 새 시험 시작")),
+]
+
+
+def run_sessions(app_path, sessions, timeout):
+    """시나리오 단계별 [클릭 수, 전체 실행 수, 프래그먼트 실행 수, 걸린 시간] 합계 (실행 수는 실제 서버 기준)"""
+    totals = {name: [0, 0, 0, 0.0] for name, _ in SCENARIO}
+    for _ in range(sessions):
+        at = AppTest.from_file(app_path, default_timeout=timeout).run()
+        for name, action in SCENARIO:
+            element = action(at)
+            if element is None:
+                continue
+            in_fragment = _fragment_id(at, element) is not None
+            before = script_runs["count"]
+            callback_reruns = rerun_calls["callback"]
+            start = time.perf_counter()
+            element.run()
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"{app_path} '{name}' 단계 오류: {at.exception[0].value}")
+            runs = script_runs["count"] - before
+            row = totals[name]
+            row[0] += 1
+            if in_fragment and rerun_calls["callback"] == callback_reruns:
+                # 실제 서버에서는 첫 실행이 프래그먼트만 다시 실행
+                row[1] += runs - 1
+                row[2] += 1
+            else:
+                row[1] += runs
+            row[3] += elapsed
+    return totals
+
+
+def baseline_app(rev):
+    """git 리비전의 app.py를 ROOT 아래 임시 파일로 꺼냄 (같은 모듈을 import하도록)"""
+    if subprocess.run(["git", "-C", ROOT, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"],
+                      capture_output=True).returncode != 0:
+        sys.exit(f"❌ git 리비전을 찾을 수 없습니다: {rev}")
+    if subprocess.run(["git", "-C", ROOT, "cat-file", "-e", f"{rev}:quiz_engine.py"],
+                      capture_output=True).returncode != 0:
+        sys.exit(f"❌ {rev}에는 quiz_engine.py가 없어 스크립트 실행 횟수를 셀 수 없습니다 "
+                 "(퀴즈 엔진을 분리한 이후 리비전만 비교할 수 있습니다).")
+    source = subprocess.run(["git", "-C", ROOT, "show", f"{rev}:app.py"], check=True,
+                            capture_output=True).stdout
+    fd, path = tempfile.mkstemp(prefix=".load_test_", suffix=".py", dir=ROOT)
+    with os.fdopen(fd, "wb") as f:
+        f.write(source)
+    return path
+
+
+def print_report(title, totals):
+    clicks = sum(row[0] for row in totals.values())
+    runs = sum(row[1] for row in totals.values())
+    fragment_runs = sum(row[2] for row in totals.values())
+    elapsed = sum(row[3] for row in totals.values())
+    print(f"\n[{title}] 클릭 {clicks}회, 전체 실행 {runs}회 + 프래그먼트 실행 {fragment_runs}회 "
+          f"(클릭당 {runs / max(clicks, 1):.2f}회 + {fragment_runs / max(clicks, 1):.2f}회, "
+          f"AppTest {elapsed / max(clicks, 1) * 1000:.1f} ms)")
+    for name, (count, name_runs, name_fragment_runs, name_elapsed) in totals.items():
+        if count:
+            print(f"  {name:16s} 전체 {name_runs / count:.2f}회  프래그먼트 {name_fragment_runs / count:.2f}회  "
+                  f"{name_elapsed / count * 1000:7.1f} ms")
+    return (runs + fragment_runs) / max(clicks, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="클릭 시나리오를 여러 세션으로 실행해 클릭당 스크립트 실행 횟수를 측정합니다.")
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--baseline-rev", help="비교할 git 리비전 (예: HEAD~1)")
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    quiz_engine.get_choices_for_language = _count_runs(quiz_engine.get_choices_for_language)
+    streamlit.rerun = _count_reruns(streamlit.rerun)
+    analytics.record_events = lambda events, path=None: None
+
+    results = []
+    if args.baseline_rev:
+        path = baseline_app(args.baseline_rev)
+        try:
+            results.append(print_report(f"이전 ({args.baseline_rev})", run_sessions(path, args.sessions, args.timeout)))
+        finally:
+            os.remove(path)
+    results.append(print_report("현재", run_sessions(args.app, args.sessions, args.timeout)))
+    if len(results) == 2:
+        print(f"\n클릭당 스크립트 실행 (전체 + 프래그먼트): {results[0]:.2f}회 → {results[1]:.2f}회")
+    print(f"st.rerun() 호출: 콜백 {rerun_calls['callback']}회, 스크립트 본문 {rerun_calls['script']}회")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""문제 은행 메모리 벤치마크 (가상 문제 은행을 dict 목록과 Question 목록으로 로드해 메모리 비교)
+
+    python benchmarks/memory.py --questions 50000
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_model import Question  # noqa: E402
+
+WORDS = ("model", "data", "training", "Amazon", "Bedrock", "SageMaker", "prompt", "company", "solution",
+         "requirements", "inference", "accuracy", "customer", "generative", "embedding", "vector")
+
+
+def synthetic_bank(n, seed=0):
+    """parse_aws_dump 결과와 같은 형태의 문제 n개를 JSON 문자열로 생성"""
+    rng = random.Random(seed)
+
+    def sentence(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    questions = []
+    for i in range(1, n + 1):
+        letters = "ABCDE"[:rng.choice((4, 4, 4, 5))]
+        q = {
+            "id": str(i),
+            "question_en": sentence(40) + " " + " ".join(f"• {c}. {sentence(8)}" for c in letters),
+            "question_ko": "회사가 " + sentence(30) + " 요구 사항을 충족합니까?",
+            "answer": f"{rng.choice(letters)}. {sentence(20)}",
+            "choice_ids": {c: rng.randrange(n * 3) for c in letters},
+        }
+        if i % 5 == 0:
+            q["choices_ko"] = {c: "선택지 " + sentence(6) for c in letters}
+        if i % 7 == 0:
+            q["canonical_id"] = str(i - 1)
+        questions.append(q)
+    return json.dumps(questions, ensure_ascii=False)
+
+
+def measure(build):
+    """build()가 만든 객체가 차지하는 메모리 (바이트)와 결과"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dict와 Question 레코드의 문제 은행 메모리를 비교합니다.")
+    parser.add_argument("--questions", type=int, default=50000)
+    args = parser.parse_args()
+
+    raw = synthetic_bank(args.questions)
+    dict_bytes, dicts = measure(lambda: json.loads(raw))
+    del dicts
+    record_bytes, records = measure(lambda: [Question.from_dict(q) for q in json.loads(raw)])
+
+    # 본문 문자열은 두 방식이 같으므로 문제별 컨테이너 오버헤드도 따로 표시
+    text_bytes = sum(sys.getsizeof(q.question_en) + sys.getsizeof(q.question_ko) + sys.getsizeof(q.answer)
+                     for q in records)
+    print(f"문제 {args.questions:,}개 (JSON {len(raw.encode('utf-8')) / 1e6:.1f} MB)")
+    print(f"  dict 목록      {dict_bytes / 1e6:8.1f} MB (본문 제외 {(dict_bytes - text_bytes) / args.questions:6.0f} B/문제)")
+    print(f"  Question 목록  {record_bytes / 1e6:8.1f} MB (본문 제외 {(record_bytes - text_bytes) / args.questions:6.0f} B/문제)")
+    print(f"  감소           {(1 - record_bytes / dict_bytes) * 100:8.1f} %")
+    dict_pickle = len(pickle.dumps(json.loads(raw), protocol=pickle.HIGHEST_PROTOCOL))
+    record_pickle = len(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"  스냅샷 크기    {dict_pickle / 1e6:.1f} MB → {record_pickle / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
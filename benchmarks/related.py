@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""관련 문제 그래프 벤치마크 (가상 문제 은행 로드 확인, 그래프 생성 시간, 조회 시간, 전체 쌍 계산과의 일치 확인)
+
+    python benchmarks/related.py --questions 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hot_functions import generate_questions  # noqa: E402
+from similarity import build_related, question_text, tfidf  # noqa: E402
+from snapshot import load_bank  # noqa: E402
+
+
+def synthetic_questions(n, vocab=4000, seed=0):
+    """Zipf 분포 단어로 만든 문제 n개 (주제별 단어를 섞어 비슷한 문제가 생기도록)"""
+    rng = np.random.RandomState(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    topics = rng.randint(0, vocab, size=(50, 30))
+    questions = []
+    for i in range(n):
+        common = rng.zipf(1.3, size=40) % vocab
+        topical = rng.choice(topics[rng.randint(len(topics))], size=10)
+        text = " ".join(words[w] for w in np.concatenate([common, topical]))
+        questions.append({"id": str(i + 1), "question_en": text, "answer": f"A. {words[rng.randint(vocab)]}"})
+    return questions
+
+
+def brute_force_top(questions, k):
+    """전체 쌍 코사인 유사도로 구한 문제별 상위 k개 유사도"""
+    doc, term, weight = tfidf([question_text(q) for q in questions])
+    matrix = np.zeros((len(questions), term.max() + 1))
+    matrix[doc, term] = weight
+    sim = matrix @ matrix.T
+    np.fill_diagonal(sim, 0)
+    return -np.sort(-sim, axis=1)[:, :k]
+
+
+def check_generated_bank(n=600):
+    """가상 문제 은행을 JSON에서 로드 (흔한 단어만 남아 역색인 구간이 비는 경우 포함)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "questions.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(generate_questions(n), f, ensure_ascii=False)
+        bank = load_bank(path, os.path.join(tmp, "choices.json"), os.path.join(tmp, "snapshot.pkl"),
+                         write_snapshot=False)
+    graph = bank["related"]
+    assert graph is not None and len(graph.neighbors) == n * graph.k, "관련 문제 그래프 크기 오류"
+    print(f"✅ 가상 문제 은행 {n}개 로드 (관련 문제 연결 {sum(1 for p in graph.neighbors if p >= 0):,}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관련 문제 그래프 생성/조회 시간을 측정합니다.")
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    check_generated_bank()
+    questions = synthetic_questions(args.questions)
+    start = time.perf_counter()
+    graph = build_related(questions, k=args.k, min_score=0)
+    elapsed = time.perf_counter() - start
+    print(f"문제 {args.questions:,}개 그래프 생성 {elapsed:.2f}초 "
+          f"(저장 크기 {(len(graph.neighbors) * 4 + len(graph.scores) * 4) / 1e6:.1f} MB)")
+
+    rng = np.random.RandomState(1)
+    positions = rng.randint(0, args.questions, size=100000).tolist()
+    start = time.perf_counter()
+    for position in positions:
+        graph.related(position)
+    print(f"조회 {(time.perf_counter() - start) / len(positions) * 1e6:.2f} us/문제")
+
+    sample = questions[:2000]
+    expected = brute_force_top(sample, args.k)
+    small = build_related(sample, k=args.k, min_score=0)
+    got = np.array([[score for _, score in small.related(i)] + [0.0] * (args.k - len(small.related(i)))
+                    for i in range(len(sample))])
+    print(f"전체 쌍 계산과 상위 {args.k}개 유사도 최대 차이 (문제 {len(sample):,}개): {np.abs(got - expected).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
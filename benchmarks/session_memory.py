@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""학습자 한 명의 세션 상태 크기 비교 (문제 객체 목록 vs 은행 내 위치 배열 + 답 비트마스크)
+
+시험 65문제를 모두 답하고 오답 노트에 --wrong개가 있는 세션을 두 방식으로 만들어
+세션 상태가 참조하는 객체까지 포함한 크기를 측정합니다. data/가 있는 디렉터리에서 실행합니다:
+    python benchmarks/session_memory.py --learners 500
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import EXAM_SIZE, choice_mask, sample_exam_indexes  # noqa: E402
+from quiz_state import add_wrong, dispatch, reset, session_footprint  # noqa: E402
+from snapshot import load_bank  # noqa: E402
+
+
+def previous_session(questions, exam_indexes, wrong_positions, rng):
+    """이전 방식: 문제 dict 목록과 순번 문자열 키 dict"""
+    state = {
+        "current_index": 0, "last_index": -1, "show_answer": False, "selected_answer": None, "selected_answers": [],
+        "exam_mode": True, "exam_finished": False, "exam_current_index": 0, "exam_result": None,
+        "exam_questions": [questions[i].to_dict() for i in exam_indexes],
+        "wrong_answers": [questions[i].to_dict() for i in wrong_positions],
+        "exam_answers": {str(i): rng.choice("ABCD") for i in range(len(exam_indexes))},
+        "exam_latency": {str(i): rng.uniform(5, 90) for i in range(len(exam_indexes))},
+    }
+    return state
+
+
+def compact_session(questions, exam_indexes, wrong_positions, rng):
+    """현재 방식: quiz_state로 만든 위치 배열과 비트마스크"""
+    state = {}
+    reset(state)
+    dispatch(state, "start_exam", exam_indexes, 1)
+    for i in range(len(exam_indexes)):
+        state["exam_answers"][i] = choice_mask(rng.choice("ABCD"))
+        state["exam_latency"][i] = int(rng.uniform(5, 90) * 1000)
+    for position in wrong_positions:
+        add_wrong(state, position)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습자 한 명의 세션 상태 크기를 이전 방식과 비교합니다.")
+    parser.add_argument("--wrong", type=int, default=30, help="오답 노트 문제 수")
+    parser.add_argument("--learners", type=int, default=500, help="동시 학습자 수 (전체 크기 추정용)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    questions = load_bank()["questions"]
+    rng = random.Random(args.seed)
+    exam_indexes = sample_exam_indexes(questions, EXAM_SIZE, rng)
+    wrong_positions = rng.sample(range(len(questions)), min(args.wrong, len(questions)))
+
+    for name, build in [("문제 dict 목록", previous_session), ("위치 배열 + 비트마스크", compact_session)]:
+        sizes = session_footprint(build(questions, exam_indexes, wrong_positions, random.Random(args.seed)))
+        total = sum(sizes.values())
+        largest = ", ".join(f"{key} {size:,}" for key, size in list(sizes.items())[:3])
+        print(f"{name:14s} {total:10,} 바이트/학습자 ({largest})")
+        print(f"{'':14s} {total * args.learners / 1e6:10.2f} MB / 학습자 {args.learners}명")
+
+
+if __name__ == "__main__":
+    main()
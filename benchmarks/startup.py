@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""앱 콜드 스타트 벤치마크 (새 프로세스 기준 시간 측정)
+
+data/가 있는 디렉터리(보통 저장소 루트)에서 실행합니다:
+    python benchmarks/startup.py --budget-ms 3000
+
+측정 항목 (각 항목은 새 Python 프로세스에서 측정, --repeat 회 중 중앙값):
+    import_streamlit   streamlit 모듈 import 시간
+    load_json          questions.json + choices.json 파싱 시간
+    load_snapshot      스냅샷 파일 로드 시간
+    first_render       app.py 첫 실행 완료까지의 시간 (import 포함, Streamlit AppTest 사용)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    "import_streamlit": """
+import time
+start = time.perf_counter()
+import streamlit
+elapsed = time.perf_counter() - start
+""",
+    "load_json": """
+import time
+start = time.perf_counter()
+from snapshot import load_bank
+bank = load_bank(snapshot_path="/nonexistent/snapshot.pkl", write_snapshot=False)
+elapsed = time.perf_counter() - start
+""",
+    "load_snapshot": """
+import time
+from snapshot import build_snapshot, read_snapshot, DEFAULT_SNAPSHOT_PATH
+import os
+if not os.path.exists(DEFAULT_SNAPSHOT_PATH):
+    build_snapshot()
+start = time.perf_counter()
+bank = read_snapshot(DEFAULT_SNAPSHOT_PATH)
+elapsed = time.perf_counter() - start
+""",
+    "first_render": """
+import os
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+elapsed = time.perf_counter() - start
+if at.exception:
+    raise SystemExit(str(at.exception))
+""",
+}
+
+
+def run_snippet(code):
+    """새 프로세스에서 코드를 실행하고 elapsed 변수(초)를 반환"""
+    wrapped = f"ROOT = {ROOT!r}\n" + code + "\nimport json as _json\nprint('__ELAPSED__' + _json.dumps(elapsed))\n"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-c", wrapped], capture_output=True, text=True, env=env)
+    for line in result.stdout.splitlines():
+        if line.startswith("__ELAPSED__"):
+            return json.loads(line[len("__ELAPSED__"):])
+    raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "측정 실패")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 콜드 스타트 시간을 측정합니다.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, help="first_render가 이 시간(ms)을 넘으면 실패 종료")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    report = {}
+    for name, code in SNIPPETS.items():
+        try:
+            samples = [run_snippet(code) * 1000 for _ in range(args.repeat)]
+            report[name] = {"median_ms": round(statistics.median(samples), 1),
+                            "min_ms": round(min(samples), 1)}
+        except RuntimeError as e:
+            report[name] = {"error": str(e)}
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for name, result in report.items():
+            if "error" in result:
+                print(f"{name:18s} 오류: {result['error']}")
+            else:
+                print(f"{name:18s} {result['median_ms']:9.1f} ms (최소 {result['min_ms']:.1f} ms)")
+
+    first_render = report.get("first_render", {}).get("median_ms")
+    if args.budget_ms is not None:
+        if first_render is None or first_render > args.budget_ms:
+            print(f"❌ 시작 시간 예산 초과: {first_render} ms > {args.budget_ms} ms")
+            sys.exit(1)
+        print(f"✅ 시작 시간 예산 이내: {first_render} ms <= {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
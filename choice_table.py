@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""선택지 인턴 테이블 (고유 선택지 문자열과 번역을 한 번만 저장하고 문제는 정수 id로 참조)
+
+data/choices.json 형식: {"en": [선택지, ...], "ko": [번역, ...]} (인덱스 = 선택지 id)
+문제에는 "choice_ids": {"A": 12, "B": 40, ...} 필드가 추가됩니다.
+"""
+import json
+import os
+import re
+import sys
+
+from io_utils import atomic_write_json
+from question_model import save_questions
+
+DEFAULT_TABLE_PATH = 'data/choices.json'
+
+
+def is_valid_translation(choice_ko):
+    """기존 번역으로 인정할 수 있는 한글 선택지인지 확인"""
+    if not choice_ko:
+        return False
+    # 한글이 포함된 경우만 기존 번역으로 인정
+    has_korean = any(ord(c) >= 0xAC00 and ord(c) <= 0xD7A3 for c in choice_ko)
+    # 잘못된 번역 패턴 제외 (예: "증가 the epochs" 같은 것)
+    has_wrong_pattern = bool(re.search(r'[가-힣]+\s+(the|a|an|to|for|with|by|of|in|on|at)\s+[a-zA-Z]', choice_ko))
+    return has_korean and not has_wrong_pattern
+
+
+class ChoiceTable:
+    """선택지 문자열 ↔ 정수 id 인턴 테이블"""
+
+    def __init__(self, texts=None, translations=None):
+        self.texts = list(texts or [])
+        self.translations = list(translations or [""] * len(self.texts))
+        self._ids = {text: i for i, text in enumerate(self.texts)}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def intern(self, text):
+        """선택지 문자열의 id 반환 (처음 보는 문자열이면 새 id 할당)"""
+        choice_id = self._ids.get(text)
+        if choice_id is None:
+            choice_id = len(self.texts)
+            self.texts.append(sys.intern(text))
+            self.translations.append("")
+            self._ids[text] = choice_id
+        return choice_id
+
+    def get_id(self, text):
+        return self._ids.get(text)
+
+    def resolve(self, choice_ids):
+        """choice_ids → (영어 선택지, 한글 선택지) 딕셔너리 (번역이 없는 선택지는 한글 딕셔너리에서 제외)"""
+        en_choices = {letter: self.texts[i] for letter, i in choice_ids.items()}
+        ko_choices = {letter: self.translations[i] for letter, i in choice_ids.items() if self.translations[i]}
+        return en_choices, ko_choices
+
+    def as_translations_dict(self):
+        """번역 사전 형식({영어: 한글})으로 변환"""
+        return dict(zip(self.texts, self.translations))
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        """선택지 테이블 파일 로드 (없으면 None)"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        return cls(raw.get('en', []), raw.get('ko', []))
+
+    def save(self, path=DEFAULT_TABLE_PATH):
+        atomic_write_json(path, {"en": self.texts, "ko": self.translations}, indent=None)
+
+
+def build_choice_table(data, translations_dict=None, table=None):
+    """문제 목록의 선택지를 인턴하여 choice_ids를 기록하고 테이블 반환
+
+    번역은 번역 사전 → 문제별 choices_ko(유효한 것만) 순으로 채웁니다.
+    테이블 번역과 같은 choices_ko는 문제에서 제거하여 한 번만 저장합니다.
+    """
+    from enhance_questions import parse_choices
+
+    if table is None:
+        table = ChoiceTable()
+    translations_dict = translations_dict or {}
+
+    for q in data:
+        en_choices = parse_choices(q.get('question_en', ''))
+        if not en_choices:
+            q.pop('choice_ids', None)
+            continue
+        choice_ids = {letter: table.intern(text) for letter, text in en_choices.items()}
+        q['choice_ids'] = choice_ids
+
+        choices_ko = q.get('choices_ko') or {}
+        for letter, choice_id in choice_ids.items():
+            if table.translations[choice_id]:
+                continue
+            translation = translations_dict.get(table.texts[choice_id])
+            if not translation and is_valid_translation(choices_ko.get(letter)):
+                translation = choices_ko[letter]
+            if translation:
+                table.translations[choice_id] = translation
+
+    # 테이블로 복원 가능한 choices_ko는 중복 저장하지 않음
+    for q in data:
+        choice_ids = q.get('choice_ids')
+        if choice_ids and 'choices_ko' in q:
+            _, table_ko = table.resolve(choice_ids)
+            if q['choices_ko'] == table_ko:
+                del q['choices_ko']
+
+    return table
+
+
+def main():
+    with open('data/questions.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    try:
+        with open('data/choices_translations.json', 'r', encoding='utf-8') as f:
+            translations_dict = json.load(f)
+    except FileNotFoundError:
+        translations_dict = {}
+
+    before = sum(len(q.get('question_en', '')) for q in data)
+    table = build_choice_table(data, translations_dict)
+    table.save()
+    save_questions('data/questions.json', data)
+
+    translated = sum(1 for t in table.translations if t)
+    references = sum(len(q.get('choice_ids', {})) for q in data)
+    print(f"✅ 선택지 테이블 생성 완료: {DEFAULT_TABLE_PATH}")
+    print(f"   - 고유 선택지 {len(table)}개 (문제 참조 {references}개, 영어 본문 {before}자)")
+    print(f"   - 번역 {translated}개, 번역 필요 {len(table) - translated}개")
+
+
+if __name__ == '__main__':
+    main()
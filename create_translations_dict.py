@@ -1,61 +1,57 @@
 #!/usr/bin/env python3
-"""번역 사전 파일 생성 스크립트"""
+"""번역 사전 파일 생성/병합 스크립트"""
 import json
-import re
 import sys
 sys.path.insert(0, '.')
-from enhance_questions import parse_choices
-
-def create_translations_dict():
-    """모든 고유 선택지를 추출하여 번역 사전 파일 생성"""
-    # 모든 고유 선택지 추출
-    with open('data/questions.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    all_choices = set()
-    for q in data:
-        question_en = q.get('question_en', '')
-        if question_en:
-            en_choices = parse_choices(question_en)
-            for letter, choice_text in en_choices.items():
-                if choice_text:
-                    all_choices.add(choice_text)
-
-    # 기존 번역된 선택지 수집
-    existing_translations = {}
-    for q in data:
-        choices_ko = q.get('choices_ko', {})
-        if choices_ko:
-            question_en = q.get('question_en', '')
-            en_choices = parse_choices(question_en)
-            for letter, choice_en in en_choices.items():
-                if choice_en in all_choices and letter in choices_ko:
-                    choice_ko = choices_ko[letter]
-                    # 한글이 포함된 경우만 기존 번역으로 인정
-                    has_korean = any(ord(c) >= 0xAC00 and ord(c) <= 0xD7A3 for c in choice_ko)
-                    # 잘못된 번역 패턴 제외 (예: "증가 the epochs" 같은 것)
-                    has_wrong_pattern = bool(re.search(r'[가-힣]+\s+(the|a|an|to|for|with|by|of|in|on|at)\s+[a-zA-Z]', choice_ko))
-                    if has_korean and not has_wrong_pattern and choice_en not in existing_translations:
-                        existing_translations[choice_en] = choice_ko
-
-    print(f"총 고유 선택지: {len(all_choices)}개")
-    print(f"기존 번역된 선택지 (올바른 것만): {len(existing_translations)}개")
-    print(f"번역 필요: {len(all_choices) - len(existing_translations)}개")
-
-    # 번역 사전 파일 구조
-    translations_dict = {}
-    for choice_en in sorted(all_choices):
-        translations_dict[choice_en] = existing_translations.get(choice_en, "")
-
-    # JSON 파일로 저장
-    with open('data/choices_translations.json', 'w', encoding='utf-8') as f:
-        json.dump(translations_dict, f, ensure_ascii=False, indent=2)
-
-    print(f"\n✅ 번역 사전 파일 생성 완료: data/choices_translations.json")
-    print(f"   - 총 {len(translations_dict)}개 선택지")
-    print(f"   - {len(existing_translations)}개는 기존 번역 포함")
-    print(f"   - {len(translations_dict) - len(existing_translations)}개는 빈 값 (번역 필요)")
+from choice_table import DEFAULT_TABLE_PATH, ChoiceTable, build_choice_table, is_valid_translation
+from io_utils import atomic_write_json
+
+DEFAULT_TRANSLATIONS_PATH = 'data/choices_translations.json'
+
+def create_translations_dict(table_path=DEFAULT_TABLE_PATH, questions_path='data/questions.json',
+                             translations_path=DEFAULT_TRANSLATIONS_PATH):
+    """선택지 테이블의 새 선택지를 기존 번역 사전에 병합
+
+    사전에 이미 있는 번역은 바꾸거나 지우지 않습니다 (영어 제품명을 그대로 둔 항목처럼 손으로 고친 값,
+    다른 문제 은행의 선택지도 유지). 새 선택지와 빈 항목만 테이블의 올바른 번역(없으면 빈 값)으로 채웁니다.
+    """
+    # 선택지 테이블이 있으면 그대로 사용, 없으면 questions.json에서 생성 (문제당 한 번만 파싱)
+    table = ChoiceTable.load(table_path)
+    if table is None:
+        with open(questions_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        table = build_choice_table(data)
+
+    try:
+        with open(translations_path, 'r', encoding='utf-8') as f:
+            translations_dict = json.load(f)
+    except FileNotFoundError:
+        translations_dict = {}
+
+    added = filled = 0
+    for choice_en, choice_ko in zip(table.texts, table.translations):
+        if not choice_en:
+            continue
+        if choice_en not in translations_dict:
+            translations_dict[choice_en] = choice_ko if is_valid_translation(choice_ko) else ""
+            added += 1
+        elif not translations_dict[choice_en] and is_valid_translation(choice_ko):
+            translations_dict[choice_en] = choice_ko
+            filled += 1
+
+    atomic_write_json(translations_path, dict(sorted(translations_dict.items())), indent=2)
+
+    missing = sum(1 for value in translations_dict.values() if not value)
+    print(f"✅ 번역 사전 병합 완료: {translations_path}")
+    print(f"   - 총 {len(translations_dict)}개 선택지 (새 선택지 {added}개, 빈 항목 채움 {filled}개)")
+    print(f"   - {missing}개는 빈 값 (번역 필요)")
 
 if __name__ == '__main__':
-    create_translations_dict()
+    import argparse
+    parser = argparse.ArgumentParser(description="선택지 테이블의 새 선택지를 번역 사전(data/choices_translations.json)에 병합합니다.")
+    parser.add_argument('--choices', default=DEFAULT_TABLE_PATH, help="선택지 테이블 경로")
+    parser.add_argument('--questions', default='data/questions.json', help="선택지 테이블이 없을 때 읽을 문제 파일")
+    parser.add_argument('--translations', default=DEFAULT_TRANSLATIONS_PATH, help="병합할 번역 사전 경로")
+    args = parser.parse_args()
+    create_translations_dict(args.choices, args.questions, args.translations)
 
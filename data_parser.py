@@ -1,7 +1,15 @@
+import argparse
 import re
 import json
 import os
-from pypdf import PdfReader
+from bank_registry import get_bank_config
+from choice_table import build_choice_table
+from dedup import mark_duplicates
+from image_variants import build_image_variants
+from io_utils import atomic_write_json
+from ingest_metrics import DEFAULT_REPORT_PATH, IngestMetrics
+from question_model import save_questions
+from snapshot import build_snapshot
 
 def clean_text(text):
     # 특수 문자 및 깨진 기호 정리
@@ -10,6 +18,20 @@ def clean_text(text):
     text = re.sub(r'\s+', ' ', text)
     return text
 
+# 페이지 텍스트의 마지막 줄이 숫자만 있는 줄 (페이지 번호 후보)
+_PAGE_FOOTER_RE = re.compile(r'\n[ \t]*(\d{1,4})[ \t]*$')
+
+def strip_page_footer(page_text, page_index):
+    """페이지 끝의 페이지 번호 줄 제거
+
+    마지막 줄이 그 페이지의 번호(0 또는 1부터 센 번호)와 같을 때만 페이지 번호로 보고 지웁니다.
+    그대로 두면 다음 페이지와 합칠 때 "Amazon Polly 17"처럼 선택지 끝에 붙습니다.
+    """
+    match = _PAGE_FOOTER_RE.search(page_text or "")
+    if match and int(match.group(1)) in (page_index, page_index + 1):
+        return page_text[:match.start()]
+    return page_text
+
 def extract_images_from_pdf(pdf_path, question_id, question_text="", output_dir="data/images"):
     """PDF에서 HOTSPOT 문제의 이미지를 추출하여 저장"""
     try:
@@ -80,6 +102,7 @@ def extract_images_from_pdf(pdf_path, question_id, question_text="", output_dir=
 
 def find_question_page(pdf_path, question_text):
     """PDF에서 특정 문제 텍스트가 있는 페이지 번호 찾기"""
+    from pypdf import PdfReader
     try:
         reader = PdfReader(pdf_path)
         # 문제의 첫 몇 단어를 검색 키워드로 사용
@@ -95,47 +118,66 @@ def find_question_page(pdf_path, question_text):
         print(f"Error finding page: {e}")
         return 0
 
-def parse_aws_dump(pdf_path, extract_hotspot_images=True):
-    reader = PdfReader(pdf_path)
-    full_text = ""
+def parse_aws_dump(pdf_path, extract_hotspot_images=True, metrics=None):
+    """덤프 PDF에서 문제 추출 (metrics가 있으면 단계별 시간과 누락 블록을 기록)"""
+    from pypdf import PdfReader
+    if metrics is None:
+        metrics = IngestMetrics()
+
+    with metrics.stage("open", pdf_path):
+        reader = PdfReader(pdf_path)
     
     # 이미지 저장 디렉토리 생성
     if extract_hotspot_images:
         os.makedirs("data/images", exist_ok=True)
     
     # 1. 페이지별로 텍스트 추출 및 정리
-    for page in reader.pages:
-        full_text += page.extract_text() + "\n"
+    with metrics.stage("extract_text", pdf_path):
+        page_texts = [strip_page_footer(page.extract_text(), i) for i, page in enumerate(reader.pages)]
+        full_text = "\n".join(page_texts) + "\n"
+    metrics.count("pages", len(page_texts), pdf_path)
+    metrics.count("chars", len(full_text), pdf_path)
 
     # 2. 문제 단위로 쪼개기
-    questions_raw = re.split(r'(\d{1,3}\.\s[A-Z])', full_text)
+    with metrics.stage("split", pdf_path):
+        questions_raw = re.split(r'(\d{1,3}\.\s[A-Z])', full_text)
     
     parsed_data = []
     
     # split 결과가 [빈값, 번호, 본문, 번호, 본문...] 식이므로 합쳐서 처리
     for i in range(1, len(questions_raw), 2):
         if i+1 >= len(questions_raw): break
+        metrics.count("blocks", 1, pdf_path)
         
-        q_num_part = questions_raw[i] # "121. A"
-        q_content_part = questions_raw[i+1] # 나머지 내용
-        q_block = q_num_part + q_content_part
-        
-        q_block = clean_text(q_block)
-        
-        # 정규표현식으로 각 필드 추출
-        # 1. 문제 번호
-        q_id = re.match(r'^(\d+)', q_block).group(1)
-        
-        # 2. 정답 (맨 마지막에 위치)
-        ans_match = re.search(r'정답:\s*([A-E,\s\.]+.*?)(?=\s*\d{1,3}\.|$)', q_block)
-        
-        # 3. 한국어 번역
-        ko_match = re.search(r'전체 번역:\s*(.*?)(?=\s*정답:)', q_block)
-        
-        # 4. 영어 질문 (문제 번호 다음부터 요약 전까지)
-        en_match = re.search(r'^\d+\.\s*(.*?)(?=\s*요약:)', q_block)
+        with metrics.stage("parse_blocks", pdf_path):
+            q_num_part = questions_raw[i] # "121. A"
+            q_content_part = questions_raw[i+1] # 나머지 내용
+            q_block = q_num_part + q_content_part
+            
+            q_block = clean_text(q_block)
+            
+            # 정규표현식으로 각 필드 추출
+            # 1. 문제 번호
+            id_match = re.match(r'^(\d+)', q_block)
+            q_id = id_match.group(1) if id_match else None
+            
+            # 2. 정답 (맨 마지막에 위치)
+            ans_match = re.search(r'정답:\s*([A-E,\s\.]+.*?)(?=\s*\d{1,3}\.|$)', q_block)
+            
+            # 3. 한국어 번역
+            ko_match = re.search(r'전체 번역:\s*(.*?)(?=\s*정답:)', q_block)
+            
+            # 4. 영어 질문 (문제 번호 다음부터 요약 전까지)
+            en_match = re.search(r'^\d+\.\s*(.*?)(?=\s*요약:)', q_block)
+
+        if not (q_id and ans_match and ko_match and en_match):
+            # 필드 추출에 실패한 블록은 사유와 함께 기록
+            reasons = [reason for reason, ok in (("no_id", q_id), ("no_answer", ans_match),
+                                                  ("no_korean", ko_match), ("no_english", en_match)) if not ok]
+            metrics.drop(pdf_path, reasons, q_block, q_id)
+            continue
 
-        if q_id and ans_match and ko_match and en_match:
+        with metrics.stage("parse_blocks", pdf_path):
             question_en = en_match.group(1).strip()
             is_hotspot = 'HOTSPOT' in question_en.upper()
             
@@ -152,40 +194,125 @@ def parse_aws_dump(pdf_path, extract_hotspot_images=True):
                 "question_ko": question_ko_clean,
                 "answer": ans_match.group(1).strip()
             }
-            
-            # HOTSPOT 문제의 이미지 추출
-            if extract_hotspot_images and is_hotspot:
+        
+        # HOTSPOT 문제의 이미지 추출
+        if is_hotspot:
+            metrics.count("hotspot", 1, pdf_path)
+        if extract_hotspot_images and is_hotspot:
+            metrics.count("image_lookups", 1, pdf_path)
+            with metrics.stage("images", pdf_path):
                 image_path = extract_images_from_pdf(pdf_path, q_id, question_en)
-                if image_path:
-                    # 상대 경로로 저장 (data/images/question_xxx.png)
-                    question_data["image_path"] = image_path
-                    print(f"✅ Question {q_id}: 이미지 추출 완료 - {image_path}")
-                else:
-                    print(f"⚠️ Question {q_id}: 이미지를 찾을 수 없음")
-            
-            parsed_data.append(question_data)
+            if image_path:
+                metrics.count("images_found", 1, pdf_path)
+                # 상대 경로로 저장 (data/images/question_xxx.png)
+                question_data["image_path"] = image_path
+                print(f"✅ Question {q_id}: 이미지 추출 완료 - {image_path}")
+                # 크기별 WebP/PNG 변형 생성 (static/images, 내용 해시 파일명)
+                with metrics.stage("image_variants", pdf_path):
+                    image_info = build_image_variants(image_path)
+                if image_info:
+                    question_data["image"] = image_info
+            else:
+                metrics.count("images_missing", 1, pdf_path)
+                print(f"⚠️ Question {q_id}: 이미지를 찾을 수 없음")
+        
+        metrics.count("parsed", 1, pdf_path)
+        parsed_data.append(question_data)
             
     return parsed_data
 
-if __name__ == "__main__":
-    test_files = ["data/ai_dump_1_120.pdf", "data/ai_dump_121_240.pdf", "data/ai_dump_241_329.pdf"]
+def main():
+    parser = argparse.ArgumentParser(description="덤프 PDF에서 문제를 추출하여 문제 은행(questions.json)을 만듭니다.")
+    parser.add_argument('files', nargs='*', help="덤프 PDF (기본값: data/banks.json의 sources)")
+    parser.add_argument('--bank', help="문제 은행 id (기본값: data/banks.json의 첫 번째 은행)")
+    parser.add_argument('--report', default=DEFAULT_REPORT_PATH, help="단계별 시간/누락 리포트 경로 (JSON)")
+    parser.add_argument('--profile', help="cProfile 결과 저장 경로 (예: data/ingest.prof)")
+    parser.add_argument('--no-images', action='store_true', help="HOTSPOT 이미지 추출 생략")
+    parser.add_argument('--part', help="파싱 결과만 이 경로에 저장 (중복 묶기/선택지 테이블/저장 생략, pipeline.py가 PDF별로 사용)")
+    parser.add_argument('--from-parts', action='store_true', help="files를 --part로 저장한 JSON으로 읽어 병합")
+    parser.add_argument('--no-snapshot', action='store_true', help="스냅샷 생성 생략")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    bank = get_bank_config(args.bank)
+    os.makedirs(os.path.dirname(bank["questions"]) or ".", exist_ok=True)
+    metrics = IngestMetrics()
     total_results = []
+    failed = []
     
-    for file in test_files:
+    for file in args.files or bank["sources"]:
         try:
-            results = parse_aws_dump(file, extract_hotspot_images=True)
+            if args.from_parts:
+                with open(file, "r", encoding="utf-8") as f:
+                    results = json.load(f)
+            else:
+                results = parse_aws_dump(file, extract_hotspot_images=not args.no_images, metrics=metrics)
             print(f"{file}: {len(results)}문제 추출 성공")
             total_results.extend(results)
         except Exception as e:
+            metrics.error(file, e)
+            failed.append(file)
             print(f"{file} 처리 중 오류: {e}")
             import traceback
             traceback.print_exc()
 
+    if args.part:
+        # PDF별 파싱 결과만 저장 (실패하면 이전 결과를 덮어쓰지 않음)
+        if failed:
+            raise SystemExit(1)
+        atomic_write_json(args.part, total_results, indent=None)
+        report = metrics.save(os.path.splitext(args.part)[0] + ".report.json")
+        for line in metrics.summary_lines(report):
+            print(line)
+        print(f"--- {len(total_results)}문제를 {args.part}에 저장했습니다. ---")
+        return
+
+    # 덤프 간 중복 문제 묶기 (묶음의 문제에 canonical_id 기록)
+    with metrics.stage("dedup"):
+        clusters = mark_duplicates(total_results)
+    metrics.count("duplicate_clusters", len(clusters))
+    print(f"--- 중복 묶음 {len(clusters)}개 (중복 문제 {sum(len(c) - 1 for c in clusters)}개) ---")
+
+    # 선택지 인턴 테이블 생성 (문제에는 choice_ids만 기록)
+    with metrics.stage("choice_table"):
+        try:
+            with open("data/choices_translations.json", "r", encoding="utf-8") as f:
+                translations_dict = json.load(f)
+        except FileNotFoundError:
+            translations_dict = {}
+        choice_table = build_choice_table(total_results, translations_dict)
+        choice_table.save(bank["choices"])
+    print(f"--- 고유 선택지 {len(choice_table)}개를 {bank['choices']}에 저장했습니다. ---")
+
     # 결과를 JSON 파일로 저장 (나중에 app.py에서 쓰기 위함)
-    with open("data/questions.json", "w", encoding="utf-8") as f:
-        json.dump(total_results, f, ensure_ascii=False, indent=4)
+    with metrics.stage("save"):
+        save_questions(bank["questions"], total_results)
         
+    # 앱 시작 시 한 번의 읽기로 로드할 스냅샷 생성
+    if not args.no_snapshot:
+        with metrics.stage("snapshot"):
+            build_snapshot(bank["questions"], bank["choices"], bank["snapshot"])
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
     # 이미지가 추출된 문제 수 확인
     image_count = sum(1 for q in total_results if q.get("image_path"))
-    print(f"--- 최종 결과: 총 {len(total_results)}문제가 questions.json에 저장되었습니다. ---")
+    print(f"--- 최종 결과: 총 {len(total_results)}문제가 {bank['questions']}에 저장되었습니다. ---")
     print(f"--- 이미지가 추출된 HOTSPOT 문제: {image_count}개 ---")
+
+    report = metrics.save(args.report)
+    for line in metrics.summary_lines(report):
+        print(line)
+    print(f"--- 수집 리포트: {args.report} ({report['total_seconds']:.1f}초) ---")
+    if profiler is not None:
+        print(f"--- 프로파일: {args.profile} (python -m pstats {args.profile}) ---")
+
+if __name__ == "__main__":
+    main()
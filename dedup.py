@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""덤프 파일 간 중복 문제 탐지 (MinHash + LSH)
+
+question_en을 단어 n-gram으로 나누어 MinHash 서명을 만들고, 서명을 밴드로 나눈 LSH 버킷에서
+같은 버킷에 들어간 문제 쌍만 비교하므로 문제 수가 늘어도 전체 쌍 비교 없이 동작합니다.
+중복 묶음의 문제에는 canonical_id(묶음에서 가장 먼저 나온 문제의 id)가 기록됩니다.
+단어가 SHINGLE_SIZE개보다 적은 문제(빈 본문, 짧은 HOTSPOT 본문 등)는 비교할 근거가 없으므로 묶지 않고,
+이미지가 있는 문제는 같은 이미지(내용 해시)를 가진 문제끼리만 비교합니다.
+"""
+import argparse
+import random
+import re
+import zlib
+from collections import defaultdict
+
+_PRIME = (1 << 31) - 1
+_TOKEN = re.compile(r'[0-9a-z]+')
+
+DEFAULT_THRESHOLD = 0.7
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 16
+
+
+def canonical_id(q):
+    """중복 묶음의 대표 id (중복이 없으면 자기 id)"""
+    return q.get('canonical_id', q['id'])
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """정규화한 텍스트의 단어 k-gram 해시 집합 (단어가 k개보다 적으면 빈 집합)"""
+    tokens = _TOKEN.findall((text or '').replace('\u0000', '').casefold())
+    grams = [' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+    return {zlib.crc32(g.encode('utf-8')) for g in grams}
+
+
+def image_key(q):
+    """문제 이미지의 비교 키 (이미지 내용 해시, 해시가 없으면 이미지 경로, 이미지가 없으면 None)"""
+    image = q.get('image') or {}
+    return image.get('hash') or q.get('image_path') or None
+
+
+class MinHasher:
+    """고정된 해시 함수 num_perm개로 MinHash 서명 생성 (numpy가 있으면 벡터 연산 사용)"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        try:
+            import numpy as np
+        except ImportError:
+            self._np = None
+        else:
+            self._np = np
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, hashes):
+        if not hashes:
+            return (_PRIME,) * self.num_perm
+        if self._np is not None:
+            np = self._np
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % _PRIME
+            return tuple(((self._a * values + self._b) % _PRIME).min(axis=1).tolist())
+        values = [h % _PRIME for h in hashes]
+        return tuple(min((a * v + b) % _PRIME for v in values) for a, b in zip(self.a, self.b))
+
+
+def estimated_similarity(sig1, sig2):
+    """두 서명의 일치 비율 (자카드 유사도 추정값)"""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+def find_duplicate_clusters(questions, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """유사도가 threshold 이상인 문제들을 묶어 인덱스 목록의 리스트로 반환 (2개 이상인 묶음만)
+
+    본문 단어가 너무 적은 문제는 어느 묶음에도 넣지 않으며, 이미지 키가 다른 문제는 같은 버킷에 넣지 않습니다.
+    """
+    hasher = MinHasher(num_perm)
+    rows = num_perm // bands
+    signatures = []
+    buckets = defaultdict(list)
+    for idx, q in enumerate(questions):
+        hashes = shingles(q.get('question_en', ''))
+        signatures.append(hasher.signature(hashes) if hashes else None)
+        if not hashes:
+            continue
+        sig = signatures[idx]
+        key = image_key(q)
+        for band in range(bands):
+            buckets[(key, band, sig[band * rows:(band + 1) * rows])].append(idx)
+
+    parent = list(range(len(questions)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if find(i) != find(j) and estimated_similarity(signatures[i], signatures[j]) >= threshold:
+                    parent[max(find(i), find(j))] = min(find(i), find(j))
+
+    clusters = defaultdict(list)
+    for idx in range(len(questions)):
+        clusters[find(idx)].append(idx)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def mark_duplicates(questions, threshold=DEFAULT_THRESHOLD):
+    """중복 묶음의 문제에 canonical_id 기록 (이전 기록은 지움), 묶음 목록 반환"""
+    for q in questions:
+        q.pop('canonical_id', None)
+    clusters = find_duplicate_clusters(questions, threshold)
+    for members in clusters:
+        canonical = questions[members[0]]['id']
+        for idx in members:
+            questions[idx]['canonical_id'] = canonical
+    return clusters
+
+
+def main():
+    import json
+    import time
+
+    from question_model import save_questions
+
+    parser = argparse.ArgumentParser(description="questions.json에서 중복 문제를 찾아 canonical_id를 기록합니다.")
+    parser.add_argument('--questions', default="data/questions.json")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--dry-run', action='store_true', help="파일을 수정하지 않고 결과만 출력")
+    parser.add_argument('--show', type=int, default=5, help="출력할 중복 묶음 수")
+    args = parser.parse_args()
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    start = time.perf_counter()
+    clusters = mark_duplicates(data, args.threshold)
+    elapsed = time.perf_counter() - start
+
+    duplicates = sum(len(c) - 1 for c in clusters)
+    print(f"✅ 중복 묶음 {len(clusters)}개, 중복 문제 {duplicates}개 → 고유 문제 {len(data) - duplicates}개 ({elapsed:.2f}초)")
+    for members in clusters[:args.show]:
+        print("  - " + ", ".join(str(data[i]['id']) for i in members) + f": {data[members[0]].get('question_en', '')[:80]}")
+
+    if not args.dry_run:
+        save_questions(args.questions, data)
+
+
+if __name__ == "__main__":
+    main()
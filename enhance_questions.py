@@ -1,5 +1,12 @@
+import hashlib
 import json
 import re
+from choice_table import DEFAULT_TABLE_PATH, ChoiceTable, is_valid_translation
+from question_model import save_questions
+from translation_memory import TranslationMemory
+
+# 번역 규칙이나 해설 규칙을 바꾸면 올려서 모든 문제가 다시 처리되도록 함
+RULES_VERSION = "1"
 
 def parse_choices(question_text):
     """질문 텍스트에서 선택지를 파싱"""
@@ -56,6 +63,16 @@ def get_translations_dict():
         _translations_dict = load_translations_dict()
     return _translations_dict
 
+# 번역 메모리 (근사 일치 검색용, 전역 변수로 캐시)
+_translation_memory = None
+
+def get_translation_memory():
+    """번역 사전 기반 번역 메모리 가져오기 (캐시 사용)"""
+    global _translation_memory
+    if _translation_memory is None:
+        _translation_memory = TranslationMemory(get_translations_dict())
+    return _translation_memory
+
 def translate_choice_simple(choice_en):
     """번역 사전 기반 선택지 번역 (사전에 없으면 규칙 기반 번역)"""
     if not choice_en:
@@ -66,6 +83,11 @@ def translate_choice_simple(choice_en):
     if choice_en in translations_dict and translations_dict[choice_en]:
         return translations_dict[choice_en]
     
+    # 공백, 페이지 번호, 깨진 문자만 다른 선택지는 번역 메모리에서 기존 번역 재사용
+    match = get_translation_memory().lookup(choice_en)
+    if match:
+        return match[0]
+    
     # AWS 제품명과 기술 용어 리스트 (영문 유지)
     aws_products = [
         'Amazon', 'SageMaker', 'Bedrock', 'Rekognition', 'Comprehend', 'Polly', 'Lex',
@@ -467,63 +489,183 @@ def enhance_answer_explanation(answer_text, question_text=""):
     
     return answer_text
 
-def enhance_questions():
-    """questions.json 파일을 읽어서 선택지 한글 번역과 해설을 추가"""
-    with open('data/questions.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def _glossary_entries(en_choices):
+    """선택지별로 현재 번역 사전/번역 메모리가 제공하는 번역"""
+    translations_dict = get_translations_dict()
+    entries = {}
+    for choice_en in en_choices.values():
+        translation = translations_dict.get(choice_en)
+        if not translation:
+            match = get_translation_memory().lookup(choice_en)
+            translation = match[0] if match else ""
+        entries[choice_en] = translation
+    return entries
+
+def compute_enhance_hash(q, en_choices=None):
+    """문제의 입력(영문 질문, 정답, 관련 번역 사전 항목)과 규칙 버전으로 해시 계산"""
+    question_en = q.get('question_en', '')
+    if en_choices is None:
+        en_choices = parse_choices(question_en)
+    payload = [RULES_VERSION, question_en, q.get('answer', ''), _glossary_entries(en_choices)]
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+def enhance_question(q, force=False):
+    """문제 하나의 선택지 번역과 해설 개선 (변경 여부 반환)
+
+    저장된 enhance_hash가 현재 입력의 해시와 같으면 처리하지 않습니다.
+    """
+    question_en = q.get('question_en', '')
+    en_choices = parse_choices(question_en)
+    stored_hash = q.get('enhance_hash')
+    if not force and stored_hash == compute_enhance_hash(q, en_choices):
+        return False
     
-    enhanced_count = 0
+    enhanced = False
     
-    for q in data:
-        enhanced = False
-        
-        # 영어 선택지 파싱
-        question_en = q.get('question_en', '')
-        en_choices = parse_choices(question_en)
+    # 한글 선택지 생성
+    should_translate = False
+    if en_choices:
+        if 'choice_ids' in q:
+            # choice_ids가 있는 문제는 선택지 테이블에 번역이 저장됨 (fill_choice_table에서 채움)
+            should_translate = False
+        elif force or stored_hash:
+            # 규칙 버전이나 번역 사전 항목이 바뀐 경우 다시 번역
+            should_translate = True
+        elif 'choices_ko' not in q:
+            should_translate = True
+        elif q.get('choices_ko'):
+            # choices_ko가 있지만 영어로 되어 있거나 잘못된 번역(예: "학습ing")이 있는지 확인
+            first_choice = list(q['choices_ko'].values())[0] if q['choices_ko'] else ""
+            if first_choice:
+                # 영어만 있거나, 한글 뒤에 영어 접미사가 붙은 경우(예: "학습ing", "배포ment") 재번역
+                has_korean = any(ord(c) >= 0xAC00 and ord(c) <= 0xD7A3 for c in first_choice)
+                has_wrong_suffix = any(
+                    re.search(r'[가-힣]+(ing|ment|tion|sion|ness|ity|ly|ed|er|est)\b', choice, re.IGNORECASE)
+                    for choice in q['choices_ko'].values()
+                )
+                if not has_korean or has_wrong_suffix:
+                    should_translate = True
+    
+    if should_translate:
+        ko_choices = {}
+        for letter, choice_en in en_choices.items():
+            ko_choices[letter] = translate_choice_simple(choice_en)
         
-        # 한글 선택지 생성
-        should_translate = False
-        if en_choices:
-            if 'choices_ko' not in q:
-                should_translate = True
-            elif q.get('choices_ko'):
-                # choices_ko가 있지만 영어로 되어 있거나 잘못된 번역(예: "학습ing")이 있는지 확인
-                first_choice = list(q['choices_ko'].values())[0] if q['choices_ko'] else ""
-                if first_choice:
-                    # 영어만 있거나, 한글 뒤에 영어 접미사가 붙은 경우(예: "학습ing", "배포ment") 재번역
-                    has_korean = any(ord(c) >= 0xAC00 and ord(c) <= 0xD7A3 for c in first_choice)
-                    has_wrong_suffix = any(
-                        re.search(r'[가-힣]+(ing|ment|tion|sion|ness|ity|ly|ed|er|est)\b', choice, re.IGNORECASE)
-                        for choice in q['choices_ko'].values()
-                    )
-                    if not has_korean or has_wrong_suffix:
-                        should_translate = True
-        
-        if should_translate:
-            ko_choices = {}
-            for letter, choice_en in en_choices.items():
-                ko_choices[letter] = translate_choice_simple(choice_en)
-            
+        if q.get('choices_ko') != ko_choices:
             q['choices_ko'] = ko_choices
             enhanced = True
-        
-        # 해설 개선
-        if 'answer' in q:
-            original_answer = q['answer']
-            enhanced_answer = enhance_answer_explanation(original_answer, question_en)
-            if enhanced_answer != original_answer:
-                q['answer'] = enhanced_answer
-                enhanced = True
-        
-        if enhanced:
-            enhanced_count += 1
     
-    # 저장
-    with open('data/questions.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    # 해설 개선
+    if 'answer' in q:
+        original_answer = q['answer']
+        enhanced_answer = enhance_answer_explanation(original_answer, question_en)
+        if enhanced_answer != original_answer:
+            q['answer'] = enhanced_answer
+            enhanced = True
+    
+    # 처리 후 상태 기준으로 해시 저장 (다음 실행에서는 건너뜀)
+    new_hash = compute_enhance_hash(q, en_choices)
+    if new_hash != stored_hash:
+        q['enhance_hash'] = new_hash
+        enhanced = True
+    
+    return enhanced
+
+def fill_choice_table(table, data):
+    """문제가 참조하는 선택지 테이블 항목의 번역을 id 위치에 채우고 변경된 항목 수 반환
+
+    번역 사전의 올바른 번역이 있으면 그 값으로 맞추고, 빈 항목만 규칙 기반 번역(올바른 번역일 때만)으로 채웁니다.
+    테이블로 복원되는 문제별 choices_ko는 중복이므로 지우고, 테이블이 모든 선택지를 번역한 문제의
+    잘못된 choices_ko(영어 그대로 등)도 지워 테이블 번역이 쓰이도록 합니다.
+    """
+    translations_dict = get_translations_dict()
+    referenced = sorted({i for q in data for i in (q.get('choice_ids') or {}).values()})
+    changed = 0
+    for choice_id in referenced:
+        text = table.texts[choice_id]
+        current = table.translations[choice_id]
+        translation = translations_dict.get(text)
+        if not is_valid_translation(translation):
+            translation = current or translate_choice_simple(text)
+        if translation != current and is_valid_translation(translation):
+            table.translations[choice_id] = translation
+            changed += 1
+
+    for q in data:
+        choice_ids = q.get('choice_ids')
+        if not choice_ids or 'choices_ko' not in q:
+            continue
+        table_ko = table.resolve(choice_ids)[1]
+        invalid = not all(is_valid_translation(ko) for ko in (q['choices_ko'] or {}).values())
+        if q['choices_ko'] == table_ko or (invalid and len(table_ko) == len(choice_ids)):
+            del q['choices_ko']
+    return changed
+
+def _init_worker():
+    """작업 프로세스마다 번역 사전과 번역 메모리를 한 번만 로드"""
+    get_translations_dict()
+    get_translation_memory()
+
+def _enhance_chunk(args):
+    """문제 묶음을 처리하여 변경된 문제만 (위치, 문제) 형태로 반환"""
+    start, chunk, force = args
+    return [(start + i, q) for i, q in enumerate(chunk) if enhance_question(q, force=force)]
+
+def enhance_questions(path='data/questions.json', force=False, jobs=1, choices_path=DEFAULT_TABLE_PATH):
+    """questions.json 파일을 읽어서 선택지 한글 번역과 해설을 추가 (변경된 문제만 처리)
+
+    choice_ids가 있는 문제의 선택지 번역은 문제가 아닌 선택지 테이블(choices_path)에 씁니다.
+    jobs > 1이면 문제를 여러 묶음으로 나누어 프로세스 풀에서 병렬 처리합니다.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    table = ChoiceTable.load(choices_path)
+    table_changed = 0
+    dropped = sum(1 for q in data if 'choices_ko' in q)
+    if table is not None:
+        table_changed = fill_choice_table(table, data)
+        if table_changed:
+            table.save(choices_path)
+    dropped -= sum(1 for q in data if 'choices_ko' in q)
+    
+    if jobs > 1 and len(data) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # 작업 분배가 고르도록 프로세스 수보다 잘게 나눔
+        chunk_size = max(1, -(-len(data) // (jobs * 4)))
+        tasks = [(i, data[i:i + chunk_size], force) for i in range(0, len(data), chunk_size)]
+        changed = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            # map은 입력 순서대로 결과를 돌려주므로 원래 순서 유지
+            for results in executor.map(_enhance_chunk, tasks):
+                changed.extend(results)
+        for index, q in changed:
+            data[index] = q
+        enhanced_count = len(changed)
+    else:
+        enhanced_count = 0
+        for q in data:
+            if enhance_question(q, force=force):
+                enhanced_count += 1
+    
+    # 변경된 문제가 있을 때만 임시 파일 + rename으로 저장
+    if enhanced_count or dropped:
+        save_questions(path, data)
     
+    if table_changed:
+        print(f"✅ 선택지 테이블 번역 {table_changed}개를 채웠습니다: {choices_path}")
     print(f"✅ {enhanced_count}개 문제가 개선되었습니다.")
     print(f"✅ 총 {len(data)}개 문제 처리 완료")
+    return enhanced_count
 
 if __name__ == '__main__':
-    enhance_questions()
+    import argparse
+    parser = argparse.ArgumentParser(description="선택지 한글 번역과 정답 해설을 추가합니다.")
+    parser.add_argument('--questions', default='data/questions.json', help="문제 파일 경로")
+    parser.add_argument('--choices', default=DEFAULT_TABLE_PATH, help="선택지 테이블 경로 (있으면 번역을 테이블에 기록)")
+    parser.add_argument('--force', action='store_true', help="해시와 관계없이 모든 문제를 다시 처리")
+    parser.add_argument('--jobs', type=int, default=1, help="병렬 처리 프로세스 수 (기본값: 1)")
+    args = parser.parse_args()
+    enhance_questions(args.questions, force=args.force, jobs=args.jobs, choices_path=args.choices)
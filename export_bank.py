@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""문제 은행 내보내기 (PDF, CSV, Anki 텍스트 가져오기용 TSV)
+
+questions.json을 문제 단위로 스트리밍하여 출력 파일에 바로 씁니다.
+CSV와 TSV는 문제 수와 관계없이 일정한 메모리로 동작합니다.
+PDF는 fpdf가 파일 하나의 페이지 내용을 메모리에 유지하므로 일정한 메모리 보장에서 제외되며,
+pdf_chunk를 주면 그 문제 수마다 파일을 나누어 메모리를 파일 하나 분량으로 제한합니다
+(같은 이미지는 파일마다 한 번만 임베딩됩니다).
+
+anki-tsv는 .apkg 패키지가 아니라 Anki의 "파일 가져오기"로 읽는 탭 구분 텍스트이며,
+이미지는 <출력 파일>_media/ 폴더의 파일을 Anki의 collection.media로 옮겨야 표시됩니다.
+"""
+import argparse
+import csv
+import html
+import itertools
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from choice_table import ChoiceTable
+from enhance_questions import parse_choices
+from question_store import DEFAULT_QUESTIONS_PATH, filter_questions, iter_questions
+
+FORMATS = ("pdf", "csv", "anki-tsv")
+EXTENSIONS = {"pdf": "pdf", "csv": "csv", "anki-tsv": "tsv"}
+CHOICE_LETTERS = "ABCDE"
+
+
+def _choices(q, choice_table=None):
+    """(영어 선택지, 한글 선택지) 반환"""
+    choice_ids = q.get('choice_ids')
+    if choice_table is not None and choice_ids:
+        en_choices, ko_choices = choice_table.resolve(choice_ids)
+    else:
+        en_choices, ko_choices = parse_choices(q.get('question_en', '')), {}
+    return en_choices, q.get('choices_ko') or ko_choices
+
+
+def write_csv(questions, out_path, choice_table=None):
+    """문제 스트림을 CSV로 저장 (Excel 호환 UTF-8 BOM), 저장한 문제 수 반환"""
+    columns = ["id", "question_en", "question_ko"]
+    columns += [f"choice_{letter}_en" for letter in CHOICE_LETTERS]
+    columns += [f"choice_{letter}_ko" for letter in CHOICE_LETTERS]
+    columns += ["answer", "image_path"]
+
+    count = 0
+    with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for q in questions:
+            en_choices, ko_choices = _choices(q, choice_table)
+            row = [q.get('id', ''), q.get('question_en', ''), q.get('question_ko', '')]
+            row += [en_choices.get(letter, '') for letter in CHOICE_LETTERS]
+            row += [ko_choices.get(letter, '') for letter in CHOICE_LETTERS]
+            row += [q.get('answer', ''), q.get('image_path', '')]
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _anki_field(text):
+    """Anki 텍스트 가져오기 필드 (탭/줄바꿈은 HTML로 변환)"""
+    return html.escape(str(text or '')).replace('\t', ' ').replace('\n', '<br>')
+
+
+def write_anki_tsv(questions, out_path, choice_table=None, media_dir=None):
+    """문제 스트림을 Anki 가져오기용 탭 구분 텍스트로 저장, 저장한 문제 수 반환
+
+    이미지가 있는 문제는 media_dir(기본값: <출력 파일>_media/)로 이미지를 복사합니다.
+    Anki에서는 이 폴더의 파일을 collection.media로 옮긴 뒤 텍스트 파일을 가져오면 됩니다.
+    """
+    if media_dir is None:
+        media_dir = os.path.splitext(out_path)[0] + "_media"
+
+    count = 0
+    with open(out_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("#separator:tab\n#html:true\n#columns:Front\tBack\tTags\n")
+        for q in questions:
+            en_choices, ko_choices = _choices(q, choice_table)
+            body = q.get('question_ko') or q.get('question_en', '')
+            front = [_anki_field(body.split('•')[0].strip())]
+            for letter in sorted(en_choices):
+                front.append(f"<b>{letter}.</b> {_anki_field(ko_choices.get(letter) or en_choices[letter])}")
+
+            image_path = q.get('image_path')
+            if image_path and os.path.exists(image_path):
+                os.makedirs(media_dir, exist_ok=True)
+                filename = os.path.basename(image_path)
+                target = os.path.join(media_dir, filename)
+                if not os.path.exists(target):
+                    shutil.copyfile(image_path, target)
+                front.append(f'<img src="{html.escape(filename)}">')
+
+            back = f"{_anki_field(q.get('answer', ''))}<br><br><small>{_anki_field(q.get('question_en', ''))}</small>"
+            tags = f"AIF-C01 q{q.get('id', '')}"
+            f.write(f"{'<br>'.join(front)}\t{back}\t{tags}\n")
+            count += 1
+    return count
+
+
+def write_pdf(questions, out_path, choice_table=None, title="AWS AIF-C01 Question Bank", chunk_size=None):
+    """문제 스트림을 PDF로 저장, 저장한 문제 수 반환
+
+    chunk_size를 주면 문제 chunk_size개마다 <이름>_001.pdf, <이름>_002.pdf, ...로 나누어 저장합니다.
+    """
+    from pdf_export import render_pdf
+
+    counter = {"count": 0}
+
+    def counted(stream):
+        for q in stream:
+            counter["count"] += 1
+            yield q
+
+    if not chunk_size:
+        pdf = render_pdf(counted(questions), title=title, choice_table=choice_table)
+        pdf.output(out_path)
+        return counter["count"]
+
+    stem, ext = os.path.splitext(out_path)
+    questions = iter(questions)
+    for part in itertools.count(1):
+        chunk = list(itertools.islice(questions, chunk_size))
+        if not chunk:
+            break
+        pdf = render_pdf(counted(chunk), title=f"{title} ({part})", choice_table=choice_table)
+        pdf.output(f"{stem}_{part:03d}{ext}")
+    return counter["count"]
+
+
+def export_questions(questions, fmt, out_path, choice_table=None, pdf_chunk=None):
+    """문제 스트림을 지정 형식으로 내보내기"""
+    if fmt == "csv":
+        return write_csv(questions, out_path, choice_table)
+    if fmt == "anki-tsv":
+        return write_anki_tsv(questions, out_path, choice_table)
+    if fmt == "pdf":
+        return write_pdf(questions, out_path, choice_table, chunk_size=pdf_chunk)
+    raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+
+def download_name(fmt, archive=False):
+    """내보낼 파일 이름 (archive=True이면 TSV는 미디어 폴더와 묶은 zip)"""
+    ext = "zip" if archive and fmt == "anki-tsv" else EXTENSIONS[fmt]
+    return f"{time.strftime('%Y-%m-%d')}_questions.{ext}"
+
+
+def export_bytes(questions, fmt, choice_table=None):
+    """문제 스트림을 내보낸 파일 내용 반환: (바이트, 파일 이름, 문제 수)
+
+    호출마다 따로 만든 임시 디렉터리에 스트리밍으로 쓰고 읽은 뒤 바로 지우므로, 여러 사용자가 동시에
+    내보내도 서로의 파일을 덮어쓰거나 내려받지 않습니다. TSV는 미디어 폴더(이미지가 있을 때)와 함께 zip으로 묶습니다.
+    """
+    filename = download_name(fmt)
+    with tempfile.TemporaryDirectory(prefix="export_") as tmp:
+        out_path = os.path.join(tmp, filename)
+        count = export_questions(questions, fmt, out_path, choice_table)
+        media_dir = os.path.splitext(out_path)[0] + "_media"
+        if fmt == "anki-tsv":
+            zip_path = os.path.join(tmp, download_name(fmt, archive=True))
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.write(out_path, filename)
+                for name in sorted(os.listdir(media_dir)) if os.path.isdir(media_dir) else []:
+                    zf.write(os.path.join(media_dir, name), f"{os.path.basename(media_dir)}/{name}")
+            out_path = zip_path
+        with open(out_path, "rb") as f:
+            return f.read(), os.path.basename(out_path), count
+
+
+def default_output_path(fmt, out_dir="exports"):
+    os.makedirs(out_dir, exist_ok=True)
+    return os.path.join(out_dir, download_name(fmt))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 은행을 PDF, CSV, Anki 가져오기용 TSV 형식으로 내보냅니다.")
+    parser.add_argument('format', choices=FORMATS)
+    parser.add_argument('-o', '--output', help="출력 파일 경로 (기본값: exports/<날짜>_questions.<확장자>)")
+    parser.add_argument('--questions', default=DEFAULT_QUESTIONS_PATH)
+    parser.add_argument('--ids', help="내보낼 문제 id (쉼표 구분)")
+    parser.add_argument('--hotspot', action='store_true', help="HOTSPOT 문제만")
+    parser.add_argument('--no-hotspot', action='store_true', help="HOTSPOT 문제 제외")
+    parser.add_argument('--keyword', help="본문에 검색어가 포함된 문제만")
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--pdf-chunk', type=int, help="PDF를 이 문제 수마다 나누어 저장 (메모리를 파일 하나 분량으로 제한)")
+    args = parser.parse_args()
+
+    hotspot = True if args.hotspot else (False if args.no_hotspot else None)
+    ids = {i.strip() for i in args.ids.split(',')} if args.ids else None
+    out_path = args.output or default_output_path(args.format)
+
+    questions = filter_questions(iter_questions(args.questions), ids=ids, hotspot=hotspot,
+                                 keyword=args.keyword, limit=args.limit)
+    start = time.perf_counter()
+    count = export_questions(questions, args.format, out_path, ChoiceTable.load(), pdf_chunk=args.pdf_chunk)
+    print(f"✅ {count}개 문제를 {out_path}에 저장했습니다. ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""HOTSPOT 문제 이미지 전처리 (내용 해시 기반 파일명, 크기 제한 변형 생성)
+
+변형 이미지는 static/images/에 저장됩니다. 파일명이 내용 해시이므로 내용이 바뀌면 URL도 바뀌어
+브라우저/프록시 캐시를 오래 유지해도 안전합니다.
+
+기본적으로는 Streamlit 정적 파일 서빙(.streamlit/config.toml의 server.enableStaticServing)으로
+app/static/images/...에서 제공하지만, Streamlit은 이 경로에 Cache-Control을 붙이지 않으므로 오래 캐시되지 않습니다.
+환경 변수 AIF_IMAGE_BASE_URL을 API 서버의 이미지 경로(예: http://localhost:8600/images)로 지정하면
+Cache-Control: public, max-age=31536000, immutable로 제공되는 그 주소를 씁니다.
+"""
+import hashlib
+import json
+import os
+
+STATIC_DIR = "static/images"
+STATIC_URL = "app/static/images"
+IMAGE_BASE_URL_ENV = "AIF_IMAGE_BASE_URL"
+# 생성할 최대 너비 (원본보다 큰 너비는 만들지 않음)
+VARIANT_WIDTHS = (480, 960)
+VARIANT_FORMATS = ("webp", "png")
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def build_image_variants(image_path, output_dir=STATIC_DIR, widths=VARIANT_WIDTHS, formats=VARIANT_FORMATS):
+    """원본 이미지로부터 크기별/형식별 변형을 만들고 이미지 정보(dict) 반환
+
+    같은 내용의 이미지는 같은 해시를 가지므로 이미 만들어진 변형은 다시 만들지 않습니다.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        print(f"Pillow not installed. Skipping image variants for {image_path}")
+        return None
+
+    try:
+        digest = _file_digest(image_path)
+        os.makedirs(output_dir, exist_ok=True)
+
+        with Image.open(image_path) as img:
+            img.load()
+            width, height = img.size
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+            target_widths = sorted({min(w, width) for w in widths})
+            variants = []
+            for target_width in target_widths:
+                target_height = max(1, round(height * target_width / width))
+                resized = None
+                for fmt in formats:
+                    filename = f"{digest}_{target_width}.{fmt}"
+                    path = os.path.join(output_dir, filename)
+                    if not os.path.exists(path):
+                        if resized is None:
+                            resized = img if target_width == width else img.resize((target_width, target_height), Image.LANCZOS)
+                        tmp_path = path + ".tmp"
+                        if fmt == "webp":
+                            resized.save(tmp_path, "WEBP", quality=85, method=6)
+                        else:
+                            resized.save(tmp_path, "PNG", optimize=True)
+                        os.replace(tmp_path, path)
+                    variants.append({
+                        "path": path,
+                        "url": f"{STATIC_URL}/{filename}",
+                        "format": fmt,
+                        "width": target_width,
+                        "height": target_height,
+                        "bytes": os.path.getsize(path),
+                    })
+
+        return {"hash": digest, "width": width, "height": height, "variants": variants}
+    except Exception as e:
+        print(f"Error building image variants for {image_path}: {e}")
+        return None
+
+
+def variant_url(variant):
+    """변형 이미지 URL (AIF_IMAGE_BASE_URL이 있으면 그 주소, 없으면 Streamlit 정적 파일 경로)"""
+    base = os.environ.get(IMAGE_BASE_URL_ENV)
+    if base:
+        return f"{base.rstrip('/')}/{os.path.basename(variant['path'])}"
+    return variant["url"]
+
+
+def pick_variant(image_info, fmt, max_width=960):
+    """지정 형식에서 max_width 이하 중 가장 큰 변형 선택"""
+    candidates = [v for v in image_info.get("variants", []) if v["format"] == fmt]
+    if not candidates:
+        return None
+    fitting = [v for v in candidates if v["width"] <= max_width]
+    if fitting:
+        return max(fitting, key=lambda v: v["width"])
+    return min(candidates, key=lambda v: v["width"])
+
+
+def image_html(image_info, alt="", max_width=960):
+    """WebP 우선 + PNG 대체 <picture> 태그 생성 (크기를 지정하여 레이아웃 흔들림 방지)"""
+    png = pick_variant(image_info, "png", max_width)
+    webp = pick_variant(image_info, "webp", max_width)
+    fallback = png or webp
+    if fallback is None:
+        return ""
+    source = f'<source srcset="{variant_url(webp)}" type="image/webp">' if webp and png else ""
+    return (
+        f'<picture>{source}<img src="{variant_url(fallback)}" alt="{alt}" '
+        f'width="{fallback["width"]}" height="{fallback["height"]}" '
+        f'style="max-width:100%;height:auto;" loading="lazy"></picture>'
+    )
+
+
+def image_prefetch_html(image_info, max_width=960):
+    """다음 문제 이미지를 브라우저 캐시에 미리 받아 두기 위한 숨김 이미지 태그"""
+    variant = pick_variant(image_info, "webp", max_width) or pick_variant(image_info, "png", max_width)
+    if variant is None:
+        return ""
+    return f'<img src="{variant_url(variant)}" alt="" width="1" height="1" style="display:none;">'
+
+
+def add_image_variants(data):
+    """image_path가 있는 문제에 image 필드(변형 정보) 추가, 처리한 문제 수 반환"""
+    count = 0
+    for q in data:
+        image_path = q.get("image_path")
+        if not image_path or not os.path.exists(image_path):
+            continue
+        info = build_image_variants(image_path)
+        if info:
+            q["image"] = info
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    from question_model import save_questions
+
+    with open("data/questions.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    count = add_image_variants(data)
+    if count:
+        save_questions("data/questions.json", data)
+    print(f"✅ {count}개 문제 이미지 변형 생성 완료 ({STATIC_DIR})")
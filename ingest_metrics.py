@@ -0,0 +1,96 @@
+"""PDF 수집(data_parser) 단계별 시간과 처리/누락 건수 기록"""
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from io_utils import atomic_write_json
+
+DEFAULT_REPORT_PATH = "data/ingest_report.json"
+GLOBAL_SCOPE = "(all)"
+
+
+class IngestMetrics:
+    """파일별 단계 시간(초), 카운터, 누락 사유를 모아 JSON 리포트로 만드는 기록기
+
+    scope를 생략하면 파일과 무관한 단계(선택지 테이블, 저장 등)로 기록됩니다.
+    """
+
+    def __init__(self, max_samples=20):
+        self.max_samples = max_samples
+        self.started = time.perf_counter()
+        self.stages = defaultdict(lambda: defaultdict(float))
+        self.counters = defaultdict(Counter)
+        self.dropped = defaultdict(Counter)
+        self.samples = defaultdict(list)
+        self.errors = {}
+
+    @contextmanager
+    def stage(self, name, scope=GLOBAL_SCOPE):
+        """with 블록의 실행 시간을 단계 시간에 누적"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[scope][name] += time.perf_counter() - start
+
+    def count(self, name, n=1, scope=GLOBAL_SCOPE):
+        self.counters[scope][name] += n
+
+    def drop(self, scope, reasons, block, q_id=None):
+        """누락된 블록 기록 (reasons: 실패한 필드 목록, 블록 하나가 여러 사유에 집계될 수 있음)"""
+        self.counters[scope]["blocks_dropped"] += 1
+        for reason in reasons:
+            self.dropped[scope][reason] += 1
+        if len(self.samples[scope]) < self.max_samples:
+            self.samples[scope].append({"id": q_id, "reasons": list(reasons), "text": block[:200]})
+
+    def error(self, scope, exc):
+        self.errors[scope] = f"{type(exc).__name__}: {exc}"
+
+    def report(self):
+        """JSON으로 저장할 리포트 dict"""
+        scopes = [s for s in dict.fromkeys([*self.stages, *self.counters, *self.dropped, *self.errors]) if s != GLOBAL_SCOPE]
+        files = {}
+        total_counters = Counter()
+        total_dropped = Counter()
+        for scope in scopes:
+            total_counters.update(self.counters[scope])
+            total_dropped.update(self.dropped[scope])
+            files[scope] = {
+                "seconds": round(sum(self.stages[scope].values()), 4),
+                "stages": {name: round(sec, 4) for name, sec in self.stages[scope].items()},
+                "counters": dict(self.counters[scope]),
+                "dropped": dict(self.dropped[scope]),
+                "dropped_samples": self.samples[scope],
+            }
+            if scope in self.errors:
+                files[scope]["error"] = self.errors[scope]
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "files": files,
+            "stages": {name: round(sec, 4) for name, sec in self.stages[GLOBAL_SCOPE].items()},
+            "totals": {"counters": dict(total_counters), "dropped": dict(total_dropped)},
+        }
+
+    def save(self, path=DEFAULT_REPORT_PATH):
+        report = self.report()
+        atomic_write_json(path, report, indent=2)
+        return report
+
+    def summary_lines(self, report=None):
+        """콘솔 출력용 파일별 요약"""
+        report = report or self.report()
+        lines = []
+        for path, info in report["files"].items():
+            c = info["counters"]
+            stages = ", ".join(f"{name} {sec:.2f}s" for name, sec in info["stages"].items())
+            lines.append(f"{path}: 페이지 {c.get('pages', 0)}, 블록 {c.get('blocks', 0)}, "
+                         f"추출 {c.get('parsed', 0)}, 누락 {c.get('blocks_dropped', 0)} "
+                         f"({info['seconds']:.2f}초: {stages})")
+            if info["dropped"]:
+                lines.append("  누락 사유: " + ", ".join(f"{k} {v}" for k, v in sorted(info["dropped"].items())))
+            if "error" in info:
+                lines.append(f"  오류: {info['error']}")
+        return lines
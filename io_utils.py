@@ -0,0 +1,21 @@
+"""파일 입출력 공용 함수"""
+import json
+import os
+import tempfile
+
+
+def atomic_write_json(path, data, indent=4):
+    """임시 파일에 쓴 뒤 rename하여 JSON 파일을 원자적으로 교체"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
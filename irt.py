@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""문항 반응 이론(2PL) 보정과 적응형 시험 문제 선택
+
+보정(배치): 답안 로그에서 (사용자, 문제)별 첫 응답만 모아 2모수 로지스틱 모형
+    P(정답) = 1 / (1 + exp(-a (θ - b)))     a: 변별도, b: 난이도, θ: 학습자 능력
+을 NumPy로 맞춥니다 (θ를 적분해 없애는 주변 최대우도, EM).
+응답은 사용자×문제 int8 행렬(사용자 구간별 블록)로 두고, 반복마다
+- E 단계: 능력 격자 위 학습자별 사후 분포 (정답/오답 행렬 × 문제별 격자 로그 확률 행렬 곱)
+- M 단계: 사후 분포로 구한 문제별 격자 기대 시도/정답 수에 대한 로지스틱 회귀를
+  모든 문제에 한꺼번에 2×2 뉴턴 단계로 풂
+학습자당 응답이 적어도 변별도가 발산하지 않습니다. 결과는 문제 은행별 irt.npz에 저장합니다.
+
+    python irt.py --bank aif-c01
+
+적응형 시험(문제마다): 보정 결과를 은행 내 위치 순서의 배열로 펼쳐 두고
+- 능력 추정: 고정 격자 위 사후 분포의 평균(EAP)과 표준편차
+- 다음 문제: 현재 추정 능력에서 정보량 a²·P·(1-P)이 가장 큰 문제 (같은 문제만 계속 나오지 않도록 상위 몇 개 중 무작위)
+- 합격 가능성: 은행 전체 기대 정답률이 합격 기준 이상인 능력 구간의 사후 확률
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from analytics import load_events, filter_events, question_key
+from quiz_engine import EXAM_SIZE, PASSING_SCORE
+
+DEFAULT_IRT_PATH = "data/irt.npz"
+
+GRID = np.linspace(-4.0, 4.0, 81)
+LOG_PRIOR = -0.5 * GRID ** 2  # 표준정규 사전 분포 (상수항 생략)
+
+# 보정용 격자와 문제 모수 사전 분포 (응답이 적은 문제가 발산하지 않도록)
+FIT_GRID = np.linspace(-4.0, 4.0, 41)
+A_PRIOR = (1.0, 0.5)   # 변별도 a ~ N(1, 0.5²)
+C_PRIOR_SD = 2.0       # 절편 c = -a·b ~ N(0, 2²)
+A_RANGE = (0.2, 4.0)
+
+ADAPTIVE_MIN_ITEMS = 15   # 이 수만큼은 풀어야 조기 종료
+ADAPTIVE_TARGET_SE = 0.3  # 능력 추정 표준오차가 이 값 이하이면 종료
+READINESS_CONFIDENCE = 0.95  # 합격/불합격 가능성이 이 값 이상이면 종료
+RANDOMESQUE = 5           # 정보량 상위 몇 문제 중에서 고를지
+
+
+def first_responses(events):
+    """(사용자 번호, 문제 번호, 정답 여부, 사용자 키, 문제 키) - (사용자, 문제)별 첫 응답만
+
+    정답을 본 뒤 다시 푼 응답은 난이도를 낮게 만들므로 제외합니다.
+    """
+    order = np.argsort(events["ts"], kind="stable")
+    events = events[order]
+    pair = (events["user"].astype(np.uint64) << np.uint64(32)) | events["question"].astype(np.uint64)
+    _, first = np.unique(pair, return_index=True)
+    events = events[first]
+    user_keys, user_idx = np.unique(events["user"], return_inverse=True)
+    item_keys, item_idx = np.unique(events["question"], return_inverse=True)
+    return user_idx, item_idx, events["correct"].astype(np.float64), user_keys, item_keys
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def response_blocks(user_idx, item_idx, correct, n_users, n_items, max_cells=1 << 22):
+    """사용자×문제 응답 행렬을 사용자 구간별 int8 블록으로 [(시작 사용자, 블록)] (0: 미응답, 1: 오답, 2: 정답)"""
+    rows = max(1, max_cells // max(n_items, 1))
+    order = np.argsort(user_idx, kind="stable")
+    user_idx, item_idx, correct = user_idx[order], item_idx[order], correct[order]
+    blocks = []
+    for first in range(0, n_users, rows):
+        lo, hi = np.searchsorted(user_idx, [first, first + rows])
+        block = np.zeros((min(rows, n_users - first), n_items), dtype=np.int8)
+        block[user_idx[lo:hi] - first, item_idx[lo:hi]] = 1 + (correct[lo:hi] > 0)
+        blocks.append((first, block))
+    return blocks
+
+
+def fit_2pl(user_idx, item_idx, correct, n_users, n_items, iterations=200, tol=1e-3):
+    """2PL 주변 최대우도(EM) 추정 {"theta"(EAP), "a", "b", "iterations", "log_likelihood"}
+
+    a와 b의 변화가 모두 tol보다 작아지면 멈춥니다.
+    """
+    blocks = response_blocks(user_idx, item_idx, correct, n_users, n_items)
+    log_prior = (-0.5 * FIT_GRID ** 2).astype(np.float32)
+    theta = np.zeros(n_users)
+    a = np.ones(n_items)
+    c = np.zeros(n_items)
+    for iteration in range(1, iterations + 1):
+        p = _sigmoid(a[:, None] * FIT_GRID[None, :] + c[:, None])  # 문제 × 격자
+        log_p = np.log(p + 1e-12).astype(np.float32)
+        log_q = np.log(1 - p + 1e-12).astype(np.float32)
+        n = np.zeros((n_items, len(FIT_GRID)), dtype=np.float32)
+        r = np.zeros((n_items, len(FIT_GRID)), dtype=np.float32)
+        log_likelihood = 0.0
+        for first, block in blocks:
+            solved = (block == 2).astype(np.float32)
+            missed = (block == 1).astype(np.float32)
+            # E 단계: 학습자별 격자 사후 분포
+            joint = solved @ log_p + missed @ log_q + log_prior
+            peak = joint.max(axis=1, keepdims=True)
+            post = np.exp(joint - peak)
+            total = post.sum(axis=1, keepdims=True)
+            post /= total
+            log_likelihood += float(np.sum(np.log(total) + peak))
+            theta[first:first + len(block)] = post @ FIT_GRID
+            # 문제별 격자 기대 시도 수 n, 정답 수 r
+            r += solved.T @ post
+            n += (solved + missed).T @ post
+
+        # M 단계: 모든 문제의 로지스틱 회귀 (a, c)를 2×2 뉴턴 단계로 함께 풂
+        previous_a, previous_b = a, -c / a
+        for _ in range(3):
+            p = _sigmoid(a[:, None] * FIT_GRID[None, :] + c[:, None])
+            resid = r - n * p
+            w = n * p * (1 - p)
+            g_a = resid @ FIT_GRID - (a - A_PRIOR[0]) / A_PRIOR[1] ** 2
+            g_c = resid.sum(axis=1) - c / C_PRIOR_SD ** 2
+            h_aa = w @ FIT_GRID ** 2 + 1 / A_PRIOR[1] ** 2
+            h_ac = w @ FIT_GRID
+            h_cc = w.sum(axis=1) + 1 / C_PRIOR_SD ** 2
+            det = h_aa * h_cc - h_ac ** 2
+            a = np.clip(a + (h_cc * g_a - h_ac * g_c) / det, *A_RANGE)
+            c = c + (h_aa * g_c - h_ac * g_a) / det
+
+        if max(np.abs(a - previous_a).max(initial=0), np.abs(-c / a - previous_b).max(initial=0)) < tol:
+            break
+
+    return {"theta": theta, "a": a, "b": -c / a, "iterations": iteration, "log_likelihood": log_likelihood}
+
+
+def calibrate(events, min_responses=1):
+    """답안 이벤트로 문제 모수 보정 {"keys"(문제 키), "a", "b", "responses", "users", "log_likelihood", ...}"""
+    user_idx, item_idx, correct, user_keys, item_keys = first_responses(events)
+    fit = fit_2pl(user_idx, item_idx, correct, len(user_keys), len(item_keys))
+    responses = np.bincount(item_idx, minlength=len(item_keys))
+    keep = responses >= min_responses
+    return {
+        "keys": item_keys[keep].astype(np.uint32),
+        "a": fit["a"][keep],
+        "b": fit["b"][keep],
+        "responses": responses[keep].astype(np.uint32),
+        "users": len(user_keys),
+        "log_likelihood": fit["log_likelihood"],
+        "iterations": fit["iterations"],
+        "created": time.time(),
+    }
+
+
+def save_calibration(calibration, path=DEFAULT_IRT_PATH):
+    """보정 결과를 npz로 원자적으로 저장"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **calibration)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_calibration(path=DEFAULT_IRT_PATH):
+    """저장된 보정 결과 (없으면 None)"""
+    try:
+        with np.load(path) as f:
+            return {key: f[key] for key in f.files}
+    except FileNotFoundError:
+        return None
+
+
+def item_parameters(questions, calibration=None, passing_score=PASSING_SCORE):
+    """은행 내 위치 순서로 펼친 적응형 시험용 배열
+
+    반환값: {"a", "b", "calibrated"(보정된 문제), "group"(중복 묶음 번호), "pass_curve"(격자별 합격 여부)}
+    보정되지 않은 문제는 a=1, b=0으로 두고 보정된 문제가 남아 있으면 먼저 출제하지 않습니다.
+    """
+    n = len(questions)
+    a = np.ones(n)
+    b = np.zeros(n)
+    calibrated = np.zeros(n, dtype=bool)
+    keys = np.array([question_key(q["id"]) for q in questions], dtype=np.uint32)
+    if calibration is not None and len(calibration["keys"]):
+        pos = np.clip(np.searchsorted(calibration["keys"], keys), 0, len(calibration["keys"]) - 1)
+        calibrated = calibration["keys"][pos] == keys
+        a[calibrated] = calibration["a"][pos[calibrated]]
+        b[calibrated] = calibration["b"][pos[calibrated]]
+    groups = {}
+    group = np.array([groups.setdefault(q.get("canonical_id", q["id"]), len(groups)) for q in questions], dtype=np.int64)
+    # 격자의 능력별 은행 전체 기대 정답률 (격자 점마다 한 번씩 벡터 계산)
+    expected = np.array([_sigmoid(a * (t - b)).mean() if n else 0.0 for t in GRID])
+    return {"a": a, "b": b, "calibrated": calibrated, "group": group,
+            "pass_curve": expected * 100 >= passing_score}
+
+
+def estimate_ability(params, positions, correct):
+    """(θ 추정값, 표준오차, 합격 가능성) - positions: 푼 문제 위치, correct: 같은 순서의 정답 여부"""
+    positions = np.asarray(positions, dtype=np.int64)
+    correct = np.asarray(correct, dtype=bool)
+    log_post = LOG_PRIOR.copy()
+    if len(positions):
+        p = _sigmoid(params["a"][positions, None] * (GRID[None, :] - params["b"][positions, None]))
+        log_post += np.where(correct[:, None], np.log(p + 1e-12), np.log(1 - p + 1e-12)).sum(axis=0)
+    post = np.exp(log_post - log_post.max())
+    post /= post.sum()
+    theta = float(post @ GRID)
+    se = float(np.sqrt(post @ (GRID - theta) ** 2))
+    return theta, se, float(post[params["pass_curve"]].sum())
+
+
+def next_item(params, theta, administered, rng=np.random):
+    """현재 능력 추정에서 정보량이 큰 문제 위치 (출제한 문제와 같은 중복 묶음 제외, 없으면 None)"""
+    a, b = params["a"], params["b"]
+    p = _sigmoid(a * (theta - b))
+    info = a * a * p * (1 - p)
+    available = np.ones(len(a), dtype=bool)
+    if len(administered):
+        available &= ~np.isin(params["group"], params["group"][np.asarray(administered, dtype=np.int64)])
+    if (available & params["calibrated"]).any():
+        available &= params["calibrated"]
+    candidates = np.flatnonzero(available)
+    if len(candidates) == 0:
+        return None
+    k = min(RANDOMESQUE, len(candidates))
+    top = candidates[np.argpartition(-info[candidates], k - 1)[:k]]
+    return int(top[rng.randint(len(top))])
+
+
+def should_stop(answered, se, readiness, max_items=EXAM_SIZE):
+    """적응형 시험 종료 조건 (최대 문제 수, 또는 최소 문제 수 이후 추정이 충분히 정확하거나 합격 여부가 분명함)"""
+    if answered >= max_items:
+        return True
+    if answered < ADAPTIVE_MIN_ITEMS:
+        return False
+    return se <= ADAPTIVE_TARGET_SE or readiness >= READINESS_CONFIDENCE or readiness <= 1 - READINESS_CONFIDENCE
+
+
+def main():
+    from bank_registry import get_bank_config
+
+    parser = argparse.ArgumentParser(description="답안 로그로 문제 은행의 2PL 문항 모수를 보정합니다.")
+    parser.add_argument("--bank", default=None, help="문제 은행 id (기본값: 첫 번째 은행)")
+    parser.add_argument("--events", default=None, help="답안 로그 경로 (기본값: data/events.bin)")
+    parser.add_argument("--min-responses", type=int, default=5, help="보정 결과에 남길 문제의 최소 응답 수")
+    args = parser.parse_args()
+
+    bank = get_bank_config(args.bank)
+    events = load_events(args.events) if args.events else load_events()
+    events = filter_events(events, bank=bank["id"])
+    if len(events) == 0:
+        print(f"⚠️ {bank['id']}: 기록된 답안이 없어 보정하지 않습니다.")
+        return
+    start = time.perf_counter()
+    calibration = calibrate(events, min_responses=args.min_responses)
+    elapsed = time.perf_counter() - start
+    save_calibration(calibration, bank["irt"])
+    print(f"✅ 보정 완료: {bank['irt']} (응답 {len(events):,}건, 학습자 {calibration['users']:,}명, "
+          f"문제 {len(calibration['keys']):,}개, 반복 {calibration['iterations']}회, {elapsed:.2f}초)")
+    if len(calibration["keys"]):
+        print(f"  난이도 b: {np.percentile(calibration['b'], 10):.2f} ~ {np.percentile(calibration['b'], 90):.2f} (10~90%), "
+              f"변별도 a 중앙값 {np.median(calibration['a']):.2f}")
+
+
+if __name__ == "__main__":
+    main()
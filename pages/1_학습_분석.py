@@ -0,0 +1,115 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import streamlit as st
+
+from analytics import (DEFAULT_EVENTS_PATH, daily_accuracy, exam_scores, filter_events, load_events,
+                       question_key, topic_accuracy, topic_lookup, weakest_questions)
+from bank_registry import default_registry
+from quiz_engine import PASSING_SCORE
+
+st.title("📊 학습 분석")
+
+@st.cache_resource(max_entries=2)
+def cached_events(path, size, mtime):
+    """이벤트 로그 (파일 크기/수정 시각이 바뀔 때만 다시 읽음, 읽기 전용으로 공유)"""
+    return load_events(path)
+
+@st.cache_resource(max_entries=2)
+def cached_topic_lookup(bank_id, version, question_count):
+    """(주제 조회 배열, 문제 키 → 본문 앞부분) - 문제 은행 전체를 붙잡지 않도록 필요한 값만 보관"""
+    bank = default_registry().get(bank_id)
+    excerpts = {question_key(q['id']): q.get('question_en', '')[:100] for q in bank["questions"]}
+    return topic_lookup(bank["questions"]), excerpts
+
+try:
+    stat = os.stat(DEFAULT_EVENTS_PATH)
+    events = cached_events(DEFAULT_EVENTS_PATH, stat.st_size, stat.st_mtime_ns)
+except FileNotFoundError:
+    events = None
+
+if events is None or len(events) == 0:
+    st.info("아직 기록된 답안이 없습니다. 문제를 풀면 여기에서 주제별 정답률과 시험 점수 추이를 볼 수 있습니다.")
+    st.stop()
+
+registry = default_registry()
+bank_ids = registry.bank_ids()
+default_bank = st.session_state.get("bank_id", bank_ids[0])
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    bank_id = st.selectbox("문제 은행", options=bank_ids, format_func=registry.title,
+                           index=bank_ids.index(default_bank) if default_bank in bank_ids else 0)
+with col2:
+    scope = st.radio("대상", options=["내 기록", "전체 사용자"], horizontal=True,
+                     index=0 if "user_id" in st.session_state else 1)
+with col3:
+    period_days = st.selectbox("기간", options=[0, 7, 30, 90], format_func=lambda d: "전체" if d == 0 else f"최근 {d}일")
+
+start = time.perf_counter()
+user = st.session_state.get("user_id") if scope == "내 기록" else None
+if scope == "내 기록" and user is None:
+    st.info("이 세션에서 푼 문제가 없습니다.")
+    st.stop()
+since = time.time() - period_days * 86400 if period_days else None
+selected = filter_events(events, user=user, bank=bank_id, since=since)
+
+if len(selected) == 0:
+    st.info("선택한 조건에 해당하는 답안이 없습니다.")
+    st.stop()
+
+bank = registry.get(bank_id)
+lookup, excerpts = cached_topic_lookup(bank_id, bank["version"], len(bank["questions"]))
+topics = topic_accuracy(selected, lookup)
+weakest = weakest_questions(selected, min_attempts=2 if user is None else 1, limit=10)
+exams = exam_scores(selected)
+daily = daily_accuracy(selected, tz_offset=-time.timezone)
+elapsed_ms = (time.perf_counter() - start) * 1000
+
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("답안 수", f"{len(selected):,}")
+m2.metric("정답률", f"{selected['correct'].mean() * 100:.1f}%")
+m3.metric("평균 응답 시간", f"{selected['latency_ms'].mean() / 1000:.1f}초")
+m4.metric("응시한 시험", f"{len(exams)}회")
+
+st.markdown("### 🧭 주제별 정답률")
+st.bar_chart({"정답률(%)": {row["topic"]: round(row["accuracy"] * 100, 1) for row in topics}})
+st.dataframe(
+    [{"주제": row["topic"], "시도": row["attempts"], "정답률(%)": round(row["accuracy"] * 100, 1)} for row in topics],
+    use_container_width=True, hide_index=True,
+)
+
+st.markdown("### 📉 정답률이 낮은 문제")
+if weakest:
+    st.dataframe(
+        [{
+            "문제": row["question"],
+            "시도": row["attempts"],
+            "정답률(%)": round(row["accuracy"] * 100, 1),
+            "평균 응답(초)": round(row["latency_ms"] / 1000, 1),
+            "내용": excerpts.get(row["question"], ""),
+        } for row in weakest],
+        use_container_width=True, hide_index=True,
+    )
+else:
+    st.caption("두 번 이상 푼 문제가 아직 없습니다.")
+
+st.markdown("### 🎯 시험 점수 추이")
+if exams:
+    st.line_chart({
+        "점수(%)": [round(e["score"], 1) for e in exams],
+        "합격 기준(%)": [PASSING_SCORE] * len(exams),
+    })
+    last = exams[-1]
+    st.caption(f"마지막 시험: {datetime.fromtimestamp(last['ts']).strftime('%Y-%m-%d %H:%M')} · "
+               f"{last['score']:.1f}% ({last['questions']}문제)")
+else:
+    st.caption("완료한 시험이 아직 없습니다.")
+
+st.markdown("### 📅 일별 정답률")
+st.line_chart({
+    datetime.fromtimestamp(d["day"] * 86400, timezone.utc).strftime("%m-%d"): round(d["accuracy"] * 100, 1) for d in daily
+})
+
+st.caption(f"이벤트 {len(events):,}건 중 {len(selected):,}건 집계 ({elapsed_ms:.0f} ms)")
@@ -0,0 +1,257 @@
+"""오답 노트 PDF 생성 (한글 폰트 사용, 사용된 글자만 서브셋 임베딩)"""
+import copy
+import os
+import sys
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+from enhance_questions import parse_choices
+
+FONT_FAMILY = "korean"
+
+# 한글 글리프가 있는 TTF 폰트 후보 (AIF_PDF_FONT 환경 변수로 지정 가능)
+FONT_CANDIDATES = [
+    "data/fonts/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+
+# 선택: 굵은 글꼴 (없으면 일반 글꼴로 대체)
+BOLD_FONT_CANDIDATES = [
+    "data/fonts/NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/nanum/NanumGothicBold.ttf",
+    "C:/Windows/Fonts/malgunbd.ttf",
+]
+
+
+@lru_cache(maxsize=1)
+def find_unicode_font():
+    """한글 폰트 경로 탐색 (프로세스당 한 번만 수행), (일반, 굵게) 튜플 반환"""
+    regular = os.environ.get("AIF_PDF_FONT")
+    if not regular or not os.path.exists(regular):
+        regular = next((p for p in FONT_CANDIDATES if os.path.exists(p)), None)
+    if regular is None:
+        return None, None
+    bold = os.environ.get("AIF_PDF_FONT_BOLD")
+    if not bold or not os.path.exists(bold):
+        bold = next((p for p in BOLD_FONT_CANDIDATES if os.path.exists(p)), None)
+    return regular, bold
+
+
+@lru_cache(maxsize=4)
+def _parsed_font(path, style):
+    """TTF를 한 번만 파싱한 (fpdf 폰트 객체, 폰트 파일 바이트) (프로세스당 한 번, 문서마다 복사해서 사용)
+
+    글자 폭/cmap/글리프 ID 표는 문서 사이에 공유하고, 서브셋 임베딩이 fontTools 객체를 바꾸므로
+    fontTools 객체만 메모리의 폰트 바이트로 문서마다 새로 엽니다 (지연 로드라 필요한 표만 읽음).
+    """
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_font(FONT_FAMILY, style, path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    return pdf.fonts[FONT_FAMILY + style], data
+
+
+def _add_font(pdf, style, path):
+    """파싱해 둔 폰트를 복사해 문서에 추가
+
+    컬러 폰트와 PDF 1.6이 필요한 CID 폰트는 문서 설정에 묶여 있고, fpdf 내부 구조가 달라 복사할 수
+    없을 때도 파일에서 다시 파싱해 추가합니다.
+    """
+    try:
+        from fontTools import ttLib
+        from fpdf.fonts import SubsetMap
+
+        template, data = _parsed_font(path, style)
+        if template.color_font is None and not (template.is_cff and template.is_cid_keyed):
+            font = copy.copy(template)
+            font.i = len(pdf.fonts) + 1
+            font.ttfont = ttLib.TTFont(BytesIO(data), recalcTimestamp=False,
+                                       fontNumber=template.collection_font_number, lazy=True)
+            font.cw = template.cw.copy()
+            font.missing_glyphs = []
+            font.biggest_size_pt = 0
+            font._hbfont = None
+            font.subset = SubsetMap(font)
+            pdf.fonts[font.fontkey] = font
+            return
+    except (AttributeError, TypeError):
+        pass
+    pdf.add_font(FONT_FAMILY, style, path)
+
+
+def to_ascii_safe(text):
+    """텍스트를 ASCII로 변환 (한글 폰트가 없을 때만 사용, 유니코드 문자는 ?로 대체)"""
+    if not text:
+        return ""
+    text = str(text).replace('•', '-').replace('·', '-').replace('…', '...')
+    return ''.join(c if ord(c) < 128 and c.isprintable() else '?' for c in text)
+
+
+def _question_image(q):
+    """PDF에 넣을 이미지 경로 (전처리된 PNG 변형 우선, 없으면 원본)"""
+    image_info = q.get('image')
+    if image_info:
+        pngs = [v for v in image_info.get('variants', []) if v['format'] == 'png' and os.path.exists(v['path'])]
+        if pngs:
+            return max(pngs, key=lambda v: v['width'])['path']
+    image_path = q.get('image_path')
+    if image_path and os.path.exists(image_path):
+        return image_path
+    return None
+
+
+class _PdfWriter:
+    """폰트 선택과 텍스트 정리를 감싼 FPDF 헬퍼"""
+
+    def __init__(self, use_font=True):
+        from fpdf import FPDF
+        from fpdf.enums import XPos, YPos
+
+        self.next_line = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+        self.pdf = FPDF()
+        self.pdf.set_auto_page_break(auto=True, margin=15)
+
+        regular, bold = find_unicode_font() if use_font else (None, None)
+        self.unicode = regular is not None
+        self.has_bold = False
+        if self.unicode:
+            # fpdf2는 문서에 실제로 사용된 글리프만 서브셋으로 임베딩
+            _add_font(self.pdf, '', regular)
+            if bold:
+                _add_font(self.pdf, 'B', bold)
+                self.has_bold = True
+        self.pdf.add_page()
+        # 페이지 너비 (기본값: 210mm에서 마진 제외)
+        self.page_width = self.pdf.w - 2 * self.pdf.l_margin
+
+    def set_font(self, style='', size=10):
+        if not self.unicode:
+            self.pdf.set_font("helvetica", style, size)
+        else:
+            # 한글 폰트에는 기울임꼴이 없으므로 굵게만 사용
+            self.pdf.set_font(FONT_FAMILY, 'B' if 'B' in style and self.has_bold else '', size)
+
+    def text(self, text):
+        text = str(text or '').replace('\u0000', '').strip()
+        return text if self.unicode else to_ascii_safe(text)
+
+    def heading(self, label, size=11):
+        self.set_font('B', size)
+        self.pdf.cell(self.page_width, 8, text=label, **self.next_line)
+
+    def paragraph(self, text, height=6, size=10):
+        safe = self.text(text)
+        if safe:
+            self.set_font('', size)
+            self.pdf.multi_cell(self.page_width, height, text=safe, **self.next_line)
+
+    def image(self, path):
+        try:
+            self.pdf.image(path, w=self.page_width)
+        except Exception as e:
+            print(f"PDF 이미지 추가 오류 ({path}): {e}", file=sys.stderr)
+
+
+def render_pdf(questions, title="AWS AIF-C01 Wrong Answer Notes", choice_table=None, use_font=True):
+    """문제 목록(또는 스트림)을 FPDF 문서로 렌더링 (문제, 답, 해설, HOTSPOT 이미지 포함)
+
+    use_font=False이면 한글 폰트 없이 ASCII로만 출력합니다.
+    fpdf가 설치되어 있지 않으면 ImportError가 발생합니다.
+    """
+    writer = _PdfWriter(use_font)
+    pdf = writer.pdf
+    page_width = writer.page_width
+
+    # 제목
+    writer.set_font('B', 16)
+    pdf.cell(page_width, 10, text=title, align='C')
+    pdf.ln(5)
+
+    # 날짜
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    writer.set_font('', 10)
+    pdf.cell(page_width, 8, text=f"Date: {date_str}", align='R')
+    pdf.ln(10)
+
+    # 각 문제 작성
+    for i, q in enumerate(questions):
+        # 문제 번호
+        writer.set_font('B', 14)
+        pdf.cell(page_width, 10, text=f"Question {i+1} (Original ID: {q['id']})", **writer.next_line)
+        pdf.ln(5)
+
+        # 문제 본문
+        question_ko = q.get('question_ko', '').replace('\u0000', '').strip()
+        question_en = q.get('question_en', '').replace('\u0000', '').strip()
+        is_hotspot = 'HOTSPOT' in question_en.upper() or 'HOTSPOT' in question_ko.upper()
+
+        writer.heading("[Question - Korean]")
+        writer.paragraph(question_ko)
+
+        pdf.ln(3)
+        writer.heading("[Question - English]")
+        writer.paragraph(question_en)
+
+        # HOTSPOT 문제의 이미지
+        if is_hotspot:
+            pdf.ln(3)
+            image_path = _question_image(q)
+            if image_path:
+                writer.image(image_path)
+            else:
+                writer.set_font('I', 10)
+                pdf.cell(page_width, 8, text="[Note: This is a HOTSPOT question. Original PDF contains an image/diagram that should be referenced.]", **writer.next_line)
+
+        pdf.ln(5)
+
+        # 선택지
+        choices_ko = q.get('choices_ko', {})
+        en_choices = parse_choices(question_en)
+        if not choices_ko and choice_table is not None and q.get('choice_ids'):
+            _, table_ko = choice_table.resolve(q['choice_ids'])
+            if len(table_ko) == len(q['choice_ids']):
+                choices_ko = table_ko
+
+        if choices_ko or en_choices:
+            writer.heading("[Choices]")
+            choices_to_show = choices_ko if choices_ko and writer.unicode else en_choices
+            for letter in sorted(choices_to_show.keys()):
+                writer.paragraph(f"{letter}. {choices_to_show[letter]}", height=5)
+            pdf.ln(5)
+
+        # 정답 및 해설
+        writer.heading("[Answer and Explanation]")
+        writer.paragraph(q.get('answer', ''))
+        pdf.ln(10)
+
+        # 구분선 (페이지 너비 기준)
+        line_start_x = pdf.l_margin
+        line_end_x = pdf.w - pdf.r_margin
+        pdf.line(line_start_x, pdf.get_y(), line_end_x, pdf.get_y())
+        pdf.ln(10)
+
+    return pdf
+
+
+def generate_pdf(wrong_questions, title="AWS AIF-C01 Wrong Answer Notes", choice_table=None, use_font=True):
+    """오답 노트를 PDF 바이트로 생성 (fpdf가 없거나 오류가 나면 None)"""
+    try:
+        pdf = render_pdf(wrong_questions, title, choice_table, use_font)
+        # bytearray를 bytes로 변환 (Streamlit download_button이 bytes를 기대)
+        return bytes(pdf.output())
+    except ImportError:
+        return None
+    except Exception as e:
+        # 에러 발생 시 None 반환
+        print(f"PDF 생성 오류: {type(e).__name__}: {e}", file=sys.stderr)
+        return None
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""데이터 빌드 파이프라인 (PDF 파싱 → 병합 → 번역 사전 → 선택지/해설 개선 → 스냅샷 → 게시)
+
+단계마다 입력/출력 파일을 선언하고, 마지막 실행 때 읽은 입력의 내용 해시를 data/pipeline_state.json에 기록합니다.
+입력이 그대로이고 출력이 있는 단계는 건너뛰므로 바뀐 것이 없으면 바로 끝나고,
+PDF 하나만 바뀌면 그 PDF의 파싱과 그 뒤 단계만 다시 실행합니다.
+서로 의존하지 않는 단계(PDF별 파싱)는 병렬로 실행합니다.
+마지막 게시 단계는 새 버전 디렉터리를 만들고 CURRENT를 교체하므로 실행 중인 앱이 재시작 없이 새 문제 은행을 사용합니다.
+
+    python pipeline.py                 # 필요한 단계만 실행
+    python pipeline.py --dry-run       # 실행할 단계만 출력
+    python pipeline.py enhance --force # 지정한 단계만 강제로 다시 실행 (앞 단계는 입력이 바뀐 경우에만)
+
+같은 파일을 쓰는 단계는 목록 순서대로 실행되며, 뒤 단계는 바로 앞에서 그 파일을 쓴 단계의 결과와 비교합니다.
+뒤 단계가 쓴 파일을 앞 단계가 읽는 경우(번역 사전 → 병합)는 파이프라인 밖에서 바뀐 경우에만 앞 단계를 다시 실행합니다.
+"""
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from bank_registry import get_bank_config
+from io_utils import atomic_write_json
+from snapshot import POINTER_NAME
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STATE_PATH = "data/pipeline_state.json"
+TRANSLATIONS_PATH = "data/choices_translations.json"
+
+
+def _script(name):
+    return os.path.join(ROOT, name)
+
+
+def build_stages(bank, python=sys.executable):
+    """문제 은행 하나의 단계 목록 [{"name", "cmd", "inputs", "outputs"}] (실행 순서)"""
+    parts_dir = os.path.join(os.path.dirname(bank["questions"]) or ".", "parts")
+    stages = []
+    parts = []
+    for source in bank["sources"]:
+        name = os.path.splitext(os.path.basename(source))[0]
+        part = os.path.join(parts_dir, f"{name}.json")
+        parts.append(part)
+        stages.append({
+            "name": f"parse:{name}",
+            "cmd": [python, _script("data_parser.py"), "--bank", bank["id"], "--part", part, source],
+            "inputs": [source, _script("data_parser.py")],
+            "outputs": [part],
+        })
+    stages += [
+        {
+            "name": "merge",
+            "cmd": [python, _script("data_parser.py"), "--bank", bank["id"], "--from-parts", "--no-snapshot", *parts],
+            "inputs": [*parts, TRANSLATIONS_PATH, _script("data_parser.py"), _script("dedup.py"), _script("choice_table.py")],
+            "outputs": [bank["questions"], bank["choices"]],
+        },
+        {
+            "name": "translations",
+            # 기존 사전에 새 선택지만 병합 (손으로 고친 번역과 다른 은행의 항목은 유지)
+            "cmd": [python, _script("create_translations_dict.py"), "--choices", bank["choices"],
+                    "--translations", TRANSLATIONS_PATH],
+            "inputs": [bank["choices"], TRANSLATIONS_PATH, _script("create_translations_dict.py")],
+            "outputs": [TRANSLATIONS_PATH],
+        },
+        {
+            "name": "enhance",
+            "cmd": [python, _script("enhance_questions.py"), "--questions", bank["questions"],
+                    "--choices", bank["choices"]],
+            "inputs": [bank["questions"], bank["choices"], TRANSLATIONS_PATH, _script("enhance_questions.py")],
+            "outputs": [bank["questions"], bank["choices"]],
+        },
+        {
+            "name": "snapshot",
+            "cmd": [python, _script("snapshot.py"), "--questions", bank["questions"], "--choices", bank["choices"],
+                    "--snapshot", bank["snapshot"]],
+            "inputs": [bank["questions"], bank["choices"], _script("snapshot.py")],
+            "outputs": [bank["snapshot"]],
+        },
+        {
+            "name": "publish",
+            "cmd": [python, _script("snapshot.py"), "--questions", bank["questions"], "--choices", bank["choices"],
+                    "--publish", bank["releases"]],
+            "inputs": [bank["questions"], bank["choices"], _script("snapshot.py")],
+            "outputs": [os.path.join(bank["releases"], POINTER_NAME)],
+        },
+    ]
+    return stages
+
+
+class FileHashes:
+    """파일 내용 해시 (크기/수정 시각이 같으면 저장된 해시를 다시 사용)"""
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else {}
+        # 단계 스레드가 캐시에 추가하는 동안 메인 스레드가 상태 파일로 저장하지 않도록
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        key = os.path.abspath(path)
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        with self.lock:
+            self.cache[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+
+def dependencies(stages):
+    """단계 이름 → 먼저 끝나야 하는 단계 이름 집합 (같은 파일을 읽고 쓰는 순서 유지)"""
+    deps = {}
+    for i, stage in enumerate(stages):
+        deps[stage["name"]] = set()
+        for earlier in stages[:i]:
+            reads_output = set(stage["inputs"]) & set(earlier["outputs"])
+            overwrites = set(stage["outputs"]) & (set(earlier["inputs"]) | set(earlier["outputs"]))
+            if reads_output or overwrites:
+                deps[stage["name"]].add(earlier["name"])
+    return deps
+
+
+def _producer(stages, index, path):
+    """index 단계보다 앞에서 path를 마지막으로 쓴 단계 (없으면 None)"""
+    for stage in reversed(stages[:index]):
+        if path in stage["outputs"]:
+            return stage
+    return None
+
+
+def _is_last_writer(stages, stage, path):
+    return stage is not None and not any(path in s["outputs"] for s in stages[stages.index(stage) + 1:])
+
+
+def stale_reason(stages, index, records, hashes):
+    """단계를 다시 실행해야 하는 이유 (최신이면 None)"""
+    stage = stages[index]
+    record = records.get(stage["name"])
+    if record is None:
+        return "처음 실행"
+    if record["cmd"] != stage["cmd"]:
+        return "명령 변경"
+    for path in stage["outputs"]:
+        if not os.path.exists(path):
+            return f"출력 없음: {path}"
+    for path in stage["inputs"]:
+        producer = _producer(stages, index, path)
+        if producer is None and path in stage["outputs"]:
+            # 앞에서 쓰는 단계가 없는 파일을 제자리에서 고치는 단계: 자기가 마지막으로 쓴 내용과 비교
+            if record["produced"].get(path) != hashes.get(path):
+                return f"입력 변경: {path}"
+            continue
+        if producer is not None and not _is_last_writer(stages, producer, path):
+            # 같은 파일을 뒤에서 다시 쓰는 단계가 있으면 현재 파일 대신 바로 앞 단계가 쓴 내용과 비교
+            producer_record = records.get(producer["name"], {})
+            if producer_record.get("finished", 0) > record.get("finished", 0):
+                # 앞 단계가 이 단계 뒤에 다시 써서 이 단계의 변경이 덮어써짐 (내용이 같아도 다시 실행)
+                return f"입력 변경: {path}"
+            expected = producer_record.get("produced", {}).get(path)
+            if (record["consumed"].get(path) != expected and path in stage["outputs"]
+                    and record["produced"].get(path) == hashes.get(path)):
+                # 명령 변경 등으로 앞 단계 없이 다시 실행된 제자리 수정 단계: 앞 단계가 그 뒤로 다시 쓰지 않았고
+                # 파일도 이 단계가 쓴 그대로이면 최신
+                continue
+        else:
+            expected = hashes.get(path)
+            if producer is None:
+                later = [s for s in stages[index + 1:] if path in s["outputs"]]
+                if later and expected == records.get(later[-1]["name"], {}).get("produced", {}).get(path):
+                    # 뒤 단계가 쓴 그대로인 파일 (파이프라인 안에서 생긴 변경)
+                    continue
+        if record["consumed"].get(path) != expected:
+            return f"입력 변경: {path}"
+    return None
+
+
+def run_stage(stage, hashes):
+    """단계 명령 실행, (성공 여부, 출력, 읽은 입력 해시, 쓴 출력 해시, 걸린 시간)"""
+    consumed = {path: hashes.get(path) for path in stage["inputs"]}
+    for path in stage["outputs"]:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    start = time.perf_counter()
+    proc = subprocess.run(stage["cmd"], capture_output=True, text=True, encoding="utf-8", errors="replace")
+    elapsed = time.perf_counter() - start
+    produced = {path: hashes.get(path) for path in stage["outputs"]}
+    return proc.returncode == 0, proc.stdout + proc.stderr, consumed, produced, elapsed
+
+
+def select_stages(stages, targets, deps):
+    """(지정한 단계와 그 앞 단계 목록, 지정한 단계 이름 집합) - targets가 없으면 전체"""
+    if not targets:
+        return stages, {s["name"] for s in stages}
+    names = {s["name"] for s in stages}
+    wanted = set()
+    pending = []
+    for target in targets:
+        matched = [n for n in names if n == target or n.startswith(f"{target}:")]
+        if not matched:
+            raise SystemExit(f"알 수 없는 단계: {target} (가능한 단계: {', '.join(s['name'] for s in stages)})")
+        pending += matched
+    selected = set(pending)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending += deps[name]
+    return [s for s in stages if s["name"] in wanted], selected
+
+
+def run_pipeline(stages, state, jobs=4, force=(), dry_run=False, save=None):
+    """단계 실행 (의존 단계가 끝난 단계부터 병렬로), 실패한 단계 이름 목록 반환"""
+    hashes = FileHashes(state.setdefault("hashes", {}))
+    records = state.setdefault("stages", {})
+    deps = dependencies(stages)
+    names = [s["name"] for s in stages]
+    index = {name: i for i, name in enumerate(names)}
+    done, failed, skipped = set(), [], set()
+    running = {}
+    will_run = set()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while len(done) + len(failed) + len(skipped) < len(stages):
+            for name in names:
+                if name in done or name in running or name in failed or name in skipped:
+                    continue
+                stage_deps = deps[name] & set(names)
+                if stage_deps & (set(failed) | skipped):
+                    skipped.add(name)
+                    print(f"⚠️ {name}: 앞 단계 실패로 건너뜀")
+                    continue
+                if not stage_deps <= done:
+                    continue
+                i = index[name]
+                if name in force:
+                    reason = "강제 실행"
+                elif dry_run and stage_deps & will_run:
+                    reason = "앞 단계 실행 예정"
+                else:
+                    reason = stale_reason(stages, i, records, hashes)
+                if reason is None:
+                    print(f"⏭️  {name}: 최신")
+                    done.add(name)
+                elif dry_run:
+                    print(f"▶️  {name}: 실행 예정 ({reason})")
+                    will_run.add(name)
+                    done.add(name)
+                else:
+                    print(f"▶️  {name}: 실행 ({reason})")
+                    running[name] = executor.submit(run_stage, stages[i], hashes)
+            if not running:
+                continue
+            finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+            for name, future in list(running.items()):
+                if future not in finished:
+                    continue
+                del running[name]
+                ok, output, consumed, produced, elapsed = future.result()
+                if ok:
+                    records[name] = {"cmd": stages[index[name]]["cmd"], "consumed": consumed, "produced": produced,
+                                     "finished": time.time()}
+                    done.add(name)
+                    print(f"✅ {name} ({elapsed:.1f}초)")
+                    if save is not None:
+                        with hashes.lock:
+                            save(state)
+                else:
+                    failed.append(name)
+                    print(f"❌ {name} 실패 ({elapsed:.1f}초)\n{output.rstrip()}")
+    return failed
+
+
+def load_state(path=DEFAULT_STATE_PATH):
+    import json
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="입력이 바뀐 단계만 다시 실행하여 문제 은행 데이터를 빌드합니다.")
+    parser.add_argument("targets", nargs="*", help="실행할 단계 (예: merge, enhance, parse; 기본값: 전체)")
+    parser.add_argument("--bank", help="문제 은행 id (기본값: data/banks.json의 첫 번째 은행)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="동시에 실행할 단계 수")
+    parser.add_argument("--force", action="store_true", help="지정한 단계(없으면 전체)를 최신이어도 다시 실행")
+    parser.add_argument("--dry-run", action="store_true", help="실행하지 않고 실행할 단계만 출력")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH)
+    args = parser.parse_args()
+
+    bank = get_bank_config(args.bank)
+    stages = build_stages(bank)
+    stages, selected = select_stages(stages, args.targets, dependencies(stages))
+    state = load_state(args.state)
+    bank_state = state.setdefault(bank["id"], {})
+
+    def save(_):
+        atomic_write_json(args.state, state, indent=1)
+
+    start = time.perf_counter()
+    force = selected if args.force else set()
+    failed = run_pipeline(stages, bank_state, jobs=args.jobs, force=force, dry_run=args.dry_run,
+                          save=None if args.dry_run else save)
+    if not args.dry_run:
+        save(state)
+    elapsed = time.perf_counter() - start
+    if failed:
+        print(f"❌ 실패한 단계: {', '.join(failed)} ({elapsed:.2f}초)")
+        sys.exit(1)
+    print(f"✅ 파이프라인 완료 ({elapsed:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
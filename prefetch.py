@@ -0,0 +1,53 @@
+"""다음 문제 미리 불러오기 (백그라운드 스레드에서 렌더링 데이터와 이미지를 준비)"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Prefetcher:
+    """키별로 한 번만 계산하여 결과를 보관하는 백그라운드 로더 (최근 max_items개 유지)
+
+    prefetch()로 미리 계산을 요청하고, get()으로 결과를 가져옵니다.
+    get() 시점에 계산이 끝나지 않았으면 완료될 때까지 기다리고, 요청된 적이 없으면 바로 계산합니다.
+    """
+
+    def __init__(self, max_items=32, max_workers=1):
+        self.max_items = max_items
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key, future):
+        self._futures[key] = future
+        self._futures.move_to_end(key)
+        while len(self._futures) > self.max_items:
+            self._futures.popitem(last=False)
+
+    def prefetch(self, key, fn, *args):
+        """fn(*args)를 백그라운드에서 미리 계산 (이미 요청된 키면 무시)"""
+        with self._lock:
+            if key in self._futures:
+                self._futures.move_to_end(key)
+                return
+            self._remember(key, self._executor.submit(fn, *args))
+
+    def get(self, key, fn, *args):
+        """미리 계산된 결과 반환 (없거나 실패했으면 현재 스레드에서 계산)"""
+        with self._lock:
+            future = self._futures.get(key)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass
+        result = fn(*args)
+        done = Future()
+        done.set_result(result)
+        with self._lock:
+            self._remember(key, done)
+        return result
+
+    def __contains__(self, key):
+        with self._lock:
+            future = self._futures.get(key)
+        return future is not None and future.done()
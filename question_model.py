@@ -0,0 +1,116 @@
+"""문제 레코드 (읽기 전용, __slots__ 기반)
+
+questions.json의 문제 하나를 dict 대신 고정 필드 레코드로 보관합니다.
+id는 sys.intern으로 공유하고 선택지(choice_ids, choices_ko)는 ("A", 값, "B", 값, ...) 평탄한 튜플 하나로 저장하므로
+문제 수만큼 생기는 dict 오버헤드가 없고, 세션 상태나 시험 목록에는 복사 없이 같은 객체가 들어갑니다.
+기존 코드가 그대로 동작하도록 q['id'], q.get('choices_ko') 같은 dict식 읽기를 지원합니다.
+수집/번역 도구는 JSON의 dict를 수정한 뒤 save_questions()로 저장합니다.
+"""
+import json
+import sys
+from dataclasses import dataclass, fields
+
+from io_utils import atomic_write_json
+
+DEFAULT_QUESTIONS_PATH = "data/questions.json"
+
+_CHOICE_FIELDS = ("choice_ids", "choices_ko")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _pack(mapping):
+    """{"A": x, "B": y} → ("A", x, "B", y) (문자별 튜플이나 dict보다 작음)"""
+    return tuple(item for pair in mapping.items() for item in pair)
+
+
+def _unpack(packed):
+    return dict(zip(packed[::2], packed[1::2]))
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    id: str
+    question_en: str = ""
+    question_ko: str = ""
+    answer: str = ""
+    image_path: str = None
+    image: dict = None            # HOTSPOT 이미지 변형 정보 (image_variants.py)
+    canonical_id: str = None      # 중복 묶음의 대표 id (dedup.py)
+    choice_ids: tuple = None      # ("A", 12, "B", 40, ...) - 선택지 테이블 id
+    choices_ko: tuple = None      # ("A", "한글 선택지", "B", ...)
+    enhance_hash: str = None
+    extra: tuple = ()             # 위에 없는 필드 ((키, 값), ...) - 저장 시 그대로 기록
+
+    @classmethod
+    def from_dict(cls, data):
+        values = {}
+        extra = []
+        for key, value in data.items():
+            if key in _FIELD_NAMES:
+                if key in _CHOICE_FIELDS and value is not None:
+                    value = _pack(value)
+                values[key] = value
+            else:
+                extra.append((key, value))
+        values["id"] = _intern(values.get("id"))
+        if "canonical_id" in values:
+            values["canonical_id"] = _intern(values["canonical_id"])
+        return cls(**values, extra=tuple(extra))
+
+    def to_dict(self):
+        """JSON 저장용 dict (값이 없는 선택 필드는 생략)"""
+        data = {"id": self.id, "question_en": self.question_en, "question_ko": self.question_ko, "answer": self.answer}
+        for key in _OPTIONAL_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = _unpack(value) if key in _CHOICE_FIELDS else value
+        data.update(self.extra)
+        return data
+
+    # dict식 읽기 (값이 없는 선택 필드는 없는 키로 취급)
+    def __getitem__(self, key):
+        if key in _FIELD_NAMES and key != "extra":
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return _unpack(value) if key in _CHOICE_FIELDS else value
+        for extra_key, value in self.extra:
+            if extra_key == key:
+                return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(Question))
+_OPTIONAL_FIELDS = ("image_path", "image", "canonical_id", "choice_ids", "choices_ko", "enhance_hash")
+
+
+def to_question(q):
+    """dict 또는 Question을 Question으로"""
+    return q if isinstance(q, Question) else Question.from_dict(q)
+
+
+def load_questions(path=DEFAULT_QUESTIONS_PATH):
+    """questions.json을 Question 목록으로 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [Question.from_dict(q) for q in json.load(f)]
+
+
+def save_questions(path, questions, indent=4):
+    """문제 목록(dict 또는 Question)을 questions.json 형식으로 원자적으로 저장"""
+    atomic_write_json(path, [to_question(q).to_dict() for q in questions], indent=indent)
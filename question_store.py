@@ -0,0 +1,72 @@
+"""문제 저장소 스트리밍 읽기 (questions.json 배열을 전체 로드하지 않고 문제 단위로 순회)"""
+import json
+
+DEFAULT_QUESTIONS_PATH = "data/questions.json"
+
+
+def iter_questions(path=DEFAULT_QUESTIONS_PATH, chunk_size=1 << 16):
+    """JSON 배열 파일에서 문제를 하나씩 읽어 반환 (메모리는 문제 하나 + 읽기 버퍼 크기만 사용)"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        started = False
+        eof = False
+        while True:
+            # 공백과 구분자 건너뛰기
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"{path}: JSON 배열이 닫히지 않았습니다.")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: JSON 배열 형식이 아닙니다.")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # 문제 하나가 버퍼 경계에 걸친 경우 더 읽어서 재시도
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+            # 처리한 부분은 버퍼에서 제거
+            if pos > chunk_size:
+                buf = buf[pos:]
+                pos = 0
+
+
+def filter_questions(questions, ids=None, hotspot=None, keyword=None, limit=None):
+    """문제 스트림 필터 (ids: 포함할 id 집합, hotspot: True/False, keyword: 본문 검색어)"""
+    keyword = keyword.lower() if keyword else None
+    count = 0
+    for q in questions:
+        if limit is not None and count >= limit:
+            return
+        if ids is not None and str(q.get("id")) not in ids:
+            continue
+        if hotspot is not None:
+            is_hotspot = "HOTSPOT" in q.get("question_en", "").upper()
+            if is_hotspot != hotspot:
+                continue
+        if keyword and keyword not in q.get("question_en", "").lower() and keyword not in q.get("question_ko", "").lower():
+            continue
+        count += 1
+        yield q
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""터미널 퀴즈/시험 (앱과 같은 quiz_engine 로직 사용)
+
+사용법:
+    python quiz_cli.py                       # 연습 모드 (1번 문제부터)
+    python quiz_cli.py --random --count 20   # 무작위 20문제 연습
+    python quiz_cli.py exam --seed 42        # 시험 모드 (65문제, 합격 기준 70%)
+
+답은 A 또는 A,C처럼 입력합니다. 빈 입력은 건너뛰기, q는 종료입니다.
+"""
+import argparse
+import random
+import re
+import sys
+
+from quiz_engine import EXAM_SIZE, LANG_MODES, grade_answer, present_question, sample_exam, score_exam
+from bank_registry import get_bank_config
+from snapshot import load_bank
+
+_TAGS = re.compile(r'<[^>]+>|\*\*')
+
+
+def _plain(text):
+    return _TAGS.sub('', str(text or ''))
+
+
+def show_question(q, number, total, lang_mode, choice_table, rng, out=sys.stdout):
+    """문제를 출력하고 (선택지, 복수 선택 여부) 반환"""
+    body, choices, is_multiple = present_question(q, lang_mode, choice_table, rng=rng)
+    print(f"\n[{number}/{total}] Question {q['id']}", file=out)
+    print(_plain(body), file=out)
+    if choices:
+        for letter in sorted(choices):
+            print(f"  {letter}. {_plain(choices[letter])}", file=out)
+        if is_multiple:
+            print("  (복수 선택: 예) A,C)", file=out)
+    else:
+        print("⚠️ 이 문제는 선택지가 없거나 특수 형식입니다 (예: HOTSPOT 문제)", file=out)
+        if q.get('image_path'):
+            print(f"  이미지: {q['image_path']}", file=out)
+    return choices, is_multiple
+
+
+def read_answer(choices, is_multiple, prompt="답: ", read=input):
+    """답 입력 (건너뛰기는 None, 종료는 'q')"""
+    while True:
+        try:
+            raw = read(prompt).strip().upper()
+        except EOFError:
+            return "q"
+        if raw in ("Q", "QUIT"):
+            return "q"
+        if not raw:
+            return None
+        letters = [c for c in re.split(r'[\s,]+', raw) if c]
+        if letters and all(c in choices for c in letters):
+            if is_multiple:
+                return sorted(set(letters))
+            if len(letters) == 1:
+                return letters[0]
+        print(f"  보기에서 선택하세요: {', '.join(sorted(choices))}")
+
+
+def run_practice(data, args, choice_table, rng):
+    """연습 모드: 문제마다 바로 채점"""
+    if args.random:
+        questions = rng.sample(data, min(args.count or len(data), len(data)))
+    else:
+        start = max(0, args.start - 1)
+        questions = data[start:start + args.count] if args.count else data[start:]
+
+    answered = correct = 0
+    wrong_ids = []
+    for number, q in enumerate(questions, 1):
+        choices, is_multiple = show_question(q, number, len(questions), args.lang, choice_table, rng)
+        if not choices:
+            continue
+        answer = read_answer(choices, is_multiple)
+        if answer == "q":
+            break
+        if answer is None:
+            continue
+        answered += 1
+        if grade_answer(q, answer):
+            correct += 1
+            print(f"✅ 정답입니다! {_plain(q.get('answer', ''))}")
+        else:
+            wrong_ids.append(q['id'])
+            print(f"❌ 틀렸습니다. 정답: {_plain(q.get('answer', ''))}")
+
+    print(f"\n연습 결과: {correct} / {answered} 정답")
+    if wrong_ids:
+        print(f"오답 문제: {', '.join(str(i) for i in wrong_ids)}")
+
+
+def run_exam(data, args, choice_table, rng):
+    """시험 모드: 모든 문제를 답한 뒤 채점"""
+    exam_questions = sample_exam(data, args.count or EXAM_SIZE, rng)
+    exam_answers = {}
+    for idx, q in enumerate(exam_questions):
+        choices, is_multiple = show_question(q, idx + 1, len(exam_questions), args.lang, choice_table, rng)
+        if not choices:
+            continue
+        answer = read_answer(choices, is_multiple)
+        if answer == "q":
+            break
+        if answer is not None:
+            exam_answers[str(idx)] = answer
+
+    result = score_exam(exam_questions, exam_answers)
+    print("\n🎯 시험 결과")
+    print(f"정답 수: {result['correct_count']} / {result['total_count']}")
+    print(f"점수: {result['score_percent']:.1f}% (합격 기준: {result['passing_score']}%)")
+    if result['passed']:
+        print(f"🎉 합격입니다! ({result['score_percent']:.1f}%)")
+    else:
+        print(f"❌ 불합격입니다. ({result['score_percent']:.1f}%)")
+    if result['wrong_questions']:
+        print(f"오답 문제: {', '.join(str(q['id']) for q in result['wrong_questions'])}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="터미널에서 AIF-C01 문제를 풉니다.")
+    parser.add_argument('mode', nargs='?', choices=["practice", "exam"], default="practice")
+    parser.add_argument('--bank', help="문제 은행 id (기본값: data/banks.json의 첫 번째 은행)")
+    parser.add_argument('--lang', choices=LANG_MODES, default="한글")
+    parser.add_argument('--start', type=int, default=1, help="연습 모드 시작 문제 번호 (1부터)")
+    parser.add_argument('--count', type=int, help="문제 수 (시험 모드 기본값: 65)")
+    parser.add_argument('--random', action='store_true', help="연습 모드에서 무작위 순서")
+    parser.add_argument('--seed', type=int, help="무작위 선택 시드 (같은 시드면 같은 문제)")
+    args = parser.parse_args()
+
+    config = get_bank_config(args.bank)
+    bank = load_bank(config["questions"], config["choices"], config["snapshot"])
+    rng = random.Random(args.seed)
+    if args.mode == "exam":
+        run_exam(bank["questions"], args, bank["choice_table"], rng)
+    else:
+        run_practice(bank["questions"], args, bank["choice_table"], rng)
+
+
+if __name__ == '__main__':
+    main()
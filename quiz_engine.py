@@ -0,0 +1,224 @@
+"""퀴즈/시험 핵심 로직 (선택지 파싱, 언어 선택, 채점, 합격 판정)
+
+Streamlit에 의존하지 않으므로 앱(app.py), 터미널 퀴즈(quiz_cli.py), 벤치마크에서 같은 로직을 사용합니다.
+"""
+import os
+import random
+import re
+
+EXAM_SIZE = 65
+PASSING_SCORE = 70.0
+LANG_MODES = ("한글", "English", "섞기")
+
+_CHOICE_MARKER = re.compile(r'[•·]\s*([A-E])\.\s+')
+_CHOICE_TAIL = re.compile(r'[•·\s]+$')
+_WHITESPACE = re.compile(r'\s+')
+_MULTIPLE = re.compile(r'\(Choose\s+two\)|\(2개\s*선택\)|\(Choose\s+three\)|\(3개\s*선택\)', re.IGNORECASE)
+_ANSWER_LETTER = re.compile(r'\b([A-E])\b')
+
+
+def parse_choices(question_text):
+    """질문 텍스트에서 선택지(A, B, C, D, E)를 파싱하여 (본문, 선택지) 반환"""
+    if not question_text:
+        return question_text, {}
+
+    text = question_text.replace('\u0000', '').strip()
+
+    if text.upper().startswith('HOTSPOT'):
+        return text, {}
+
+    matches = list(_CHOICE_MARKER.finditer(text))
+    if len(matches) < 2:
+        return text, {}
+
+    choices = {}
+    for i, match in enumerate(matches):
+        end_pos = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        choice_text = _CHOICE_TAIL.sub('', text[match.end():end_pos].strip())
+        if choice_text:
+            choices[match.group(1)] = choice_text
+
+    question_body = _WHITESPACE.sub(' ', text[:matches[0].start()].strip())
+    return question_body, choices
+
+
+def is_multiple_choice(question_text):
+    """질문이 복수 선택인지 확인"""
+    return bool(_MULTIPLE.search(question_text or ''))
+
+
+def is_multiple_question(q):
+    """문제(영어 또는 한글 본문)가 복수 선택인지 확인"""
+    return is_multiple_choice(q.get('question_en', '')) or is_multiple_choice(q.get('question_ko', ''))
+
+
+def choice_mask(selected):
+    """선택한 답(문자 하나 또는 목록)을 비트마스크로 변환 (A=1, B=2, C=4, D=8, E=16, 미응답=0)"""
+    if not selected:
+        return 0
+    letters = [selected] if isinstance(selected, str) else selected
+    mask = 0
+    for letter in letters:
+        if letter in "ABCDE":
+            mask |= 1 << (ord(letter) - ord("A"))
+    return mask
+
+
+def mask_choices(mask):
+    """비트마스크 → 선택한 문자 목록"""
+    return [letter for bit, letter in enumerate("ABCDE") if mask >> bit & 1]
+
+
+def selected_from_mask(mask, is_multiple):
+    """비트마스크를 grade_answer에 넘길 답으로 변환 (단일 선택은 문자 하나, 미응답은 None)"""
+    letters = mask_choices(mask)
+    if not letters:
+        return None
+    return letters if is_multiple else letters[0]
+
+
+def extract_correct_answers(answer_text):
+    """정답 텍스트에서 정답 문자들 추출 (복수 선택 지원)"""
+    if not answer_text:
+        return None
+    matches = _ANSWER_LETTER.findall(answer_text)
+    return matches if matches else None
+
+
+def build_render_model(q):
+    """문제 화면에 필요한 파싱 결과와 이미지 바이트 준비"""
+    question_en = q.get('question_en', '')
+    question_ko = q.get('question_ko', '')
+    model = {
+        "en": parse_choices(question_en),
+        "ko": parse_choices(question_ko),
+        "is_multiple": is_multiple_question(q),
+        "image_bytes": None,
+    }
+    # 전처리된 변형이 없는 이미지만 서버에서 읽음 (변형은 정적 파일로 제공)
+    image_path = q.get('image_path')
+    if not q.get('image') and image_path and os.path.exists(image_path):
+        with open(image_path, "rb") as f:
+            model["image_bytes"] = f.read()
+    return model
+
+
+def get_choices_for_language(question_en, question_ko, lang_mode, use_random_mix=False, q_data=None,
+                             choice_table=None, render_model=None, rng=random):
+    """언어 모드에 따라 질문 본문과 선택지를 반환"""
+    if render_model is not None:
+        # 미리 불러온 파싱 결과 사용
+        en_body, en_choices = render_model["en"]
+        ko_body, ko_choices = render_model["ko"]
+    else:
+        # 영어 질문에서 선택지 파싱
+        en_body, en_choices = parse_choices(question_en)
+
+        # 한글 질문에서 선택지 파싱 (대부분 한글 질문에는 선택지가 없음)
+        ko_body, ko_choices = parse_choices(question_ko)
+
+    # choices_ko 필드에서 한글 선택지 가져오기
+    ko_choices_from_data = q_data.get('choices_ko', {}) if q_data else {}
+
+    # 선택지 테이블이 있으면 id로 선택지와 번역을 바로 조회
+    choice_ids = q_data.get('choice_ids') if q_data else None
+    if choice_table is not None and choice_ids:
+        en_choices, table_ko = choice_table.resolve(choice_ids)
+        if not ko_choices_from_data and len(table_ko) == len(en_choices):
+            ko_choices_from_data = table_ko
+
+    if lang_mode == "한글":
+        # 한글 질문 본문 사용
+        body = ko_body if ko_body else en_body
+        # 한글 선택지 우선 사용 (choices_ko 필드 또는 파싱된 한글 선택지), 없으면 영어 선택지
+        if ko_choices_from_data:
+            choices = ko_choices_from_data
+        elif ko_choices:
+            choices = ko_choices
+        else:
+            choices = en_choices
+        return body, choices
+    elif lang_mode in ("영어", "English"):
+        # 영어로만 표시
+        return en_body, en_choices
+    else:  # "섞기"
+        # 랜덤으로 언어 선택
+        use_korean = rng.choice([True, False]) if use_random_mix else False
+        if use_korean and ko_body:
+            body = ko_body
+            choices = ko_choices_from_data if ko_choices_from_data else (ko_choices if ko_choices else en_choices)
+        else:
+            body = en_body
+            choices = en_choices
+        return body, choices
+
+
+def present_question(q, lang_mode, choice_table=None, render_model=None, rng=random):
+    """화면에 표시할 (본문, 선택지, 복수 선택 여부) 반환 (선택지가 없으면 영어에서 다시 파싱)"""
+    if render_model is None:
+        render_model = build_render_model(q)
+    question_en = q.get('question_en', '')
+    body, choices = get_choices_for_language(question_en, q.get('question_ko', ''), lang_mode,
+                                             lang_mode == "섞기", q, choice_table, render_model, rng)
+    if not choices:
+        _, choices = render_model["en"]
+    return body, choices, render_model["is_multiple"]
+
+
+def grade_answer(q, selected):
+    """선택한 답(문자 하나 또는 문자 목록)이 정답인지 확인"""
+    if not selected:
+        return False
+    correct_answers = extract_correct_answers(q.get('answer', ''))
+    if not correct_answers:
+        return False
+    if isinstance(selected, str):
+        # 단일 선택: 첫 번째 정답 문자와 비교
+        return selected == correct_answers[0]
+    return sorted(selected) == sorted(correct_answers)
+
+
+def sample_exam_indexes(data, size=EXAM_SIZE, rng=random):
+    """실제 시험 형식으로 출제할 문제의 위치를 무작위 선택 (중복 묶음에서는 한 문제만 출제)"""
+    groups = {}
+    for idx, q in enumerate(data):
+        groups.setdefault(q.get('canonical_id', q['id']), []).append(idx)
+    if len(groups) == len(data):
+        return rng.sample(range(len(data)), min(size, len(data)))
+    keys = rng.sample(list(groups), min(size, len(groups)))
+    return [rng.choice(groups[key]) for key in keys]
+
+
+def sample_exam(data, size=EXAM_SIZE, rng=random):
+    """실제 시험 형식으로 문제를 무작위 선택"""
+    return [data[idx] for idx in sample_exam_indexes(data, size, rng)]
+
+
+def score_exam(exam_questions, exam_answers, passing_score=PASSING_SCORE):
+    """시험 채점
+
+    exam_answers: {"문제 순번(str)": 선택한 답} (답을 선택하지 않은 문제는 오답)
+    반환값: {"correct_count", "total_count", "score_percent", "passing_score", "passed",
+             "wrong_questions", "wrong_indexes"(틀린 문제의 순번)}
+    """
+    correct_count = 0
+    wrong_questions = []
+    wrong_indexes = []
+    for idx, exam_q in enumerate(exam_questions):
+        if grade_answer(exam_q, exam_answers.get(str(idx))):
+            correct_count += 1
+        else:
+            wrong_questions.append(exam_q)
+            wrong_indexes.append(idx)
+
+    total_count = len(exam_questions)
+    score_percent = (correct_count / total_count * 100) if total_count > 0 else 0
+    return {
+        "correct_count": correct_count,
+        "total_count": total_count,
+        "score_percent": score_percent,
+        "passing_score": passing_score,
+        "passed": score_percent >= passing_score,
+        "wrong_questions": wrong_questions,
+        "wrong_indexes": wrong_indexes,
+    }
@@ -0,0 +1,212 @@
+"""퀴즈 화면 상태 전이 (연습 → 시험 → 시험 결과)
+
+Streamlit 세션 상태(또는 dict)를 받아 화면 이동과 시험 시작/완료를 처리합니다.
+app.py에서는 버튼의 on_click 콜백으로 dispatch()를 호출하므로 클릭 한 번에 스크립트가 한 번만 실행됩니다.
+현재 단계에서 허용되지 않는 이벤트(이미 바뀐 화면의 버튼을 다시 누른 경우 등)는 무시됩니다.
+
+세션에는 문제 객체 대신 공유 문제 은행의 위치(정수 배열)와 답 비트마스크만 저장합니다.
+    exam_indexes: 시험 문제의 은행 내 위치 array('I')
+    exam_answers: 시험 순번별 선택한 답 비트마스크 array('B') (0 = 미응답)
+    exam_latency: 시험 순번별 응답 시간 ms array('I')
+    wrong_indexes: 오답 노트 문제의 은행 내 위치 array('I') (추가한 순서)
+    exam_adaptive: 적응형 시험 여부 (문제를 하나씩 골라 exam_extend로 추가, irt.py)
+"""
+import sys
+from array import array
+
+from quiz_engine import is_multiple_question, score_exam, selected_from_mask
+
+PRACTICE = "practice"
+EXAM = "exam"
+EXAM_RESULT = "exam_result"
+
+TRANSITIONS = {
+    PRACTICE: {"next", "prev", "goto", "retry", "start_exam"},
+    EXAM: {"exam_goto", "exam_extend", "finish_exam", "stop_exam"},
+    EXAM_RESULT: {"new_exam", "stop_exam"},
+}
+
+
+def phase(state):
+    """현재 단계"""
+    if not state.get("exam_mode"):
+        return PRACTICE
+    return EXAM_RESULT if state.get("exam_finished") else EXAM
+
+
+def clear_selection(state):
+    state["show_answer"] = False
+    state["selected_answer"] = None
+    state["selected_answers"] = []
+
+
+def _clear_exam(state):
+    state["exam_indexes"] = array("I")
+    state["exam_answers"] = array("B")
+    state["exam_latency"] = array("I")
+    state["exam_current_index"] = 0
+    state["exam_result"] = None
+    state["exam_adaptive"] = False
+
+
+def reset(state):
+    """진행 상태, 오답 노트, 시험 상태 초기화"""
+    state["current_index"] = 0
+    state["wrong_indexes"] = array("I")
+    state["last_index"] = -1
+    state["exam_mode"] = False
+    state["exam_finished"] = False
+    clear_selection(state)
+    _clear_exam(state)
+
+
+def add_wrong(state, position):
+    """오답 노트에 문제 추가 (이미 있으면 False)"""
+    if position in state["wrong_indexes"]:
+        return False
+    state["wrong_indexes"].append(position)
+    return True
+
+
+def exam_selection(state, questions, idx):
+    """시험 순번 idx에서 선택한 답 (grade_answer 형식, 미응답은 None)"""
+    q = questions[state["exam_indexes"][idx]]
+    return selected_from_mask(state["exam_answers"][idx], is_multiple_question(q))
+
+
+def rebase(state, old_questions, new_questions):
+    """문제 은행이 새 버전으로 바뀌었을 때 세션의 위치를 문제 id 기준으로 옮김 (새 버전에 없는 문제는 제외)"""
+    new_positions = {q["id"]: i for i, q in enumerate(new_questions)}
+
+    def moved(position):
+        return new_positions.get(old_questions[position]["id"]) if position < len(old_questions) else None
+
+    current = moved(state["current_index"])
+    if current is None:
+        current = min(state["current_index"], len(new_questions) - 1)
+        if not state["exam_mode"]:
+            clear_selection(state)
+            state["last_index"] = -1
+    state["current_index"] = current
+    state["wrong_indexes"] = array("I", (p for p in map(moved, state["wrong_indexes"]) if p is not None))
+
+    kept = [(idx, p) for idx, p in enumerate(map(moved, state["exam_indexes"])) if p is not None]
+    if len(kept) < len(state["exam_indexes"]):
+        exam_index = state["exam_current_index"]
+        state["exam_answers"] = array("B", (state["exam_answers"][idx] for idx, _ in kept))
+        state["exam_latency"] = array("I", (state["exam_latency"][idx] for idx, _ in kept))
+        state["exam_current_index"] = min(sum(idx < exam_index for idx, _ in kept), max(len(kept) - 1, 0))
+        if state["exam_mode"]:
+            clear_selection(state)
+            state["last_index"] = -1
+    state["exam_indexes"] = array("I", (p for _, p in kept))
+    if state["exam_mode"] and not kept:
+        _new_exam(state)
+
+
+def _move_practice(state, step, total):
+    state["current_index"] = (state["current_index"] + step) % total
+    clear_selection(state)
+
+
+def _goto_practice(state, position, total):
+    """연습 모드에서 은행 내 위치로 이동 (관련 문제 등)"""
+    if not 0 <= position < total:
+        return
+    state["current_index"] = position
+    clear_selection(state)
+
+
+def _start_exam(state, exam_indexes, exam_id, adaptive=False):
+    state["exam_indexes"] = array("I", exam_indexes)
+    state["exam_current_index"] = 0
+    state["exam_answers"] = array("B", bytes(len(exam_indexes)))
+    state["exam_latency"] = array("I", bytes(4 * len(exam_indexes)))
+    state["exam_id"] = exam_id
+    state["exam_adaptive"] = adaptive
+    state["exam_result"] = None
+    state["exam_finished"] = False
+    state["exam_mode"] = True
+    clear_selection(state)
+
+
+def _goto_exam(state, index):
+    if not 0 <= index < len(state["exam_indexes"]):
+        return
+    state["exam_current_index"] = index
+    clear_selection(state)
+
+
+def _extend_exam(state, position):
+    """적응형 시험: 다음 문제를 추가하고 그 문제로 이동"""
+    state["exam_indexes"].append(position)
+    state["exam_answers"].append(0)
+    state["exam_latency"].append(0)
+    state["exam_current_index"] = len(state["exam_indexes"]) - 1
+    clear_selection(state)
+
+
+def _finish_exam(state, questions):
+    """채점 결과 저장, 오답을 오답 노트에 추가하고 채점 결과 반환"""
+    exam_questions = [questions[position] for position in state["exam_indexes"]]
+    answers = {str(idx): exam_selection(state, questions, idx) for idx in range(len(exam_questions))}
+    result = score_exam(exam_questions, answers)
+    added = sum(add_wrong(state, state["exam_indexes"][idx]) for idx in result["wrong_indexes"])
+    state["exam_result"] = {key: value for key, value in result.items() if key not in ("wrong_questions", "wrong_indexes")}
+    state["exam_result"]["added_wrong"] = added
+    state["exam_finished"] = True
+    return result
+
+
+def _stop_exam(state):
+    state["exam_mode"] = False
+    state["exam_finished"] = True
+
+
+def _new_exam(state):
+    state["exam_mode"] = False
+    state["exam_finished"] = False
+    _clear_exam(state)
+
+
+_HANDLERS = {
+    "next": lambda state, total: _move_practice(state, 1, total),
+    "prev": lambda state, total: _move_practice(state, -1, total),
+    "goto": _goto_practice,
+    "retry": lambda state: clear_selection(state),
+    "start_exam": _start_exam,
+    "exam_goto": _goto_exam,
+    "exam_extend": _extend_exam,
+    "finish_exam": _finish_exam,
+    "stop_exam": _stop_exam,
+    "new_exam": _new_exam,
+}
+
+
+def dispatch(state, event, *args):
+    """이벤트 처리 (허용되지 않은 이벤트면 None, 처리했으면 핸들러 반환값 또는 True)"""
+    if event not in TRANSITIONS[phase(state)]:
+        return None
+    result = _HANDLERS[event](state, *args)
+    return True if result is None else result
+
+
+def _deep_size(value, seen):
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in value)
+    elif hasattr(value, "__slots__") and not isinstance(value, array):
+        size += sum(_deep_size(getattr(value, name), seen) for name in value.__slots__ if hasattr(value, name))
+    return size
+
+
+def session_footprint(state):
+    """세션 상태 값이 차지하는 바이트 수 {키: 바이트} (참조하는 객체까지 포함, 큰 순서)"""
+    seen = set()
+    sizes = {str(key): _deep_size(state[key], seen) for key in list(state.keys())}
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""관련 문제 그래프 (TF-IDF 코사인 유사도 상위 k개 이웃을 미리 계산)
+
+문제 본문(question_en, 선택지 포함)과 정답 해설(answer)로 TF-IDF 벡터를 만들고,
+문제마다 유사도가 높은 문제 k개를 찾아 문제 은행 스냅샷에 함께 저장합니다 (snapshot.py).
+앱은 문제 위치로 이웃 목록을 바로 꺼내므로 실행 중에는 유사도를 계산하지 않습니다.
+
+계산은 NumPy만 사용합니다. 문제 묶음마다 그 문제들의 단어 → 같은 단어가 나오는 문제(역색인)로 펼쳐
+곱을 np.bincount로 더하므로, 문제 × 단어 행렬이나 전체 문제 쌍 행렬을 만들지 않습니다.
+역색인이 긴 흔한 단어(문서 빈도 상위 DENSE_TERMS개)만 문제 × 단어 밀집 행렬로 두고 행렬 곱으로 더합니다.
+같은 중복 묶음(canonical_id)의 문제는 관련 문제에서 제외합니다.
+
+    python similarity.py --questions data/questions.json --show 1
+"""
+import argparse
+import re
+from array import array
+from dataclasses import dataclass
+
+DEFAULT_K = 5
+MIN_SCORE = 0.1
+MAX_DF = 0.5  # 절반 이상의 문제에 나오는 단어는 변별력이 없으므로 제외
+DENSE_TERMS = 256  # 역색인 대신 밀집 행렬 곱으로 계산할 흔한 단어 수
+
+_TOKEN = re.compile(r"[0-9a-z]+|[가-힣]+")
+_STOPWORDS = frozenset(
+    "a an the of to in on for and or is are be by with which what that this as from at it its use using "
+    "company wants needs solution meets requirements will can should most".split()
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RelatedGraph:
+    """문제 위치별 관련 문제 k개 (위치와 유사도를 평탄한 배열로 보관, 빈 칸은 -1)"""
+    k: int
+    neighbors: array  # array('i'), 길이 문제 수 × k
+    scores: array     # array('f'), 같은 길이
+
+    def related(self, position):
+        """[(관련 문제 위치, 유사도), ...] (유사도 높은 순)"""
+        start = position * self.k
+        if start < 0 or start >= len(self.neighbors):
+            return []
+        return [(self.neighbors[i], self.scores[i]) for i in range(start, start + self.k) if self.neighbors[i] >= 0]
+
+
+def question_text(q):
+    """유사도 계산에 쓰는 텍스트 (본문과 선택지, 정답 해설)"""
+    return f"{q.get('question_en', '')} {q.get('answer', '')}"
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall((text or "").casefold()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def tfidf(texts, max_df=MAX_DF):
+    """희소 TF-IDF 행렬 (문제 번호, 단어 번호, 가중치) - 문제별 L2 정규화, 문제 번호 순"""
+    import numpy as np
+
+    vocab = {}
+    docs, terms = [], []
+    for doc, text in enumerate(texts):
+        for token in tokenize(text):
+            docs.append(doc)
+            terms.append(vocab.setdefault(token, len(vocab)))
+    n = len(texts)
+    if not docs:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    pairs, tf = np.unique(np.array(docs, dtype=np.int64) * len(vocab) + np.array(terms, dtype=np.int64),
+                          return_counts=True)
+    doc, term = np.divmod(pairs, len(vocab))
+    df = np.bincount(term, minlength=len(vocab))
+    # 한 문제에만 나오는 단어는 이웃을 만들지 않고, 너무 흔한 단어는 변별력이 없음
+    keep = (df[term] >= 2) & (df[term] <= max(2, max_df * n))
+    doc, term, tf = doc[keep], term[keep], tf[keep]
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weight = (1 + np.log(tf)) * idf[term]
+    norm = np.sqrt(np.bincount(doc, weight * weight, minlength=n))
+    return doc, term, weight / norm[doc]
+
+
+def top_k_neighbors(doc, term, weight, n, k=DEFAULT_K, groups=None, min_score=MIN_SCORE, max_cells=1 << 22):
+    """문제별 코사인 유사도 상위 k개 (위치 배열 n×k, 유사도 배열 n×k, 빈 칸은 -1/0)"""
+    import numpy as np
+
+    neighbors = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    kk = min(k, n - 1)
+    if kk <= 0 or len(doc) == 0:
+        return neighbors, scores
+    groups = np.arange(n) if groups is None else np.asarray(groups)
+    # 흔한 단어는 밀집 행렬 (문제 × 단어), 나머지는 역색인
+    df = np.bincount(term)
+    frequent = np.argsort(-df, kind="stable")[:DENSE_TERMS]
+    frequent = frequent[df[frequent] > max(2, n // 256)]
+    column = np.full(len(df), -1)
+    column[frequent] = np.arange(len(frequent))
+    is_dense = column[term] >= 0
+    dense = np.zeros((n, len(frequent)), dtype=np.float32)
+    dense[doc[is_dense], column[term[is_dense]]] = weight[is_dense]
+    doc, term, weight = doc[~is_dense], term[~is_dense], weight[~is_dense]
+
+    # 역색인: 단어 번호 순으로 (문제, 가중치)
+    by_term = np.argsort(term, kind="stable")
+    post_doc, post_weight = doc[by_term], weight[by_term]
+    starts = np.searchsorted(term[by_term], np.arange(len(df) + 1))
+    doc_starts = np.searchsorted(doc, np.arange(n + 1))
+
+    block = max(1, min(n, max_cells // n))
+    for lo in range(0, n, block):
+        hi = min(n, lo + block)
+        e = slice(doc_starts[lo], doc_starts[hi])
+        q_doc, q_term, q_weight = doc[e], term[e], weight[e]
+        lengths = starts[q_term + 1] - starts[q_term]
+        # 블록 문제의 단어마다 그 단어의 역색인 구간을 펼침
+        offsets = np.repeat(starts[q_term] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        rows = np.repeat(q_doc - lo, lengths)
+        # 펼친 구간이 비면 bincount가 정수 배열을 돌려주므로 실수형으로 고정
+        sim = np.bincount(rows * n + post_doc[offsets], np.repeat(q_weight, lengths) * post_weight[offsets],
+                          minlength=(hi - lo) * n).astype(np.float64, copy=False).reshape(hi - lo, n)
+        if len(frequent):
+            sim += dense[lo:hi] @ dense.T
+        sim[groups[lo:hi, None] == groups[None, :]] = 0  # 자기 자신과 같은 중복 묶음 제외
+        top = np.argpartition(-sim, kk - 1, axis=1)[:, :kk]
+        top_scores = np.take_along_axis(sim, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        top[top_scores < min_score] = -1
+        neighbors[lo:hi, :kk] = top
+        scores[lo:hi, :kk] = np.where(top >= 0, top_scores, 0)
+    return neighbors, scores
+
+
+def build_related(questions, k=DEFAULT_K, min_score=MIN_SCORE):
+    """문제 목록의 관련 문제 그래프 (문제 은행 위치 기준)"""
+    doc, term, weight = tfidf([question_text(q) for q in questions])
+    group_ids = {}
+    groups = [group_ids.setdefault(q.get("canonical_id", q["id"]), len(group_ids)) for q in questions]
+    neighbors, scores = top_k_neighbors(doc, term, weight, len(questions), k, groups, min_score)
+    return RelatedGraph(k, array("i", neighbors.ravel().tolist()), array("f", scores.ravel().tolist()))
+
+
+def main():
+    from question_model import DEFAULT_QUESTIONS_PATH, load_questions
+    import time
+
+    parser = argparse.ArgumentParser(description="관련 문제 그래프를 만들고 특정 문제의 관련 문제를 출력합니다.")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_PATH)
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument("--show", nargs="*", default=[], help="관련 문제를 출력할 문제 id")
+    args = parser.parse_args()
+
+    questions = load_questions(args.questions)
+    start = time.perf_counter()
+    graph = build_related(questions, k=args.k)
+    elapsed = time.perf_counter() - start
+    edges = sum(1 for p in graph.neighbors if p >= 0)
+    print(f"✅ 관련 문제 그래프: 문제 {len(questions):,}개, 연결 {edges:,}개 ({elapsed:.2f}초)")
+    positions = {q["id"]: i for i, q in enumerate(questions)}
+    for question_id in args.show:
+        if question_id not in positions:
+            print(f"⚠️ 없는 문제 id: {question_id}")
+            continue
+        print(f"▶️ {question_id}: {questions[positions[question_id]]['question_en'][:80]}")
+        for position, score in graph.related(positions[question_id]):
+            print(f"    {score:.2f}  {questions[position]['id']}: {questions[position]['question_en'][:70]}")
+
+
+if __name__ == "__main__":
+    main()
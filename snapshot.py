@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""가공된 문제 은행 스냅샷 (앱 시작 시 JSON 파싱 없이 한 번의 읽기로 로드)
+
+스냅샷 파일 구조: 헤더 JSON 한 줄 + pickle 본문
+스냅샷에는 문제, 선택지 테이블과 함께 미리 계산한 관련 문제 그래프(similarity.py)가 들어갑니다.
+헤더에는 스냅샷 형식 버전과 원본 파일(questions.json, choices.json)의 크기/수정 시각이 기록되며,
+원본이 바뀌었으면 스냅샷을 무시하고 JSON에서 다시 로드합니다.
+스냅샷은 이 도구가 직접 만든 로컬 파일만 읽습니다 (pickle이므로 외부 파일을 넣지 마세요).
+
+게시(publish): 실행 중인 앱에 새 문제 은행을 넘길 때는 릴리스 디렉터리를 씁니다.
+    <releases>/<버전>/questions.json, choices.json, questions.snapshot.pkl  (게시 후 수정하지 않음)
+    <releases>/CURRENT                                                    (현재 버전 이름 한 줄)
+버전 디렉터리는 임시 디렉터리에 모두 쓴 뒤 rename하고, 마지막에 CURRENT를 rename으로 교체하므로
+앱은 반쯤 쓰인 파일을 읽지 않습니다. 앱은 CURRENT 파일 하나만 stat해서 새 버전을 감지합니다 (bank_registry.py).
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+from choice_table import DEFAULT_TABLE_PATH, ChoiceTable
+from question_model import load_questions
+from similarity import build_related
+
+SNAPSHOT_FORMAT = 3  # 2: 문제를 Question 레코드로 저장, 3: 관련 문제 그래프 포함
+DEFAULT_QUESTIONS_PATH = "data/questions.json"
+DEFAULT_SNAPSHOT_PATH = "data/questions.snapshot.pkl"
+DEFAULT_RELEASES_DIR = "data/releases"
+POINTER_NAME = "CURRENT"
+KEEP_RELEASES = 3  # CURRENT 외에 남겨 둘 이전 버전 수 (이전 버전을 쓰던 프로세스의 내보내기용)
+
+
+def _source_signature(paths):
+    """원본 파일들의 (경로, 크기, 수정 시각) 목록 (파일이 없으면 None)"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append([path, stat.st_size, stat.st_mtime_ns])
+        except FileNotFoundError:
+            signature.append([path, None, None])
+    return signature
+
+
+def _related_graph(questions):
+    """관련 문제 그래프 (NumPy가 없으면 None)"""
+    try:
+        return build_related(questions)
+    except ImportError:
+        print("⚠️ NumPy가 없어 관련 문제 그래프를 만들지 않습니다.")
+        return None
+
+
+def _load_from_json(questions_path, table_path):
+    questions = load_questions(questions_path)
+    return {"questions": questions, "choice_table": ChoiceTable.load(table_path), "related": _related_graph(questions)}
+
+
+def build_snapshot(questions_path=DEFAULT_QUESTIONS_PATH, table_path=DEFAULT_TABLE_PATH,
+                   snapshot_path=DEFAULT_SNAPSHOT_PATH, bank=None):
+    """원본 JSON으로부터 스냅샷 파일 생성 (임시 파일 + rename)"""
+    signature = _source_signature([questions_path, table_path])
+    if bank is None:
+        bank = _load_from_json(questions_path, table_path)
+    header = {"format": SNAPSHOT_FORMAT, "sources": signature, "created": time.time(),
+              "questions": len(bank["questions"])}
+    body = pickle.dumps(bank, protocol=pickle.HIGHEST_PROTOCOL)
+
+    directory = os.path.dirname(snapshot_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".pkl", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(body)
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return snapshot_path
+
+
+def read_snapshot(snapshot_path=DEFAULT_SNAPSHOT_PATH, sources=None):
+    """스냅샷 로드 (형식 버전이나 원본 시그니처가 다르면 None)"""
+    try:
+        with open(snapshot_path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    newline = raw.find(b"\n")
+    if newline < 0:
+        return None
+    try:
+        header = json.loads(raw[:newline])
+    except ValueError:
+        return None
+    if header.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if sources is not None and header.get("sources") != _source_signature(sources):
+        return None
+    return pickle.loads(memoryview(raw)[newline + 1:])
+
+
+def load_bank(questions_path=DEFAULT_QUESTIONS_PATH, table_path=DEFAULT_TABLE_PATH,
+              snapshot_path=DEFAULT_SNAPSHOT_PATH, write_snapshot=True):
+    """문제 은행 로드: 최신 스냅샷이 있으면 스냅샷에서, 없으면 JSON에서 로드 후 스냅샷 생성
+
+    반환값: {"questions": [Question, ...], "choice_table": ChoiceTable 또는 None,
+             "related": similarity.RelatedGraph 또는 None}
+    """
+    bank = read_snapshot(snapshot_path, sources=[questions_path, table_path])
+    if bank is not None:
+        return bank
+    bank = _load_from_json(questions_path, table_path)
+    if write_snapshot:
+        try:
+            build_snapshot(questions_path, table_path, snapshot_path, bank=bank)
+        except OSError as e:
+            print(f"스냅샷 저장 실패: {e}")
+    return bank
+
+
+def release_paths(release_dir):
+    """릴리스 디렉터리 안의 파일 경로 {"questions", "choices", "snapshot"}"""
+    return {
+        "questions": os.path.join(release_dir, "questions.json"),
+        "choices": os.path.join(release_dir, "choices.json"),
+        "snapshot": os.path.join(release_dir, "questions.snapshot.pkl"),
+    }
+
+
+def pointer_signature(releases_dir=DEFAULT_RELEASES_DIR):
+    """CURRENT 파일의 (inode, 크기, 수정 시각) - 게시할 때마다 바뀜 (게시된 적이 없으면 None)"""
+    try:
+        stat = os.stat(os.path.join(releases_dir, POINTER_NAME))
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def current_release(releases_dir=DEFAULT_RELEASES_DIR):
+    """CURRENT가 가리키는 버전 이름 (게시된 적이 없으면 None)"""
+    try:
+        with open(os.path.join(releases_dir, POINTER_NAME), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def _content_digest(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _fsync_file(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _write_pointer(releases_dir, version):
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=releases_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(releases_dir, POINTER_NAME))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _prune_releases(releases_dir, current, keep):
+    versions = sorted(name for name in os.listdir(releases_dir)
+                      if not name.startswith(".") and os.path.isdir(os.path.join(releases_dir, name)))
+    old = [v for v in versions if v != current]
+    for version in old[:max(len(old) - keep, 0)]:
+        shutil.rmtree(os.path.join(releases_dir, version), ignore_errors=True)
+
+
+def publish_release(questions_path=DEFAULT_QUESTIONS_PATH, table_path=DEFAULT_TABLE_PATH,
+                    releases_dir=DEFAULT_RELEASES_DIR, keep=KEEP_RELEASES):
+    """현재 JSON을 새 버전 디렉터리로 게시하고 CURRENT를 교체, (버전 이름, 새로 게시했는지) 반환
+
+    내용이 현재 버전과 같으면 아무것도 하지 않습니다.
+    """
+    os.makedirs(releases_dir, exist_ok=True)
+    digest = _content_digest([questions_path, table_path])
+    current = current_release(releases_dir)
+    if current is not None and current.endswith(f"-{digest}"):
+        return current, False
+
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{digest}"
+    release_dir = os.path.join(releases_dir, version)
+    if not os.path.isdir(release_dir):
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=releases_dir)
+        try:
+            paths = release_paths(tmp_dir)
+            shutil.copyfile(questions_path, paths["questions"])
+            shutil.copyfile(table_path, paths["choices"])
+            build_snapshot(paths["questions"], paths["choices"], paths["snapshot"])
+            for path in paths.values():
+                _fsync_file(path)
+            os.rename(tmp_dir, release_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    _write_pointer(releases_dir, version)
+    _prune_releases(releases_dir, version, keep)
+    return version, True
+
+
+def load_release(releases_dir=DEFAULT_RELEASES_DIR, version=None):
+    """게시된 버전 로드 (version을 생략하면 CURRENT, 게시된 적이 없으면 None)
+
+    반환값: {"questions", "choice_table", "version", "paths": release_paths()}
+    """
+    version = version or current_release(releases_dir)
+    if version is None:
+        return None
+    paths = release_paths(os.path.join(releases_dir, version))
+    # 릴리스 파일은 바뀌지 않으므로 원본 시그니처를 확인하지 않음
+    bank = read_snapshot(paths["snapshot"])
+    if bank is None:
+        bank = _load_from_json(paths["questions"], paths["choices"])
+    return {**bank, "version": version, "paths": paths}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="questions.json과 choices.json으로 스냅샷을 만듭니다.")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_PATH)
+    parser.add_argument("--choices", default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_PATH)
+    parser.add_argument("--publish", metavar="RELEASES_DIR", help="스냅샷 대신 새 버전 디렉터리로 게시하고 CURRENT 교체")
+    parser.add_argument("--keep", type=int, default=KEEP_RELEASES, help="남겨 둘 이전 버전 수")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    if args.publish:
+        version, published = publish_release(args.questions, args.choices, args.publish, keep=args.keep)
+        if published:
+            print(f"✅ 게시 완료: {os.path.join(args.publish, version)} ({time.perf_counter() - start:.2f}초)")
+        else:
+            print(f"⏭️ 현재 버전과 내용이 같아 게시 생략: {version}")
+        raise SystemExit(0)
+    path = build_snapshot(args.questions, args.choices, args.snapshot)
+    print(f"✅ 스냅샷 생성 완료: {path} ({time.perf_counter() - start:.2f}초)")
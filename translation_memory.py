@@ -0,0 +1,233 @@
+"""선택지 번역 메모리 (정규화 후 정확 일치만 재사용, 근사 일치는 트라이그램 + 편집 거리로 찾은 제안만 제공)"""
+import json
+import re
+from collections import Counter
+
+# PDF 추출 과정에서 깨진 문자 → 원래 문자
+GLYPH_MAP = {
+    '㐴': "'", '㑄': "'", '’': "'", '‘': "'",
+    '㑃': '"', '“': '"', '”': '"',
+    '㏇': '_', '㚠': '%', '\u0000': '',
+}
+
+_GLYPH_RE = re.compile('|'.join(re.escape(g) for g in GLYPH_MAP))
+# 선택지 끝의 숫자 (페이지 번호일 수도, "Level 2"처럼 선택지의 일부일 수도 있음)
+_TRAILING_PAGE_RE = re.compile(r'\s+\d{1,3}$')
+_SPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r"[\w']+")
+
+# 근사 일치에서 이 단어가 서로 다르면 뜻이 반대일 수 있으므로 제안하지 않음
+NEGATIONS = frozenset({
+    'not', 'no', 'never', 'none', 'without', 'cannot', "can't", "don't", "doesn't", "isn't",
+    "aren't", "won't", "shouldn't", 'neither', 'nor', 'only', 'except',
+})
+ANTONYMS = frozenset(frozenset(pair) for pair in [
+    ('increase', 'decrease'), ('increases', 'decreases'), ('increasing', 'decreasing'),
+    ('higher', 'lower'), ('high', 'low'), ('more', 'less'), ('most', 'least'),
+    ('maximum', 'minimum'), ('max', 'min'), ('maximize', 'minimize'),
+    ('larger', 'smaller'), ('large', 'small'), ('faster', 'slower'),
+    ('enable', 'disable'), ('enabled', 'disabled'), ('allow', 'deny'), ('add', 'remove'),
+    ('before', 'after'), ('beginning', 'end'), ('start', 'stop'), ('first', 'last'),
+    ('true', 'false'), ('correct', 'incorrect'), ('positive', 'negative'),
+    ('overfitting', 'underfitting'), ('input', 'output'), ('public', 'private'),
+    ('online', 'offline'), ('real-time', 'batch'), ('synchronous', 'asynchronous'),
+])
+# "supervised"/"unsupervised"처럼 부정 접두사만 다른 단어
+_NEGATING_PREFIXES = ('un', 'in', 'im', 'ir', 'non', 'non-', 'dis')
+
+
+def normalize_choice(text, strip_page=False):
+    """선택지 텍스트를 조회용 키로 정규화
+
+    끝의 숫자는 "Level 2"처럼 선택지의 일부일 수 있어 기본적으로 남깁니다 (확실한 페이지 번호는
+    data_parser가 PDF 페이지 끝에서 제거). strip_page=True이면 제거한 키를 반환하며 제안에만 씁니다.
+    """
+    if not text:
+        return ""
+    text = _GLYPH_RE.sub(lambda m: GLYPH_MAP[m.group(0)], text)
+    text = _SPACE_RE.sub(' ', text).strip()
+    if strip_page:
+        text = _TRAILING_PAGE_RE.sub('', text)
+    text = text.rstrip(' .•·')
+    return text.casefold()
+
+
+def _is_negated_pair(a, b):
+    for prefix in _NEGATING_PREFIXES:
+        if a == prefix + b or b == prefix + a:
+            return True
+    return False
+
+
+def meaning_may_differ(key, candidate):
+    """두 정규화된 선택지의 서로 다른 단어에 숫자, 부정어, 반의어가 있는지 확인"""
+    words, other = set(_WORD_RE.findall(key)), set(_WORD_RE.findall(candidate))
+    only_key, only_candidate = words - other, other - words
+    differing = only_key | only_candidate
+    if any(any(c.isdigit() for c in word) for word in differing):
+        return True
+    if differing & NEGATIONS:
+        return True
+    for a in only_key:
+        for b in only_candidate:
+            if frozenset((a, b)) in ANTONYMS or _is_negated_pair(a, b):
+                return True
+    return False
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _bounded_levenshtein(a, b, max_dist):
+    """편집 거리 계산 (대각선 밴드만 계산, max_dist 초과가 확정되면 max_dist + 1 반환)"""
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    if len(a) < len(b):
+        a, b = b, a
+    len_b = len(b)
+    over = max_dist + 1
+    previous = list(range(len_b + 1))
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        lo = max(1, i - max_dist)
+        hi = min(len_b, i + max_dist)
+        current = [over] * (len_b + 1)
+        if lo == 1:
+            current[0] = i
+        row_min = current[0] if lo == 1 else over
+        for j in range(lo, hi + 1):
+            value = previous[j - 1] if ca == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_dist:
+            return over
+        previous = current
+    return min(previous[len_b], over)
+
+
+class TranslationMemory:
+    """번역 사전에 대한 정확 일치/근사 일치 검색 인덱스
+
+    lookup()은 공백, 깨진 문자, 끝 문장부호만 다른 항목의 (번역, 원문 키, 1.0) 튜플을 반환하며,
+    그대로 재사용해도 되는 결과만 돌려줍니다. suggest()는 편집 거리 기반 유사도(0~1)가 가장 높은
+    근사 일치를 (번역, 원문 키, 신뢰도)로 반환하는 제안이며, 서로 다른 단어에 숫자, 부정어, 반의어가
+    있는 후보는 제외합니다 (끝의 숫자만 다른 항목은 페이지 번호일 수 있어 제안으로만 반환).
+    일치 항목이 없으면 둘 다 None을 반환합니다.
+    """
+
+    def __init__(self, translations, min_confidence=0.85, max_candidates=8):
+        self.min_confidence = min_confidence
+        self.max_candidates = max_candidates
+        self._keys = []          # 정규화된 키
+        self._sources = []       # 원문 키
+        self._translations = []  # 번역
+        self._exact = {}         # 정규화된 키 → 항목 번호
+        self._postings = {}      # 트라이그램 → 항목 번호 리스트
+
+        for source, translation in translations.items():
+            if not translation:
+                continue
+            key = normalize_choice(source)
+            if not key or key in self._exact:
+                continue
+            entry_id = len(self._keys)
+            self._keys.append(key)
+            self._sources.append(source)
+            self._translations.append(translation)
+            self._exact[key] = entry_id
+            for gram in _trigrams(key):
+                self._postings.setdefault(gram, []).append(entry_id)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _candidates(self, key):
+        """공유 트라이그램 수가 많은 순으로 후보 항목 선택"""
+        grams = _trigrams(key)
+        counts = Counter()
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting:
+                counts.update(posting)
+        if not counts:
+            return []
+        # 트라이그램 자카드 유사도가 너무 낮은 후보는 편집 거리 계산 전에 제외
+        min_shared = len(grams) * self.min_confidence * 0.5
+        return [entry_id for entry_id, shared in counts.most_common(self.max_candidates)
+                if shared >= min_shared]
+
+    def lookup(self, text):
+        """공백, 깨진 문자, 끝 문장부호만 다른 기존 번역 검색 (자동 재사용용)"""
+        entry_id = self._exact.get(normalize_choice(text))
+        if entry_id is None:
+            return None
+        return self._translations[entry_id], self._sources[entry_id], 1.0
+
+    def suggest(self, text):
+        """가장 가까운 기존 번역 제안 (뜻이 다를 수 있으므로 검토 없이 재사용하지 않음)"""
+        match = self.lookup(text)
+        if match:
+            return match
+        full_key = normalize_choice(text)
+        key = normalize_choice(text, strip_page=True)
+        if not key:
+            return None
+
+        best = None
+        best_confidence = self.min_confidence
+        entry_id = self._exact.get(key)
+        if entry_id is not None and key != full_key:
+            # 끝의 숫자만 다른 항목은 페이지 번호일 수 있어 항상 제안 ("Level"과 "Level 2"처럼 뜻이 다를 수 있어 신뢰도 1.0 미만)
+            confidence = len(key) / len(full_key)
+            best = (self._translations[entry_id], self._sources[entry_id], confidence)
+            best_confidence = max(confidence, self.min_confidence)
+        for entry_id in self._candidates(full_key):
+            candidate = self._keys[entry_id]
+            longest = max(len(full_key), len(candidate))
+            # 현재 최고 후보보다 나을 수 없는 거리는 계산하지 않음
+            max_dist = int(longest * (1 - best_confidence))
+            dist = _bounded_levenshtein(full_key, candidate, max_dist)
+            if dist > max_dist or meaning_may_differ(full_key, candidate):
+                continue
+            confidence = 1 - dist / longest
+            if best is None or confidence > best[2]:
+                best = (self._translations[entry_id], self._sources[entry_id], confidence)
+                best_confidence = confidence
+        return best
+
+
+def load_translation_memory(path='data/choices_translations.json', **kwargs):
+    """번역 사전 파일로부터 번역 메모리 생성"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            translations = json.load(f)
+    except FileNotFoundError:
+        translations = {}
+    return TranslationMemory(translations, **kwargs)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    memory = load_translation_memory()
+    print(f"번역 메모리 항목: {len(memory)}개")
+    path = sys.argv[1] if len(sys.argv) > 1 else 'all_choices.txt'
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = [line.rstrip('\n') for line in f if line.strip()]
+
+    start = time.perf_counter()
+    results = [memory.suggest(line) for line in lines]
+    elapsed = time.perf_counter() - start
+
+    exact = sum(1 for r in results if r and r[2] == 1.0)
+    fuzzy = sum(1 for r in results if r and r[2] < 1.0)
+    print(f"정확 일치(재사용): {exact}개, 근사 일치(제안만): {fuzzy}개, 미일치: {len(lines) - exact - fuzzy}개")
+    print(f"평균 조회 시간: {elapsed / max(len(lines), 1) * 1e6:.1f}µs")